@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify
+from flask import Flask, Response, render_template, request, send_file, flash, redirect, url_for, jsonify
 import os
 import tempfile
 import threading
@@ -12,6 +12,17 @@ import logging
 
 # Import your analyzer class
 from kroger_analyzer import KrogerReviewAnalyzer
+from review_search import ReviewSearchIndex
+from product_leaderboard import LEADERBOARD_METRICS, ProductLeaderboard
+from review_rollups import RESOLUTIONS, RollupStore
+from review_export import EXPORT_FORMATS, parquet_available, stream_export
+from job_artifacts import ArtifactBuilder, JobArtifacts
+from artifact_store import ArtifactStore
+from export_cache import ExportCache
+from workbook_export import WORKBOOK_LAYOUT_VERSION, write_analysis_workbook
+from http_cache import EncodedPayload, cache_immutable, payload_response
+from dashboard_index import DashboardIndex, columnar_rows, parse_moment
+from dashboard_aggregates import SENTIMENT_CATEGORIES, DashboardAggregates
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +35,30 @@ app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 analysis_jobs = {}
 # Store for dashboard data (in production, use a database)
 analysis_results = {}
+# Full-text index over the reviews of every job, filled as products are analyzed
+review_search = ReviewSearchIndex()
+# Dashboard rows of every completed job, time-ordered for paginated reads
+dashboard_index = DashboardIndex()
+# Per-job chart totals bucketed by product, sentiment and day
+dashboard_aggregates = DashboardAggregates()
+# Best/worst products across every completed job, updated as jobs finish
+leaderboard = ProductLeaderboard()
+# Day/week/month aggregates of every completed job, kept across restarts
+rollups = RollupStore(os.environ.get(
+    'ROLLUP_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'rollups.sqlite3')
+))
+# Renders each completed job's Excel report, dashboard JSON and summary
+artifact_builder = ArtifactBuilder(max_workers=3)
+# Generated files live under one root, within a disk budget (LRU eviction)
+artifact_store = ArtifactStore(
+    os.environ.get('ARTIFACT_ROOT', os.path.join(tempfile.gettempdir(), 'kroger-analyzer-artifacts')),
+    int(os.environ.get('ARTIFACT_MAX_BYTES', 512 * 1024 * 1024))
+)
+# Identical analyses reuse one stored report instead of rendering it again
+export_cache = ExportCache(artifact_store)
+# Part of the ETags of pre-built job payloads; bump when their layout changes
+JOB_PAYLOAD_VERSION = 1
 
 class AnalysisJob:
     def __init__(self, job_id, category, max_products, max_reviews):
@@ -35,13 +70,27 @@ class AnalysisJob:
         self.progress = 0
         self.result_file = None
         self.analysis_data = None
+        self.partial_products = []
+        self.partial_summary = None
+        self.review_table = None
+        # Per-stage pipeline and review deduplication counters of the run
+        self.pipeline_stats = None
+        self.dedup_stats = None
+        # Bumped and broadcast on every change, for status streams
+        self.version = 0
+        self._changed = threading.Condition()
+        self.artifacts = JobArtifacts(on_change=self.notify_changed)
         self.error_message = None
         self.created_at = datetime.now()
         self.thread = None
         logger.info(f"Created job {job_id} for category '{category}'")
         
     def update_status(self, status, progress=None, error=None, result_file=None, analysis_data=None):
-        logger.info(f"Job {self.job_id}: {status} (progress: {progress}%)")
+        # Progress ticks are frequent; only status transitions are worth INFO
+        if status != self.status:
+            logger.info(f"Job {self.job_id}: {status} (progress: {progress}%)")
+        else:
+            logger.debug(f"Job {self.job_id}: {status} (progress: {progress}%)")
         self.status = status
         if progress is not None:
             self.progress = progress
@@ -52,6 +101,19 @@ class AnalysisJob:
             self.result_file = result_file
         if analysis_data:
             self.analysis_data = analysis_data
+        self.notify_changed()
+    
+    def notify_changed(self):
+        """Wake every status stream waiting on this job"""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+    
+    def wait_for_change(self, version, timeout):
+        """Block until the job's version differs from `version` or `timeout` passes; returns the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
 
 def run_analysis(job_id, category, max_products, max_reviews):
     """Run the analysis in a background thread with timeout tracking"""
@@ -93,18 +155,42 @@ def run_analysis(job_id, category, max_products, max_reviews):
         
         # Run analysis with progress tracking
         try:
-            analysis = analyzer.analyze_category_by_products(
+            analysis = None
+            events = analyzer.iter_category_analysis(
                 category=category,
                 max_products=max_products,
                 max_reviews_per_product=max_reviews
             )
             
-            # Check timeout after analysis
-            if time.time() - start_time > max_duration:
-                job.update_status('error', error="Analysis timed out during execution")
-                return
+            for event in events:
+                if event['type'] == 'summary':
+                    analysis = event['analysis']
+                    break
+                
+                # Stop early if the job was cancelled or ran out of time
+                if job.status == 'error':
+                    events.close()
+                    return
+                if time.time() - start_time > max_duration:
+                    events.close()
+                    job.update_status('error', error="Analysis timed out during execution")
+                    return
+                
+                job.partial_products.append(event['analysis'])
+                job.partial_summary = event['summary']
+                job.review_table = event['review_table']
+                review_search.add_reviews(
+                    job_id, category,
+                    event['analysis'].product_name, event['analysis'].product_url,
+                    event['reviews']
+                )
+                done = len(job.partial_products)
+                job.update_status('analyzing', min(70, 15 + (55 * done) // max_products))
             
+            job.pipeline_stats = analyzer.pipeline_stats
+            job.dedup_stats = analyzer.dedup_stats
             logger.info(f"Analysis completed for job {job_id}. Result: {analysis is not None}")
+            logger.info(f"Job {job_id} pipeline stats: {job.pipeline_stats}; dedup stats: {job.dedup_stats}")
             
             if not analysis:
                 job.update_status('error', error="No products found for this category. This could be due to website restrictions or the category not existing.")
@@ -119,30 +205,23 @@ def run_analysis(job_id, category, max_products, max_reviews):
         
         # Store analysis data for dashboard
         analysis_results[job_id] = analysis
-        
-        # Create temporary file for Excel output
-        temp_dir = tempfile.mkdtemp()
-        filename = f"{category.replace(' ', '_')}_analysis_{job_id[:8]}.xlsx"
-        filepath = os.path.join(temp_dir, filename)
-        
-        logger.info(f"Exporting to Excel: {filepath}")
-        
-        # Export to Excel
-        job.update_status('exporting', 85)
+        leaderboard.add_job(job_id, category, analysis.get('statistics'), analysis['products'])
         try:
-            result_file = analyzer.export_products_to_spreadsheet(analysis, filepath)
-            
-            if result_file and os.path.exists(result_file):
-                job.update_status('completed', 100, result_file=result_file, analysis_data=analysis)
-                logger.info(f"Job {job_id} completed successfully. File: {result_file}")
-            else:
-                job.update_status('completed', 100, analysis_data=analysis)
-                logger.info(f"Job {job_id} completed (analysis only, Excel export failed)")
+            dashboard_rows = _dashboard_reviews(job_id, analysis)
+            dashboard_index.add_job(job_id, dashboard_rows)
+            dashboard_aggregates.add_job(job_id, dashboard_rows)
+        except Exception as e:
+            logger.error(f"Indexing dashboard rows failed for job {job_id}: {e}")
+        try:
+            rollups.record_analysis(analysis)
         except Exception as e:
-            logger.error(f"Excel export failed: {e}")
-            # Still mark as completed if we have analysis data
-            job.update_status('completed', 100, analysis_data=analysis)
-            logger.info(f"Job {job_id} completed (analysis only, Excel export failed)")
+            logger.error(f"Recording rollups failed for job {job_id}: {e}")
+        
+        # The job is queryable as soon as its analysis is stored; the Excel
+        # report and pre-serialized payloads are rendered in the background
+        job.update_status('completed', 100, analysis_data=analysis)
+        logger.info(f"Job {job_id} completed, building artifacts")
+        _build_job_artifacts(job, analysis)
         
         # Clean up
         try:
@@ -156,6 +235,73 @@ def run_analysis(job_id, category, max_products, max_reviews):
         logger.error(traceback.format_exc())
         job.update_status('error', error=error_msg)
 
+def _build_job_artifacts(job, analysis):
+    """Queue the Excel report, dashboard JSON and summary JSON of a completed job"""
+    job_id = job.job_id
+    artifact_builder.build(job.artifacts, {
+        'xlsx': _workbook_builder(job, analysis),
+        'dashboard': lambda: _job_payload(job_id, 'dashboard', _dashboard_json(job_id, analysis, 'rows')),
+        'dashboard_columnar': lambda: _job_payload(job_id, 'dashboard_columnar', _dashboard_json(job_id, analysis, 'columnar')),
+        'summary': lambda: _job_payload(job_id, 'summary', app.json.dumps(_summary_payload(job_id, analysis)).encode('utf-8'))
+    }, on_ready=_artifact_ready_handler(job))
+
+def _workbook_builder(job, analysis):
+    """Callable that renders (or reuses) a job's Excel report in the artifact store"""
+    def build_workbook():
+        path = export_cache.get_or_build(
+            analysis, '.xlsx',
+            lambda temp_path: write_analysis_workbook(analysis, temp_path),
+            options={'layout': WORKBOOK_LAYOUT_VERSION}
+        )
+        logger.info(f"Job {job.job_id} Excel report ready: {path}")
+        return path
+    return build_workbook
+
+def _job_payload(job_id, name, body):
+    """Pre-compressed JSON artifact of a completed job; its content never changes"""
+    return EncodedPayload(body, etag=f'{job_id}-{name}-v{JOB_PAYLOAD_VERSION}')
+
+def _indexed_dashboard_reviews(job_id, analysis):
+    """A job's dashboard rows from the index, built from the analysis if missing"""
+    rows = dashboard_index.job_rows(job_id)
+    return rows if rows is not None else _dashboard_reviews(job_id, analysis)
+
+DASHBOARD_FORMATS = ('rows', 'columnar')
+
+def _dashboard_json(job_id, analysis, dashboard_format):
+    """Serialized dashboard reviews of a job: a row array or a columnar object"""
+    reviews = _indexed_dashboard_reviews(job_id, analysis)
+    if dashboard_format == 'columnar':
+        reviews = columnar_rows(reviews)
+    return app.json.dumps(reviews).encode('utf-8')
+
+def _dashboard_artifact_name(dashboard_format):
+    return 'dashboard_columnar' if dashboard_format == 'columnar' else 'dashboard'
+
+def _artifact_ready_handler(job):
+    def on_ready(name, value):
+        if name == 'xlsx':
+            job.result_file = value
+    return on_ready
+
+def _job_artifact(job_id, name):
+    """A ready artifact of a job, or None"""
+    job = analysis_jobs.get(job_id)
+    return job.artifacts.get(name) if job else None
+
+def _summary_payload(job_id, analysis_data):
+    """Category summary, statistics and product analyses of a job, without reviews"""
+    summary = analysis_data.get('summary')
+    return {
+        'job_id': job_id,
+        'category': analysis_data.get('category', ''),
+        'summary': summary.to_dict() if summary else None,
+        'statistics': analysis_data.get('statistics'),
+        'products': [product.to_dict() for product in analysis_data.get('products', [])],
+        'total_products_analyzed': analysis_data.get('total_products_analyzed', 0),
+        'store_info': analysis_data.get('store_info')
+    }
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -177,81 +323,289 @@ def dashboard_with_job(job_id):
 
 @app.route('/api/dashboard-data')
 def get_dashboard_data():
-    """API endpoint to get all dashboard data"""
+    """API endpoint to get all dashboard data
+    
+    Without query params returns every review of every job as one array.
+    With any of cursor, limit, product, sentiment, job_id, from or to it
+    returns one page from the dashboard index, oldest review first:
+    {'reviews', 'next_cursor', 'limit'}; pass next_cursor back for the next
+    page. from/to are inclusive ISO dates or datetimes; limit is at most 1000.
+    
+    format=columnar replaces each review array with a columnar object (see
+    columnar_rows); the full response is then {'format', 'blocks'} with
+    one block per job.
+    """
     try:
-        all_reviews = []
-        
-        for job_id, analysis_data in analysis_results.items():
+        dashboard_format = request.args.get('format', 'rows')
+        if dashboard_format not in DASHBOARD_FORMATS:
+            return jsonify({'error': f"Unknown format '{dashboard_format}', expected one of {list(DASHBOARD_FORMATS)}"}), 400
+        if any(name in request.args for name in DASHBOARD_PAGE_PARAMS):
+            return _dashboard_page(dashboard_format)
+        
+        # Splice each job's pre-serialized payload, serializing only jobs
+        # whose dashboard artifact is not ready yet
+        parts = []
+        for job_id, analysis_data in list(analysis_results.items()):
             if analysis_data and 'products' in analysis_data:
-                for product in analysis_data['products']:
-                    sample_reviews = product.get('sample_reviews', {})
-                    
-                    for sentiment_type in ['positive', 'negative', 'neutral']:
-                        for review in sample_reviews.get(sentiment_type, []):
-                            review_entry = {
-                                'job_id': job_id,
-                                'category': analysis_data.get('category', ''),
-                                'product_name': product.get('product_name', ''),
-                                'product_url': product.get('product_url', ''),
-                                'rating': review.get('rating'),
-                                'text': review.get('text', ''),
-                                'author': review.get('author', ''),
-                                'datetime': review.get('datetime'),
-                                'sentiment_score': _calculate_sentiment_score(sentiment_type),
-                                'sentiment_category': sentiment_type
-                            }
-                            
-                            if not review_entry['datetime']:
-                                review_entry['datetime'] = datetime.now().isoformat()
-                            
-                            all_reviews.append(review_entry)
-        
-        return jsonify(all_reviews)
+                artifact = _job_artifact(job_id, _dashboard_artifact_name(dashboard_format))
+                if artifact is not None:
+                    payload = artifact.body
+                else:
+                    payload = _dashboard_json(job_id, analysis_data, dashboard_format)
+                parts.append(payload.strip())
+        
+        if dashboard_format == 'columnar':
+            body = b'{"blocks":[' + b','.join(parts) + b'],"format":"columnar"}'
+        else:
+            body = b'[' + b','.join(part[1:-1] for part in parts if part != b'[]') + b']'
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error getting dashboard data: {e}")
         return jsonify({'error': str(e)}), 500
 
+DASHBOARD_PAGE_PARAMS = ('cursor', 'limit', 'product', 'sentiment', 'job_id', 'from', 'to')
+
+def _dashboard_page(dashboard_format):
+    """One keyset-paginated page of indexed dashboard rows"""
+    limit = min(1000, max(1, request.args.get('limit', 100, type=int)))
+    try:
+        start = parse_moment(request.args['from']) if request.args.get('from') else None
+        end = parse_moment(request.args['to'], end_of_day=True) if request.args.get('to') else None
+        reviews, next_cursor = dashboard_index.page(
+            cursor=request.args.get('cursor') or None,
+            limit=limit,
+            start=start,
+            end=end,
+            job_id=request.args.get('job_id') or None,
+            product=request.args.get('product') or None,
+            sentiment=request.args.get('sentiment') or None
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if dashboard_format == 'columnar':
+        reviews = columnar_rows(reviews)
+    return jsonify({'reviews': reviews, 'next_cursor': next_cursor, 'limit': limit})
+
+@app.route('/api/dashboard-aggregates')
+def get_dashboard_aggregates():
+    """Dashboard chart series for the reviews matching the filters
+    
+    Query params (all optional): job_id, product, sentiment and inclusive
+    from/to ISO dates. Returns totals, weekly sentiment, rating histogram,
+    sentiment counts, per-product averages and top words, merged from
+    per-job buckets without touching individual reviews.
+    """
+    try:
+        sentiment = request.args.get('sentiment') or None
+        if sentiment is not None and sentiment not in SENTIMENT_CATEGORIES:
+            return jsonify({'error': f"Unknown sentiment '{sentiment}', expected one of {list(SENTIMENT_CATEGORIES)}"}), 400
+        try:
+            start = parse_moment(request.args['from']) if request.args.get('from') else None
+            end = parse_moment(request.args['to'], end_of_day=True) if request.args.get('to') else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date: {e}'}), 400
+        
+        return jsonify(dashboard_aggregates.query(
+            job_id=request.args.get('job_id') or None,
+            product=request.args.get('product') or None,
+            sentiment=sentiment,
+            start=start,
+            end=end
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error getting dashboard aggregates: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/dashboard-data/<job_id>')
 def get_job_dashboard_data(job_id):
-    """API endpoint to get dashboard data for a specific job"""
+    """API endpoint to get dashboard data for a specific job (format=rows|columnar)"""
+    try:
+        dashboard_format = request.args.get('format', 'rows')
+        if dashboard_format not in DASHBOARD_FORMATS:
+            return jsonify({'error': f"Unknown format '{dashboard_format}', expected one of {list(DASHBOARD_FORMATS)}"}), 400
+        
+        analysis_data = analysis_results.get(job_id)
+        artifact = _job_artifact(job_id, _dashboard_artifact_name(dashboard_format)) if analysis_data else None
+        if artifact is not None:
+            return payload_response(artifact, request)
+        
+        if not analysis_data:
+            # Serve products analyzed so far while the job is still running
+            job = analysis_jobs.get(job_id)
+            if not job or not job.partial_products:
+                return jsonify({'error': 'Analysis not found'}), 404
+            analysis_data = {
+                'category': job.category,
+                'summary': job.partial_summary,
+                'products': list(job.partial_products),
+                'review_table': job.review_table
+            }
+        
+        return Response(_dashboard_json(job_id, analysis_data, dashboard_format), mimetype='application/json')
+        
+    except Exception as e:
+        logger.error(f"Error getting job dashboard data: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/summary/<job_id>')
+def get_job_summary(job_id):
+    """Category summary, statistics and product analyses of a completed job"""
     try:
         analysis_data = analysis_results.get(job_id)
         if not analysis_data:
             return jsonify({'error': 'Analysis not found'}), 404
         
-        reviews = []
+        artifact = _job_artifact(job_id, 'summary')
+        if artifact is not None:
+            return payload_response(artifact, request)
+        return jsonify(_summary_payload(job_id, analysis_data))
         
-        if 'products' in analysis_data:
-            for product in analysis_data['products']:
-                sample_reviews = product.get('sample_reviews', {})
-                
-                for sentiment_type in ['positive', 'negative', 'neutral']:
-                    for review in sample_reviews.get(sentiment_type, []):
-                        review_entry = {
-                            'job_id': job_id,
-                            'category': analysis_data.get('category', ''),
-                            'product_name': product.get('product_name', ''),
-                            'product_url': product.get('product_url', ''),
-                            'rating': review.get('rating'),
-                            'text': review.get('text', ''),
-                            'author': review.get('author', ''),
-                            'datetime': review.get('datetime'),
-                            'sentiment_score': _calculate_sentiment_score(sentiment_type),
-                            'sentiment_category': sentiment_type
-                        }
-                        
-                        if not review_entry['datetime']:
-                            review_entry['datetime'] = datetime.now().isoformat()
-                        
-                        reviews.append(review_entry)
-        
-        return jsonify(reviews)
+    except Exception as e:
+        logger.error(f"Error getting job summary: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/reviews/search')
+def search_reviews():
+    """Full-text review search across all jobs, ranked by BM25
+    
+    Query params: q (required), product (name substring), category, job_id,
+    page (1-based) and per_page (max 100).
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Missing search query (q)'}), 400
+        
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(100, max(1, request.args.get('per_page', 20, type=int)))
+        
+        started = time.perf_counter()
+        total, results = review_search.search(
+            query,
+            product=request.args.get('product', '').strip() or None,
+            category=request.args.get('category', '').strip() or None,
+            job_id=request.args.get('job_id', '').strip() or None,
+            offset=(page - 1) * per_page,
+            limit=per_page
+        )
+        took_ms = (time.perf_counter() - started) * 1000
+        
+        return jsonify({
+            'query': query,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'results': results,
+            'took_ms': round(took_ms, 2),
+            'index': review_search.stats()
+        })
         
     except Exception as e:
-        logger.error(f"Error getting job dashboard data: {e}")
+        logger.error(f"Error searching reviews: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leaderboard')
+def get_leaderboard():
+    """Top products across all completed jobs
+    
+    Query params: category (omit for all categories), by ('rating' ranks by
+    Bayesian-adjusted rating, 'sentiment' by average sentiment), order
+    ('best' or 'worst') and k (max 100).
+    """
+    try:
+        category = request.args.get('category', '').strip() or None
+        by = request.args.get('by', 'rating')
+        order = request.args.get('order', 'best')
+        k = min(100, max(1, request.args.get('k', 10, type=int)))
+        
+        if by not in LEADERBOARD_METRICS:
+            return jsonify({'error': f"Unknown metric '{by}', expected one of {list(LEADERBOARD_METRICS)}"}), 400
+        if order not in ('best', 'worst'):
+            return jsonify({'error': "order must be 'best' or 'worst'"}), 400
+        
+        return jsonify({
+            'category': category,
+            'by': by,
+            'order': order,
+            'products': leaderboard.top(k, category=category, by=by, worst=order == 'worst'),
+            'categories': leaderboard.categories()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting leaderboard: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/trends')
+def get_trends():
+    """Rating and sentiment trend of a category (or one product) across runs
+    
+    Query params: category or product_url, resolution ('day', 'week' or
+    'month') and months of history. Without either, lists tracked categories.
+    """
+    try:
+        category = request.args.get('category', '').strip()
+        product_url = request.args.get('product_url', '').strip()
+        resolution = request.args.get('resolution', 'week')
+        months = min(120, max(1, request.args.get('months', 6, type=int)))
+        
+        if resolution not in RESOLUTIONS:
+            return jsonify({'error': f"Unknown resolution '{resolution}', expected one of {list(RESOLUTIONS)}"}), 400
+        if not category and not product_url:
+            return jsonify({'categories': rollups.categories(), 'store': rollups.stats()})
+        
+        return jsonify({
+            'category': category or None,
+            'product_url': product_url or None,
+            'resolution': resolution,
+            'months': months,
+            'points': rollups.trend(category, product_url, resolution, months)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting trends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def _dashboard_reviews(job_id, analysis_data):
+    """Flat review rows for the dashboard
+    
+    Jobs with a review table serve every scored review with its own sentiment
+    score; older analyses fall back to the sample reviews.
+    """
+    category = analysis_data.get('category', '')
+    review_table = analysis_data.get('review_table')
+    
+    if review_table is not None:
+        reviews = [{'job_id': job_id, 'category': category, **review} for review in review_table.records()]
+    else:
+        reviews = []
+        for product in analysis_data.get('products', []):
+            sample_reviews = product.get('sample_reviews', {})
+            
+            for sentiment_type in ['positive', 'negative', 'neutral']:
+                for review in sample_reviews.get(sentiment_type, []):
+                    reviews.append({
+                        'job_id': job_id,
+                        'category': category,
+                        'product_name': product.get('product_name', ''),
+                        'product_url': product.get('product_url', ''),
+                        'rating': review.get('rating'),
+                        'text': review.get('text', ''),
+                        'author': review.get('author', ''),
+                        'datetime': review.get('datetime'),
+                        'sentiment_score': _calculate_sentiment_score(sentiment_type),
+                        'sentiment_category': sentiment_type
+                    })
+    
+    now = datetime.now().isoformat()
+    for review in reviews:
+        if not review['datetime']:
+            review['datetime'] = now
+    
+    return reviews
+
 def _calculate_sentiment_score(sentiment_type):
     """Convert sentiment category to approximate score"""
     if sentiment_type == 'positive':
@@ -321,31 +675,86 @@ def analyze():
 
 @app.route('/status/<job_id>')
 def get_status(job_id):
-    """API endpoint to check job status"""
-    logger.info(f"Status check for job {job_id}")
+    """API endpoint to check job status (polling fallback for /status/<job_id>/stream)"""
     job = analysis_jobs.get(job_id)
     if not job:
-        logger.warning(f"Job {job_id} not found in analysis_jobs. Available jobs: {list(analysis_jobs.keys())}")
+        logger.debug(f"Status check for unknown job {job_id}")
         return jsonify({'error': 'Job not found'}), 404
     
-    # Check if job has been running too long without progress
-    time_running = (datetime.now() - job.created_at).total_seconds()
-    if time_running > 900 and job.status in ['starting', 'initializing', 'searching']:  # 15 minutes
-        logger.warning(f"Job {job_id} appears stuck, marking as error")
-        job.update_status('error', error="Analysis timed out. The website may be blocking automated requests or there may be a technical issue.")
+    return jsonify(_job_status(job))
+
+# Seconds between keep-alive comments, and before a stream is closed for
+# the browser to reconnect
+STATUS_HEARTBEAT_SECONDS = 15
+STATUS_STREAM_MAX_SECONDS = 600
+
+@app.route('/status/<job_id>/stream')
+def stream_status(job_id):
+    """Server-Sent Events stream of a job's status
+    
+    Sends a 'status' event (the /status payload) whenever the job or one of
+    its artifacts changes, and a comment line every STATUS_HEARTBEAT_SECONDS
+    otherwise. The stream ends once the job has failed or completed with
+    every artifact built.
+    """
+    job = analysis_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def events():
+        deadline = time.monotonic() + STATUS_STREAM_MAX_SECONDS
+        version = None
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            current = job.version if version is None else job.wait_for_change(version, STATUS_HEARTBEAT_SECONDS)
+            if current == version:
+                _check_stuck(job)
+                yield ': heartbeat\n\n'
+                continue
+            version = current
+            status = _job_status(job)
+            yield f'id: {version}\nevent: status\ndata: {app.json.dumps(status)}\n\n'
+            if _status_settled(status):
+                return
     
-    response_data = {
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def _job_status(job):
+    """Status payload shared by the polling and streaming endpoints"""
+    time_running = _check_stuck(job)
+    return {
         'status': job.status,
         'progress': job.progress,
         'error': job.error_message,
         'category': job.category,
         'has_result': job.result_file is not None,
         'has_dashboard_data': job.analysis_data is not None,
+        'products_completed': len(job.partial_products),
+        'artifacts': job.artifacts.status(),
+        'pipeline_stats': job.pipeline_stats,
+        'dedup_stats': job.dedup_stats,
         'running_time': int(time_running)
     }
-    
-    logger.info(f"Job {job_id} status: {response_data}")
-    return jsonify(response_data)
+
+def _check_stuck(job):
+    """Fail jobs stuck before analysis for 15 minutes; returns seconds running"""
+    time_running = (datetime.now() - job.created_at).total_seconds()
+    if time_running > 900 and job.status in ['starting', 'initializing', 'searching']:
+        logger.warning(f"Job {job.job_id} appears stuck, marking as error")
+        job.update_status('error', error="Analysis timed out. The website may be blocking automated requests or there may be a technical issue.")
+    return time_running
+
+def _status_settled(status):
+    """True once a status payload can no longer change"""
+    if status['status'] == 'error':
+        return True
+    artifacts = status['artifacts'].values()
+    return status['status'] == 'completed' and bool(artifacts) and all(
+        artifact['status'] in ('ready', 'error') for artifact in artifacts
+    )
 
 @app.route('/download/<job_id>')
 def download_result(job_id):
@@ -357,6 +766,25 @@ def download_result(job_id):
         flash('Job not found', 'error')
         return redirect(url_for('index'))
     
+    # Stored names are content hashes, so they double as strong ETags; a
+    # client that already has this report is answered before any file work
+    if job.result_file and request.if_none_match.contains_weak(_report_etag(job.result_file)):
+        response = Response(status=304)
+        response.set_etag(_report_etag(job.result_file))
+        return cache_immutable(response)
+    
+    # Reports evicted from the artifact store are rendered again
+    analysis = analysis_results.get(job_id)
+    if job.result_file and not artifact_store.get(job.result_file) and analysis:
+        logger.info(f"Excel report for job {job_id} was evicted, rebuilding")
+        job.result_file = None
+        if job.artifacts.status().get('xlsx', {}).get('status') in ('ready', 'error'):
+            artifact_builder.build(job.artifacts, {'xlsx': _workbook_builder(job, analysis)}, on_ready=_artifact_ready_handler(job))
+    
+    # The report is rendered after the job completes; give it a moment to finish
+    if job.status == 'completed' and not job.result_file:
+        job.artifacts.wait('xlsx', timeout=60)
+    
     if job.status != 'completed' or not job.result_file:
         logger.warning(f"Download failed: Job {job_id} not completed or no file. Status: {job.status}, File: {job.result_file}")
         flash('Analysis not completed or file not available', 'error')
@@ -370,11 +798,42 @@ def download_result(job_id):
     filename = f"{job.category.replace(' ', '_')}_analysis.xlsx"
     logger.info(f"Sending file {job.result_file} as {filename}")
     
-    return send_file(
+    # send_file answers If-None-Match/If-Modified-Since with 304 and Range
+    # (with If-Range) with 206, so interrupted downloads can resume
+    response = send_file(
         job.result_file,
         as_attachment=True,
         download_name=filename,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        etag=_report_etag(job.result_file)
+    )
+    response.headers['Accept-Ranges'] = 'bytes'
+    return cache_immutable(response)
+
+def _report_etag(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+@app.route('/export/<job_id>.<export_format>')
+def export_reviews(job_id, export_format):
+    """Stream every review of a completed job as CSV, NDJSON or Parquet"""
+    logger.info(f"Export request for job {job_id} ({export_format})")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown export format '{export_format}', expected one of {list(EXPORT_FORMATS)}"}), 404
+    
+    analysis_data = analysis_results.get(job_id)
+    review_table = analysis_data.get('review_table') if analysis_data else None
+    if review_table is None:
+        return jsonify({'error': 'Analysis not found or not completed'}), 404
+    
+    if export_format == 'parquet' and not parquet_available():
+        return jsonify({'error': 'Parquet export requires pyarrow, which is not installed'}), 501
+    
+    category = analysis_data.get('category', 'analysis')
+    filename = secure_filename(f"{category.replace(' ', '_')}_reviews_{job_id[:8]}.{export_format}")
+    return Response(
+        stream_export(review_table, export_format),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
     )
 
 @app.route('/cancel/<job_id>', methods=['POST'])
@@ -398,29 +857,29 @@ def cancel_job(job_id):
 def cleanup_old_jobs():
     """Clean up old jobs (call this periodically)"""
     current_time = datetime.now()
-    jobs_to_remove = []
-    
-    for job_id, job in analysis_jobs.items():
-        # Remove jobs older than 2 hours
-        if (current_time - job.created_at).total_seconds() > 7200:
-            # Clean up file if it exists
-            if job.result_file and os.path.exists(job.result_file):
-                try:
-                    os.remove(job.result_file)
-                    temp_dir = os.path.dirname(job.result_file)
-                    if os.path.exists(temp_dir):
-                        os.rmdir(temp_dir)
-                except:
-                    pass
-            
-            # Remove from analysis results too
-            if job_id in analysis_results:
-                del analysis_results[job_id]
-                
-            jobs_to_remove.append(job_id)
+    # Remove jobs older than 2 hours
+    jobs_to_remove = [
+        job_id for job_id, job in analysis_jobs.items()
+        if (current_time - job.created_at).total_seconds() > 7200
+    ]
+    # Reports an identical analysis that stays behind still shares
+    kept_files = {
+        job.result_file for job_id, job in analysis_jobs.items()
+        if job_id not in jobs_to_remove
+    }
     
     for job_id in jobs_to_remove:
-        del analysis_jobs[job_id]
+        job = analysis_jobs.pop(job_id)
+        if job.result_file and job.result_file not in kept_files:
+            artifact_store.remove(job.result_file)
+        
+        # Remove from analysis results too
+        if job_id in analysis_results:
+            del analysis_results[job_id]
+        review_search.remove_job(job_id)
+        leaderboard.remove_job(job_id)
+        dashboard_index.remove_job(job_id)
+        dashboard_aggregates.remove_job(job_id)
     
     logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
     return f"Cleaned up {len(jobs_to_remove)} old jobs"
@@ -443,6 +902,11 @@ def debug_jobs():
         }
     return jsonify(jobs_info)
 
+@app.route('/debug/artifacts')
+def debug_artifacts():
+    """Debug endpoint with artifact store disk usage and cache counters"""
+    return jsonify({**artifact_store.stats(), 'export_cache': export_cache.stats()})
+
 @app.route('/debug/analysis-results')
 def debug_analysis_results():
     """Debug endpoint to see stored analysis results"""
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+# Stored artifacts are named <sha256 prefix><suffix>; only these and the
+# store's own temporary files are ever deleted from the root
+_ARTIFACT_NAME = re.compile(r'^[0-9a-f]{32}(\.[A-Za-z0-9.]+)?$')
+_TEMP_PREFIX = '.partial-'
+_HASH_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(_HASH_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Content-addressed files under one root, kept within a byte budget
+
+    Files are written to a temporary name in the root and renamed into place,
+    so readers never see a partial file. Names are derived from the content
+    hash: storing the same bytes twice keeps one file, and a name always
+    refers to the same content (usable as a strong ETag). When the total
+    size passes `max_bytes` the least recently used files are deleted.
+
+    On startup the store's files left by an earlier process are removed:
+    jobs only live in memory, so no job can reference them. Other files
+    under the root are left alone.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # name -> size, least recently used first
+        self._total_bytes = 0
+        self.counters = dict.fromkeys([
+            'stored', 'deduplicated', 'hits', 'misses',
+            'evictions', 'evicted_bytes', 'orphans_reclaimed', 'orphan_bytes_reclaimed'
+        ], 0)
+
+        os.makedirs(self.root, exist_ok=True)
+        self._reclaim()
+
+    def store(self, write, suffix=''):
+        """Write an artifact via `write(path)` and return its stored path
+
+        `write` receives a temporary path inside the root to write to.
+        """
+        handle, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, suffix=suffix, dir=self.root)
+        os.close(handle)
+        try:
+            write(temp_path)
+            name = file_digest(temp_path)[:32] + suffix
+            path = os.path.join(self.root, name)
+            size = os.path.getsize(temp_path)
+
+            with self._lock:
+                if name in self._entries and os.path.exists(path):
+                    self._entries.move_to_end(name)
+                    self.counters['deduplicated'] += 1
+                    return path
+                os.replace(temp_path, path)
+                self._add(name, size)
+                self.counters['stored'] += 1
+                self._evict(keep=name)
+            return path
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get(self, path_or_name):
+        """Stored path of an artifact (marking it recently used), or None if evicted"""
+        name = os.path.basename(path_or_name or '')
+        path = os.path.join(self.root, name)
+        with self._lock:
+            if name in self._entries and os.path.exists(path):
+                self._entries.move_to_end(name)
+                self.counters['hits'] += 1
+                return path
+            self._forget(name)
+            self.counters['misses'] += 1
+            return None
+
+    def remove(self, path_or_name):
+        """Delete an artifact; True if it was stored"""
+        name = os.path.basename(path_or_name or '')
+        with self._lock:
+            if name not in self._entries:
+                return False
+            self._forget(name)
+            self._unlink(os.path.join(self.root, name))
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'root': self.root,
+                'files': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'utilization': round(self._total_bytes / self.max_bytes, 3) if self.max_bytes else None,
+                **self.counters
+            }
+
+    def _add(self, name, size):
+        self._entries[name] = size
+        self._total_bytes += size
+
+    def _forget(self, name):
+        size = self._entries.pop(name, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self, keep=None):
+        """Delete least recently used files until within budget (lock held)"""
+        for name in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            size = self._entries[name]
+            self._forget(name)
+            self._unlink(os.path.join(self.root, name))
+            self.counters['evictions'] += 1
+            self.counters['evicted_bytes'] += size
+
+    def _reclaim(self):
+        """Delete the files of earlier processes (interrupted writes and reports)"""
+        for entry in os.scandir(self.root):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if not (entry.name.startswith(_TEMP_PREFIX) or _ARTIFACT_NAME.match(entry.name)):
+                continue
+            size = entry.stat().st_size
+            self._unlink(entry.path)
+            self.counters['orphans_reclaimed'] += 1
+            self.counters['orphan_bytes_reclaimed'] += size
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Memory per review: scraped review dicts vs slotted Review records
+
+Review texts are built up front and shared by both representations, so only
+the per-review overhead is measured. Usage: python benchmarks/bench_records.py [reviews]
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Review
+from review_dates import DateNormalizer
+
+
+def scraped_reviews(count, seed=7):
+    rng = random.Random(seed)
+    texts = [f'Review text number {i} about the product' for i in range(1000)]
+    authors = [f'Customer{i}' for i in range(500)]
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'rating': rng.randint(1, 5),
+            'text': rng.choice(texts),
+            # Scraped authors are fresh strings, not shared objects
+            'author': ''.join(rng.choice(authors)),
+            'datetime': (start + timedelta(minutes=rng.randint(0, 500000))).isoformat(),
+            'sentiment_score': round(rng.uniform(-1, 1), 3)
+        }
+        for _ in range(count)
+    ]
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    value = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return value, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"📊 Measuring memory for {count:,} reviews")
+
+    _, dict_bytes = measure(lambda: scraped_reviews(count))
+    scraped = scraped_reviews(count)
+    normalizer = DateNormalizer()
+    parsed = normalizer.parse_many(review['datetime'] for review in scraped)
+    records, record_bytes = measure(
+        lambda: [Review.from_dict(review, parsed=moment) for review, moment in zip(scraped, parsed)]
+    )
+
+    print(f"Dicts:          {dict_bytes / count:7.1f} bytes/review")
+    print(f"Review records: {record_bytes / count:7.1f} bytes/review")
+    print(f"✅ Records use {dict_bytes / max(record_bytes, 1):.1f}x less memory")
+    return records
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Review date parsing: the original per-call parser vs DateNormalizer
+
+legacy_parse is the analyzer's parser before DateNormalizer: patterns
+rebuilt and the string lowercased on every call, no caching. Three
+workloads are timed: product-sized batches of scraped timestamps (the
+analyzer's call pattern), a job's worth of repetitive page dates, and many
+unique dates. Usage: python benchmarks/bench_review_dates.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from review_dates import DateNormalizer
+
+
+def legacy_parse(date_string):
+    try:
+        if not date_string:
+            return None
+
+        date_patterns = [
+            (r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})', '%Y-%m-%dT%H:%M:%S'),
+            (r'(\d{4}-\d{2}-\d{2})', '%Y-%m-%d'),
+            (r'(\d{1,2}/\d{1,2}/\d{4})', '%m/%d/%Y'),
+            (r'(\d{1,2}-\d{1,2}-\d{4})', '%m-%d-%Y'),
+            (r'([A-Za-z]+ \d{1,2}, \d{4})', '%B %d, %Y'),
+            (r'([A-Za-z]{3} \d{1,2}, \d{4})', '%b %d, %Y'),
+        ]
+
+        if 'ago' in date_string.lower():
+            match = re.search(r'(\d+)\s+(day|week|month)s?\s+ago', date_string.lower())
+            if not match:
+                return None
+            days = int(match.group(1)) * {'day': 1, 'week': 7, 'month': 30}[match.group(2)]
+            return datetime.now() - timedelta(days=days)
+        elif 'yesterday' in date_string.lower():
+            return datetime.now() - timedelta(days=1)
+        elif 'today' in date_string.lower():
+            return datetime.now()
+
+        for pattern, date_format in date_patterns:
+            matches = re.findall(pattern, date_string, re.IGNORECASE)
+            if matches:
+                try:
+                    return datetime.strptime(matches[0], date_format)
+                except ValueError:
+                    continue
+    except Exception:
+        return None
+
+
+PAGE_SAMPLES = [
+    '2024-01-05T10:11:12', '2024-01-05', 'Reviewed 1/5/2024', '01-05-2023',
+    'January 5, 2024', 'Jan 5, 2024', 'Posted 3 days ago', '2 weeks ago',
+    '1 month ago', 'Yesterday', 'today', 'on March 12, 2021 by bob', 'nothing here'
+]
+
+
+def timed(label, run, baseline=None):
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    speedup = f"  ({baseline / elapsed:5.1f}x)" if baseline else ''
+    print(f"  {label:28} {elapsed * 1000:9.1f} ms{speedup}")
+    return elapsed, result
+
+
+def same_dates(left, right):
+    # Relative dates resolve against slightly different "now"s
+    return all(
+        a is b if a is None or b is None else abs((a - b).total_seconds()) < 5
+        for a, b in zip(left, right)
+    )
+
+
+def compare(title, batches):
+    print(f"\n📊 {title}")
+    legacy_time, legacy = timed('legacy per call', lambda: [[legacy_parse(s) for s in batch] for batch in batches])
+
+    def normalizer_run():
+        normalizer = DateNormalizer()
+        return [normalizer.parse_many(batch) for batch in batches]
+
+    _, parsed = timed('DateNormalizer.parse_many', normalizer_run, legacy_time)
+    assert all(same_dates(a, b) for a, b in zip(legacy, parsed)), 'results differ from the legacy parser'
+
+
+def main():
+    rng = random.Random(30)
+    start = datetime(2020, 1, 1)
+
+    def stamp():
+        return (start + timedelta(seconds=rng.randint(0, 10 ** 8))).isoformat()
+
+    # 50 products x 20 scraped reviews, each with its own timestamp
+    compare('Product batches (50 x 20 scraped timestamps)', [[stamp() for _ in range(20)] for _ in range(50)])
+    # Review pages repeat a handful of date strings
+    compare('Repetitive page dates (20k strings, one batch)', [[rng.choice(PAGE_SAMPLES) for _ in range(20000)]])
+    compare('Unique dates (20k strings, one batch)', [[stamp() for _ in range(20000)]])
+    print("\n✅ Results match the legacy parser")
+
+
+if __name__ == '__main__':
+    main()
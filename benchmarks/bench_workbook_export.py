@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Excel export time and peak memory as the review count grows
+
+Builds synthetic 50-product jobs and writes each with
+write_analysis_workbook. Streaming should keep peak traced memory roughly
+flat while time grows linearly with the number of reviews.
+Usage: python benchmarks/bench_workbook_export.py [reviews ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from category_summary import CategorySummaryAggregator
+from records import ProductAnalysis, Review
+from review_table import ReviewTable
+from workbook_export import write_analysis_workbook
+
+
+WORDS = 'great tasty stale fresh crunchy bland sweet perfect awful value price family'.split()
+
+
+def describe_sentiment(score):
+    return 'Positive' if score > 0.1 else 'Negative' if score < -0.1 else 'Neutral'
+
+
+def build_analysis(review_count, product_count=50, seed=0):
+    rng = random.Random(seed)
+    table = ReviewTable()
+    aggregator = CategorySummaryAggregator('cookies', describe_sentiment)
+    products = []
+    per_product = review_count // product_count
+
+    for index in range(product_count):
+        reviews = [
+            Review(
+                rating=rng.randint(1, 5),
+                text=' '.join(rng.choices(WORDS, k=rng.randint(5, 40))),
+                author=f'user{rng.randint(0, 999)}',
+                timestamp=1700000000 + rng.randint(0, 10 ** 7),
+                sentiment_score=round(rng.uniform(-1, 1), 3) if rng.random() > 0.1 else None
+            )
+            for _ in range(per_product)
+        ]
+        product = ProductAnalysis(
+            average_rating=3.5, total_reviews=per_product, text_reviews=per_product,
+            sentiment_score=0.2, sentiment_label='Positive',
+            positive_reviews=per_product // 2, negative_reviews=per_product // 4,
+            neutral_reviews=per_product // 4, themes=['tasty', 'fresh'],
+            product_name=f'Cookie Product {index} [Family Size]: 13 oz',
+            product_url=f'https://www.kroger.com/p/cookie/{index:013d}', category='cookies'
+        )
+        table.add_product(product.product_name, product.product_url, reviews)
+        products.append(product)
+        aggregator.add(product)
+
+    # Concatenate the columns up front so only the export is measured
+    table.columns()
+    return {
+        'category': 'cookies',
+        'summary': aggregator.summary(),
+        'products': products,
+        'total_products_analyzed': product_count,
+        'statistics': table.statistics(),
+        'review_table': table
+    }
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 20000, 40000]
+    print(f"{'reviews':>8} {'seconds':>8} {'us/review':>10} {'peak MB':>8} {'file MB':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            analysis = build_analysis(size)
+            path = os.path.join(directory, f'export_{size}.xlsx')
+
+            started = time.perf_counter()
+            write_analysis_workbook(analysis, path)
+            elapsed = time.perf_counter() - started
+
+            # A second, traced run for peak memory (tracing slows it down)
+            tracemalloc.start()
+            write_analysis_workbook(analysis, path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{size:>8} {elapsed:>8.2f} {elapsed / size * 1e6:>10.1f} {peak / 1e6:>8.1f} {os.path.getsize(path) / 1e6:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
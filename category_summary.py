@@ -0,0 +1,119 @@
+from collections import Counter
+
+from records import CategorySummary
+
+
+class CategorySummaryAggregator:
+    """Running category summary updated one product analysis at a time
+
+    Each add() is O(1) in the number of products already seen, and summary()
+    returns the same figures the batch summary used to build, so partial
+    summaries can be served while a job is still running. Aggregators built
+    over separate shards of products can be combined with merge().
+    """
+
+    def __init__(self, category, sentiment_describer):
+        self.category = category
+        self.describe_sentiment = sentiment_describer
+
+        self.product_count = 0
+        self.total_reviews = 0
+        self.total_text_reviews = 0
+        self.rating_sum = 0
+        self.sentiment_sum = 0
+        self.positive_reviews = 0
+        self.negative_reviews = 0
+        self.neutral_reviews = 0
+        self.theme_counts = Counter()
+
+        self.best_product = None
+        self.best_rating = None
+        self.worst_product = None
+        self.worst_rating = None
+
+    def add(self, product_analysis):
+        """Fold one product analysis into the running totals"""
+        self.product_count += 1
+        self.total_reviews += product_analysis.get('total_reviews', 0)
+        self.total_text_reviews += product_analysis.get('text_reviews', 0)
+        self.rating_sum += product_analysis.get('average_rating', 0)
+        self.sentiment_sum += product_analysis.get('sentiment_score', 0)
+        self.positive_reviews += product_analysis.get('positive_reviews', 0)
+        self.negative_reviews += product_analysis.get('negative_reviews', 0)
+        self.neutral_reviews += product_analysis.get('neutral_reviews', 0)
+        self.theme_counts.update(product_analysis.get('themes', []))
+
+        # Strict comparisons keep the first product on ties, like max()/min()
+        best_rating = product_analysis.get('average_rating', 0)
+        if self.best_rating is None or best_rating > self.best_rating:
+            self.best_rating = best_rating
+            self.best_product = self._product_ref(product_analysis)
+
+        worst_rating = product_analysis.get('average_rating', 5)
+        if self.worst_rating is None or worst_rating < self.worst_rating:
+            self.worst_rating = worst_rating
+            self.worst_product = self._product_ref(product_analysis)
+
+        return self
+
+    def merge(self, other):
+        """Fold another aggregator (e.g. from a different shard or store) into this one
+
+        Products in `self` are treated as coming first, so ties on best/worst
+        product and theme ordering resolve as if the shards had been processed
+        back to back.
+        """
+        if other.product_count == 0:
+            return self
+
+        self.product_count += other.product_count
+        self.total_reviews += other.total_reviews
+        self.total_text_reviews += other.total_text_reviews
+        self.rating_sum += other.rating_sum
+        self.sentiment_sum += other.sentiment_sum
+        self.positive_reviews += other.positive_reviews
+        self.negative_reviews += other.negative_reviews
+        self.neutral_reviews += other.neutral_reviews
+        self.theme_counts.update(other.theme_counts)
+
+        if self.best_rating is None or other.best_rating > self.best_rating:
+            self.best_rating = other.best_rating
+            self.best_product = dict(other.best_product)
+
+        if self.worst_rating is None or other.worst_rating < self.worst_rating:
+            self.worst_rating = other.worst_rating
+            self.worst_product = dict(other.worst_product)
+
+        return self
+
+    def summary(self):
+        """CategorySummary for everything added so far (None if empty)"""
+        if not self.product_count:
+            return None
+
+        avg_rating = self.rating_sum / self.product_count
+        avg_sentiment = self.sentiment_sum / self.product_count
+
+        return CategorySummary(
+            category=self.category,
+            total_products=self.product_count,
+            total_reviews=self.total_reviews,
+            total_text_reviews=self.total_text_reviews,
+            average_rating=round(avg_rating, 2),
+            average_sentiment=round(avg_sentiment, 3),
+            sentiment_label=self.describe_sentiment(avg_sentiment),
+            positive_reviews=self.positive_reviews,
+            negative_reviews=self.negative_reviews,
+            neutral_reviews=self.neutral_reviews,
+            top_themes=[theme for theme, count in self.theme_counts.most_common(8)],
+            best_product=dict(self.best_product),
+            worst_product=dict(self.worst_product)
+        )
+
+    @staticmethod
+    def _product_ref(product_analysis):
+        return {
+            'name': product_analysis.get('product_name', ''),
+            'rating': product_analysis.get('average_rating', 0),
+            'url': product_analysis.get('product_url', '')
+        }
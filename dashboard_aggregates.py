@@ -0,0 +1,265 @@
+import re
+import threading
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+from dashboard_index import parse_moment
+from review_table import StringPool
+
+
+SENTIMENT_CATEGORIES = ('positive', 'neutral', 'negative')
+
+# Word cloud tokenization, as the dashboard did it client-side
+_WORD = re.compile(r'\b[a-z]{3,}\b')
+_CLOUD_STOP_WORDS = frozenset([
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this',
+    'that', 'these', 'those', 'they', 'them', 'their', 'there', 'here',
+    'when', 'where', 'why', 'how', 'what', 'who', 'which', 'very',
+    'really', 'quite', 'just', 'only', 'also', 'even', 'still', 'more',
+    'most', 'much', 'many', 'some', 'any', 'all', 'not', 'one', 'two',
+    'three', 'four', 'five', 'its', 'it', 'an', 'a', 'good', 'great'
+])
+# Word counts are kept for each job's most frequent words only
+_JOB_VOCABULARY = 200
+
+
+def cloud_words(text):
+    return [word for word in _WORD.findall((text or '').lower()) if len(word) > 3 and word not in _CLOUD_STOP_WORDS]
+
+
+class _JobBuckets:
+    """One job's review totals per (product, sentiment, day), as numpy columns
+
+    Word counts are kept per (product, sentiment, month) over the job's
+    _JOB_VOCABULARY most frequent words.
+    """
+
+    def __init__(self, rows):
+        self.products = StringPool()
+        self.sentiments = StringPool()
+        cells = {}
+        word_cells = {}
+        row_words = []
+
+        for row in rows:
+            moment = parse_moment(row['datetime'])
+            product = self.products.encode(row.get('product_name'))
+            sentiment = self.sentiments.encode(row.get('sentiment_category') or 'neutral')
+            key = (product, sentiment, moment.toordinal())
+            cell = cells.get(key)
+            if cell is None:
+                # reviews, rated, rating sum, sentiment sum, 1-5 star counts
+                cell = cells[key] = [0, 0, 0.0, 0.0, 0, 0, 0, 0, 0]
+            cell[0] += 1
+            rating = row.get('rating')
+            if rating and rating > 0:
+                cell[1] += 1
+                cell[2] += rating
+                if 1 <= int(rating) <= 5:
+                    cell[3 + int(rating)] += 1
+            # Reviews without a score count as neutral (0), like the old charts did
+            cell[3] += row.get('sentiment_score') or 0
+
+            words = cloud_words(row.get('text'))
+            if words:
+                row_words.append(((product, sentiment, moment.year * 12 + moment.month - 1), words))
+
+        keys = list(cells)
+        values = np.array([cells[key] for key in keys], dtype=np.float64).reshape(len(keys), 9)
+        key_array = np.array(keys, dtype=np.int64).reshape(len(keys), 3)
+        self.product = key_array[:, 0]
+        self.sentiment = key_array[:, 1]
+        self.day = key_array[:, 2]
+        # Day ordinals are Monday = 1 (mod 7), so this is the preceding Sunday
+        self.week = self.day - self.day % 7
+        self.reviews = values[:, 0]
+        self.rated = values[:, 1]
+        self.rating_sum = values[:, 2]
+        self.sentiment_sum = values[:, 3]
+        self.histogram = values[:, 4:9]
+
+        frequencies = Counter(word for _, words in row_words for word in words)
+        self.vocabulary = [word for word, _ in frequencies.most_common(_JOB_VOCABULARY)]
+        word_ids = {word: index for index, word in enumerate(self.vocabulary)}
+        for key, words in row_words:
+            counts = word_cells.get(key)
+            if counts is None:
+                counts = word_cells[key] = np.zeros(len(self.vocabulary), dtype=np.int32)
+            ids = [word_ids[word] for word in words if word in word_ids]
+            np.add.at(counts, ids, 1)
+
+        word_keys = np.array(list(word_cells), dtype=np.int64).reshape(len(word_cells), 3)
+        self.word_product = word_keys[:, 0]
+        self.word_sentiment = word_keys[:, 1]
+        self.word_month = word_keys[:, 2]
+        self.word_counts = (
+            np.vstack(list(word_cells.values())) if word_cells
+            else np.zeros((0, len(self.vocabulary)), dtype=np.int32)
+        )
+
+    def __len__(self):
+        return len(self.reviews)
+
+    def masks(self, product, sentiment, first_day, last_day):
+        """Boolean masks over day cells and word cells; None if nothing can match"""
+        product_code = self.products.lookup(product) if product is not None else None
+        sentiment_code = self.sentiments.lookup(sentiment) if sentiment is not None else None
+        if (product is not None and product_code is None) or (sentiment is not None and sentiment_code is None):
+            return None
+
+        cells = np.ones(len(self.reviews), dtype=bool)
+        words = np.ones(len(self.word_month), dtype=bool)
+        if product_code is not None:
+            cells &= self.product == product_code
+            words &= self.word_product == product_code
+        if sentiment_code is not None:
+            cells &= self.sentiment == sentiment_code
+            words &= self.word_sentiment == sentiment_code
+        if first_day is not None:
+            cells &= self.day >= first_day.toordinal()
+            words &= self.word_month >= first_day.year * 12 + first_day.month - 1
+        if last_day is not None:
+            cells &= self.day <= last_day.toordinal()
+            words &= self.word_month <= last_day.year * 12 + last_day.month - 1
+        return cells, words
+
+
+class DashboardAggregates:
+    """Pre-bucketed dashboard chart totals of every completed job
+
+    Each job's reviews are summed once, on completion, into (product,
+    sentiment category, day) buckets held as numpy columns. A chart query
+    masks and sums the buckets of each job in scope, so no individual
+    review is visited and the response size depends on the number of
+    products and weeks covered rather than on the number of reviews.
+    Date filters apply per day, except for top words, which are counted
+    per month.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def add_job(self, job_id, rows):
+        """Bucket a job's dashboard rows (dicts with an ISO 'datetime')"""
+        buckets = _JobBuckets(rows)
+        with self._lock:
+            self._jobs[job_id] = buckets
+        return len(buckets)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def query(self, job_id=None, product=None, sentiment=None, start=None, end=None, top_words=100):
+        """Chart series for the reviews matching the filters
+
+        `start`/`end` are inclusive datetimes. 'product_names' lists every
+        product in scope before the product, sentiment and date filters, for
+        the dashboard's product picker.
+        """
+        with self._lock:
+            if job_id is not None:
+                jobs = [self._jobs[job_id]] if job_id in self._jobs else []
+            else:
+                jobs = list(self._jobs.values())
+
+        first_day = start.date() if start is not None else None
+        last_day = end.date() if end is not None else None
+
+        product_names = set()
+        totals = np.zeros(4)
+        histogram = np.zeros(5)
+        sentiment_counts = dict.fromkeys(SENTIMENT_CATEGORIES, 0)
+        weeks = {}
+        products = {}
+        words = Counter()
+
+        for buckets in jobs:
+            product_names.update(name for name in buckets.products.values if name)
+            masks = buckets.masks(product, sentiment, first_day, last_day)
+            if masks is None:
+                continue
+            cells, word_cells = masks
+            reviews = buckets.reviews[cells]
+            rated = buckets.rated[cells]
+            rating_sum = buckets.rating_sum[cells]
+            sentiment_sum = buckets.sentiment_sum[cells]
+
+            totals += (reviews.sum(), rated.sum(), rating_sum.sum(), sentiment_sum.sum())
+            histogram += buckets.histogram[cells].sum(axis=0)
+
+            per_sentiment = np.bincount(buckets.sentiment[cells], weights=reviews, minlength=len(buckets.sentiments))
+            for name, count in zip(buckets.sentiments.values, per_sentiment.tolist()):
+                if name in sentiment_counts:
+                    sentiment_counts[name] += int(count)
+
+            week_starts, week_index = np.unique(buckets.week[cells], return_inverse=True)
+            for week, count, total in zip(
+                week_starts.tolist(),
+                np.bincount(week_index, weights=reviews, minlength=len(week_starts)).tolist(),
+                np.bincount(week_index, weights=sentiment_sum, minlength=len(week_starts)).tolist()
+            ):
+                week_totals = weeks.setdefault(week, [0, 0.0])
+                week_totals[0] += count
+                week_totals[1] += total
+
+            codes = buckets.product[cells]
+            size = len(buckets.products)
+            for name, *sums in zip(
+                buckets.products.values,
+                np.bincount(codes, weights=reviews, minlength=size).tolist(),
+                np.bincount(codes, weights=rated, minlength=size).tolist(),
+                np.bincount(codes, weights=rating_sum, minlength=size).tolist(),
+                np.bincount(codes, weights=sentiment_sum, minlength=size).tolist()
+            ):
+                if name and sums[0]:
+                    product_totals = products.setdefault(name, [0, 0, 0.0, 0.0])
+                    for index, value in enumerate(sums):
+                        product_totals[index] += value
+
+            word_counts = buckets.word_counts[word_cells].sum(axis=0).tolist()
+            words.update({word: count for word, count in zip(buckets.vocabulary, word_counts) if count})
+
+        review_count, rated_count, rating_total, sentiment_total = totals.tolist()
+        return {
+            'total_reviews': int(review_count),
+            'average_rating': _mean(rating_total, rated_count),
+            'average_sentiment': _mean(sentiment_total, review_count),
+            'total_products': len(products),
+            'weekly_sentiment': [
+                {'week': _iso_day(week), 'reviews': int(count), 'average_sentiment': _mean(total, count)}
+                for week, (count, total) in sorted(weeks.items())
+            ],
+            'rating_histogram': [int(count) for count in histogram.tolist()],
+            'sentiment_counts': sentiment_counts,
+            'products': [
+                {
+                    'product_name': name,
+                    'reviews': int(count),
+                    'average_rating': _mean(rating_sum, rated),
+                    'average_sentiment': _mean(sentiment_sum, count)
+                }
+                for name, (count, rated, rating_sum, sentiment_sum) in sorted(
+                    products.items(), key=lambda item: (-item[1][0], item[0])
+                )
+            ],
+            'top_words': words.most_common(top_words),
+            'product_names': sorted(product_names)
+        }
+
+    def stats(self):
+        with self._lock:
+            return {'jobs': len(self._jobs), 'buckets': sum(len(buckets) for buckets in self._jobs.values())}
+
+
+def _iso_day(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+def _mean(total, count):
+    return round(total / count, 4) if count else None
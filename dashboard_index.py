@@ -0,0 +1,201 @@
+import base64
+import bisect
+import threading
+from datetime import datetime, timedelta
+
+
+DASHBOARD_FILTERS = ('job_id', 'product', 'sentiment')
+COLUMNAR_FIELDS = ('product', 'sentiment_category', 'rating', 'sentiment_score', 'datetime', 'text', 'author')
+
+# Posting list keys: one list over every row, then one per filter value
+_ALL = ('all', None)
+_ROW_FIELDS = {'job_id': 'job_id', 'product': 'product_name', 'sentiment': 'sentiment_category'}
+
+
+def parse_moment(value, end_of_day=False):
+    """Naive datetime from an ISO date or datetime string
+
+    A bare date with `end_of_day` covers the whole day (used for inclusive
+    upper bounds). Aware datetimes are converted to local time.
+    """
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    if end_of_day and len(value.strip()) == 10:
+        moment += timedelta(days=1) - timedelta(microseconds=1)
+    return moment
+
+
+def columnar_rows(rows):
+    """Dashboard rows as one product table plus parallel per-review arrays
+
+    Job, category, product name and URL are stored once per product and
+    referenced by index from the 'product' column; sentiment categories are
+    coded the same way. Decode row i as columns[field][i] for each field.
+    """
+    product_codes = {}
+    sentiment_codes = {}
+    columns = {field: [] for field in COLUMNAR_FIELDS}
+    for row in rows:
+        product = (row.get('job_id'), row.get('category'), row.get('product_name'), row.get('product_url'))
+        code = product_codes.get(product)
+        if code is None:
+            code = product_codes[product] = len(product_codes)
+        sentiment = sentiment_codes.setdefault(row.get('sentiment_category'), len(sentiment_codes))
+        columns['product'].append(code)
+        columns['sentiment_category'].append(sentiment)
+        columns['rating'].append(row.get('rating'))
+        columns['sentiment_score'].append(row.get('sentiment_score'))
+        columns['datetime'].append(row.get('datetime'))
+        columns['text'].append(row.get('text'))
+        columns['author'].append(row.get('author'))
+
+    return {
+        'format': 'columnar',
+        'count': len(columns['product']),
+        'products': [
+            {'job_id': job_id, 'category': category, 'product_name': name, 'product_url': url}
+            for job_id, category, name, url in product_codes
+        ],
+        'sentiment_categories': list(sentiment_codes),
+        'columns': columns
+    }
+
+
+def encode_cursor(key):
+    moment, seq = key
+    raw = f'{moment.isoformat()}|{seq}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(datetime, seq) key of an encode_cursor() string; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        moment, seq = raw.rsplit('|', 1)
+        return datetime.fromisoformat(moment), int(seq)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+class DashboardIndex:
+    """Dashboard review rows of every completed job, ordered by review time
+
+    Rows are added once per job and keyed by (datetime, sequence number),
+    which orders them oldest first with a stable tiebreak. Besides the list
+    of every key there is a sorted posting list per job, product name and
+    sentiment category. A page is a binary search for the cursor (and the
+    from/to bounds) in the narrowest matching posting list followed by a
+    walk of `limit` keys, so its cost depends on the page size rather than
+    on how many reviews have ever been indexed. Filters beyond the first are
+    checked row by row during the walk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._postings = {_ALL: []}
+        self._job_keys = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add_job(self, job_id, rows):
+        """Index a job's rows (dicts with a non-empty ISO 'datetime')
+
+        Replaces anything previously indexed for `job_id`.
+        """
+        with self._lock:
+            self._remove(job_id)
+            keys = []
+            for row in rows:
+                key = (parse_moment(row['datetime']), self._next_seq)
+                self._next_seq += 1
+                self._rows[key[1]] = row
+                keys.append(key)
+            self._job_keys[job_id] = keys
+
+            additions = {}
+            for key in sorted(keys):
+                row = self._rows[key[1]]
+                additions.setdefault(_ALL, []).append(key)
+                for name, field in _ROW_FIELDS.items():
+                    additions.setdefault((name, row.get(field)), []).append(key)
+            # Timsort merges the two sorted runs in linear time
+            for posting, new_keys in additions.items():
+                self._postings[posting] = sorted(self._postings.get(posting, []) + new_keys)
+            return len(keys)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            return self._remove(job_id)
+
+    def job_rows(self, job_id):
+        """A job's rows in the order they were added, or None if not indexed"""
+        with self._lock:
+            keys = self._job_keys.get(job_id)
+            return None if keys is None else [self._rows[seq] for _, seq in keys]
+
+    def page(self, cursor=None, limit=100, start=None, end=None, **filters):
+        """Up to `limit` rows after `cursor`, oldest first
+
+        `filters` are DASHBOARD_FILTERS values (exact match); `start` and
+        `end` are inclusive datetime bounds. Returns (rows, next_cursor),
+        next_cursor being None on the last page.
+        """
+        unknown = set(filters) - set(DASHBOARD_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown dashboard filter(s) {sorted(unknown)}, expected {list(DASHBOARD_FILTERS)}")
+        filters = {name: value for name, value in filters.items() if value is not None}
+
+        with self._lock:
+            postings = [self._postings.get((name, value), []) for name, value in filters.items()]
+            keys = min(postings, key=len) if postings else self._postings[_ALL]
+
+            position = 0
+            if start is not None:
+                position = bisect.bisect_left(keys, (start, -1))
+            if cursor is not None:
+                position = max(position, bisect.bisect_right(keys, decode_cursor(cursor)))
+            stop = len(keys) if end is None else bisect.bisect_right(keys, (end, float('inf')))
+
+            page = []
+            last_key = None
+            while position < stop and len(page) < limit:
+                key = keys[position]
+                position += 1
+                row = self._rows[key[1]]
+                if all(row.get(_ROW_FIELDS[name]) == value for name, value in filters.items()):
+                    page.append(row)
+                    last_key = key
+
+            # Only hand out a cursor when something matching may follow
+            has_more = position < stop and len(page) == limit
+            return page, encode_cursor(last_key) if has_more else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rows': len(self._rows),
+                'jobs': len(self._job_keys),
+                'posting_lists': len(self._postings)
+            }
+
+    def _remove(self, job_id):
+        keys = self._job_keys.pop(job_id, None)
+        if not keys:
+            return 0
+        removed = set(keys)
+        touched = {_ALL}
+        for key in keys:
+            row = self._rows.pop(key[1])
+            for name, field in _ROW_FIELDS.items():
+                touched.add((name, row.get(field)))
+        for posting in touched:
+            remaining = [key for key in self._postings.get(posting, []) if key not in removed]
+            if remaining or posting == _ALL:
+                self._postings[posting] = remaining
+            else:
+                self._postings.pop(posting, None)
+        return len(keys)
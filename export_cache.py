@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def analysis_fingerprint(analysis_data, options=None):
+    """Stable SHA-256 hex digest of an analysis and the export options
+
+    Covers everything an export renders: category, summary, statistics,
+    product analyses and every review in the job's review table. Job ids,
+    store info and creation times are left out, so two jobs that produced the
+    same data share a fingerprint. With a review table, sample reviews are
+    left out too: exports render the table, and samples carry per-job
+    duplicate references.
+    """
+    digest = hashlib.sha256()
+    summary = analysis_data.get('summary')
+    review_table = analysis_data.get('review_table')
+
+    products = []
+    for product in analysis_data.get('products', []):
+        product = product.to_dict() if hasattr(product, 'to_dict') else dict(product)
+        if review_table is not None:
+            product.pop('sample_reviews', None)
+        products.append(product)
+
+    header = {
+        'category': analysis_data.get('category', ''),
+        'summary': summary.to_dict() if hasattr(summary, 'to_dict') else summary,
+        'statistics': analysis_data.get('statistics'),
+        'products': products,
+        'options': options or {}
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+
+    if review_table is not None:
+        review_table.update_digest(digest)
+    return digest.hexdigest()
+
+
+class ExportCache:
+    """Export files keyed by analysis fingerprint, stored in an ArtifactStore
+
+    A hit returns the stored file without rendering anything; a miss renders
+    it once and remembers which stored file the fingerprint produced. Files
+    keep their content-hash names, since a re-rendered export need not be
+    byte-identical (workbooks carry a save timestamp). Files evicted from the
+    store simply become misses again.
+    """
+
+    def __init__(self, store, max_entries=4096):
+        self.store = store
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._names = OrderedDict()  # fingerprint -> stored file name
+        self.counters = {'hits': 0, 'misses': 0, 'build_seconds': 0.0, 'fingerprint_seconds': 0.0}
+
+    def get_or_build(self, analysis_data, suffix, write, options=None):
+        """Path of the cached export, rendering it with `write(path)` on a miss"""
+        started = time.perf_counter()
+        key = analysis_fingerprint(analysis_data, {'suffix': suffix, **(options or {})})
+        fingerprinted = time.perf_counter()
+
+        with self._lock:
+            name = self._names.get(key)
+        path = self.store.get(name) if name else None
+        with self._lock:
+            self.counters['fingerprint_seconds'] += fingerprinted - started
+            if path is not None:
+                self._names.move_to_end(key)
+                self.counters['hits'] += 1
+                return path
+            self._names.pop(key, None)
+            self.counters['misses'] += 1
+
+        path = self.store.store(write, suffix)
+        with self._lock:
+            self._names[key] = os.path.basename(path)
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+            self.counters['build_seconds'] += time.perf_counter() - fingerprinted
+        return path
+
+    def stats(self):
+        with self._lock:
+            hits = self.counters['hits']
+            misses = self.counters['misses']
+            lookups = hits + misses
+            average_build = self.counters['build_seconds'] / misses if misses else 0.0
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else None,
+                'build_seconds': round(self.counters['build_seconds'], 3),
+                'fingerprint_seconds': round(self.counters['fingerprint_seconds'], 3),
+                'estimated_seconds_saved': round(hits * average_build, 3)
+            }
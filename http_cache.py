@@ -0,0 +1,93 @@
+import gzip
+
+from flask import Response
+
+# Brotli is optional; without it responses are offered gzip-compressed only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Job payloads never change once built, so clients may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Bodies smaller than this are not worth a compressed copy
+_MIN_COMPRESS_BYTES = 1024
+# Preferred content codings, best first
+_CODINGS = ('br', 'gzip')
+
+
+def brotli_available():
+    return brotli is not None
+
+
+class EncodedPayload:
+    """A response body kept alongside its gzip (and brotli) encodings
+
+    Compression happens once, when the payload is built; serving it is a
+    choice among ready byte strings. `etag` names the identity body, and
+    each encoding gets its own strong ETag with the coding appended, since
+    the bytes differ. Encodings that do not shrink the body are dropped.
+    """
+
+    def __init__(self, body, etag, mimetype='application/json'):
+        self.body = body
+        self.etag = etag
+        self.mimetype = mimetype
+        self.encodings = {}
+        if len(body) >= _MIN_COMPRESS_BYTES:
+            if brotli is not None:
+                self.encodings['br'] = brotli.compress(body, quality=5)
+            # mtime=0 keeps the gzip bytes (and so the ETag) reproducible
+            self.encodings['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+            for coding, data in list(self.encodings.items()):
+                if len(data) >= len(body):
+                    del self.encodings[coding]
+
+    def variant(self, accept_encodings):
+        """(coding, body, etag) to send for a request's Accept-Encoding"""
+        best = None
+        for coding in _CODINGS:
+            quality = accept_encodings.quality(coding)
+            if coding in self.encodings and quality > 0 and (best is None or quality > best[0]):
+                best = (quality, coding)
+        if best is None:
+            return 'identity', self.body, self.etag
+        coding = best[1]
+        return coding, self.encodings[coding], f'{self.etag}-{coding}'
+
+    def nbytes(self):
+        return len(self.body) + sum(len(data) for data in self.encodings.values())
+
+
+def payload_response(payload, request, max_age=IMMUTABLE_MAX_AGE):
+    """Serve an EncodedPayload with content negotiation and conditional GET
+
+    Answers 304 Not Modified when If-None-Match already names the variant
+    being served. Responses are private, immutable and vary on
+    Accept-Encoding.
+    """
+    coding, body, etag = payload.variant(request.accept_encodings)
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=payload.mimetype)
+        if coding != 'identity':
+            response.headers['Content-Encoding'] = coding
+
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    cache_immutable(response, max_age)
+    return response
+
+
+def cache_immutable(response, max_age=IMMUTABLE_MAX_AGE):
+    # send_file marks responses no-cache (or public) by default
+    response.cache_control.no_cache = None
+    response.cache_control.public = None
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    response.cache_control.immutable = True
+    return response
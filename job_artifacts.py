@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+ARTIFACT_PENDING = 'pending'
+ARTIFACT_BUILDING = 'building'
+ARTIFACT_READY = 'ready'
+ARTIFACT_FAILED = 'error'
+
+
+class JobArtifacts:
+    """Readiness flags and built values of one job's artifacts
+
+    Each artifact moves pending -> building -> ready (or error). Readers
+    never block: get() returns None until the artifact is ready, and
+    status() reports every artifact's state for the status endpoint.
+    `on_change()` is called after every state change.
+    """
+
+    def __init__(self, on_change=None):
+        self._lock = threading.Lock()
+        self._state = {}
+        self._values = {}
+        self._done = {}
+        self._on_change = on_change
+
+    def register(self, name):
+        with self._lock:
+            self._state[name] = {'status': ARTIFACT_PENDING, 'error': None, 'build_seconds': None}
+            self._values.pop(name, None)
+            self._done[name] = threading.Event()
+        self._changed()
+
+    def get(self, name):
+        """The built value, or None while it is not ready"""
+        with self._lock:
+            return self._values.get(name)
+
+    def is_ready(self, name):
+        with self._lock:
+            return self._state.get(name, {}).get('status') == ARTIFACT_READY
+
+    def wait(self, name, timeout=None):
+        """Block until `name` is ready or failed; True if it is ready"""
+        with self._lock:
+            done = self._done.get(name)
+        if done is None or not done.wait(timeout):
+            return False
+        return self.is_ready(name)
+
+    def status(self):
+        """Dict of artifact name -> {'status', 'ready', 'error', 'build_seconds'}"""
+        with self._lock:
+            return {
+                name: {**state, 'ready': state['status'] == ARTIFACT_READY}
+                for name, state in self._state.items()
+            }
+
+    def _set(self, name, status, value=None, error=None, build_seconds=None):
+        with self._lock:
+            state = self._state[name]
+            state['status'] = status
+            state['error'] = error
+            if build_seconds is not None:
+                state['build_seconds'] = round(build_seconds, 3)
+            if status == ARTIFACT_READY:
+                self._values[name] = value
+            done = self._done[name]
+        if status in (ARTIFACT_READY, ARTIFACT_FAILED):
+            done.set()
+        self._changed()
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+
+class ArtifactBuilder:
+    """Shared thread pool that renders job artifacts off the request path
+
+    build() returns immediately; each artifact is rendered by its own pool
+    task, so a slow one (the Excel workbook) does not hold up the others.
+    """
+
+    def __init__(self, max_workers=3):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='artifacts')
+
+    def build(self, artifacts, builders, on_ready=None):
+        """Render {name: zero-argument callable} into `artifacts`
+
+        `on_ready(name, value)` is called from the pool thread just before an
+        artifact is marked ready, so anything waiting on it sees its effects.
+        """
+        for name in builders:
+            artifacts.register(name)
+        return [
+            self._executor.submit(self._render, artifacts, name, builder, on_ready)
+            for name, builder in builders.items()
+        ]
+
+    @staticmethod
+    def _render(artifacts, name, builder, on_ready):
+        artifacts._set(name, ARTIFACT_BUILDING)
+        started = time.perf_counter()
+        try:
+            value = builder()
+        except Exception as e:
+            print(f"❌ Building artifact '{name}' failed: {e}")
+            artifacts._set(name, ARTIFACT_FAILED, error=str(e), build_seconds=time.perf_counter() - started)
+            return
+
+        if on_ready is not None:
+            try:
+                on_ready(name, value)
+            except Exception as e:
+                print(f"❌ Artifact '{name}' ready callback failed: {e}")
+        artifacts._set(name, ARTIFACT_READY, value=value, build_seconds=time.perf_counter() - started)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
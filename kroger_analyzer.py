@@ -6,18 +6,39 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
+import asyncio
+import sys
 import time
 import re
 import random
 from textblob import TextBlob
-import pandas as pd
 from collections import Counter
 import tempfile
 import os
-from urllib.parse import urljoin, quote_plus
-from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 import json
+import uuid
 import requests
+from review_pipeline import ProductPipeline
+from category_summary import CategorySummaryAggregator
+from review_table import ReviewTable
+from review_samples import ReviewSampler
+from review_search import meaningful_words
+from workbook_export import write_analysis_workbook
+from records import Product, ProductAnalysis, Review
+from review_dates import DateNormalizer
+from review_dedup import ReviewFingerprintIndex
+from product_cache import LRUCache
+from product_identity import KROGER_BASE_URL, ProductIndex, ProductNameMatcher, product_key
+from product_candidates import (
+    LISTING_PATTERNS, classify_candidates, clean_candidate_name, name_verdict,
+    rejection_counts, url_rejection
+)
+
+# Scraped reviews and sentiment results, keyed by canonical product ID and
+# shared by every analyzer in the process (app.py builds one per job)
+REVIEW_CACHE = LRUCache(max_entries=256, ttl=3600)
+SENTIMENT_CACHE = LRUCache(max_entries=256, ttl=3600)
 
 class KrogerReviewAnalyzer:
     def __init__(self, use_selenium=True, headless=True):
@@ -25,6 +46,16 @@ class KrogerReviewAnalyzer:
         self.headless = headless
         self.session = None
         self.driver = None
+        self.pipeline_stats = None
+        self.dedup_stats = None
+        
+        self.review_cache = REVIEW_CACHE
+        self.sentiment_cache = SENTIMENT_CACHE
+        self.date_normalizer = DateNormalizer()
+        
+        # Representative reviews kept per sentiment bucket ('polarity' or 'recent')
+        self.sample_reviews_per_bucket = 3
+        self.sample_review_order = 'polarity'
         
         # Cincinnati Kroger store information (multiple options)
         self.cincinnati_stores = {
@@ -816,7 +847,7 @@ class KrogerReviewAnalyzer:
             ]
             
             products_found = []
-            seen_urls = set()
+            seen_products = set()
             
             for selector in local_selectors:
                 if time.time() - start_time > max_time:
@@ -833,26 +864,26 @@ class KrogerReviewAnalyzer:
                     if not elements:
                         continue
                     
-                    for element in elements[:max_products * 3]:
+                    # Classify every link up front; names are only read for
+                    # elements whose URL passes
+                    elements = elements[:max_products * 3]
+                    hrefs = [self._element_href(element) for element in elements]
+                    candidates = classify_candidates([(href, None) for href in hrefs])
+                    
+                    for element, candidate in zip(elements, candidates):
                         try:
-                            href = element.get_attribute('href')
-                            if not href or href in seen_urls:
-                                continue
-                            
-                            if not self._is_valid_kroger_product_url(href):
+                            if not candidate['accepted'] or product_key(candidate['href']) in seen_products:
                                 continue
                             
                             product_name = self._extract_product_name_local(element)
                             if not product_name or len(product_name) < 5:
                                 continue
                             
-                            full_url = href if href.startswith('http') else f"https://www.kroger.com{href}"
-                            
                             products_found.append({
                                 'name': product_name,
-                                'url': full_url
+                                'url': candidate['url']
                             })
-                            seen_urls.add(href)
+                            seen_products.add(product_key(candidate['href']))
                             print(f"✅ Found: {product_name}")
                             
                             if len(products_found) >= max_products:
@@ -942,51 +973,30 @@ class KrogerReviewAnalyzer:
 
     def _parse_products_from_content(self, content, max_products):
         try:
-            # Look for JSON data structures (common in modern sites)
-            json_patterns = [
-                r'"href":"([^"]*\/p\/[^"]*)"[^}]*?"name":"([^"]*)"',
-                r'"url":"([^"]*\/p\/[^"]*)"[^}]*?"title":"([^"]*)"',
-                r'"link":"([^"]*\/p\/[^"]*)"[^}]*?"productName":"([^"]*)"'
-            ]
-            
-            # Look for HTML patterns
-            html_patterns = [
-                r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*aria-label="([^"]*)"',
-                r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*title="([^"]*)"',
-                r'href="([^"]*\/p\/[^"]*)"[^>]*>([^<]+)</a>'
-            ]
-            
             products_found = []
-            seen_urls = set()
-            
-            all_patterns = json_patterns + html_patterns
+            seen_products = set()
             
-            for pattern in all_patterns:
-                matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
+            for pattern in LISTING_PATTERNS:
+                matches = pattern.findall(content)
                 print(f"Pattern found {len(matches)} matches")
                 
-                for href, name in matches:
-                    if href in seen_urls or len(products_found) >= max_products:
+                candidates = classify_candidates(matches, base_url=KROGER_BASE_URL)
+                for candidate in candidates:
+                    if not candidate['accepted'] or len(products_found) >= max_products:
                         continue
-                    
-                    if not self._is_valid_kroger_product_url(href):
+                    if product_key(candidate['href']) in seen_products:
                         continue
                     
-                    # Clean up name
-                    clean_name = re.sub(r'<[^>]+>', '', name).strip()
-                    clean_name = re.sub(r'\s+', ' ', clean_name)
-                    clean_name = re.sub(r'[^\w\s\-\.,&()%]', '', clean_name)
-                    
-                    if not self._looks_like_product_name(clean_name):
-                        continue
-                    
-                    full_url = urljoin("https://www.kroger.com", href)
                     products_found.append({
-                        'name': clean_name,
-                        'url': full_url
+                        'name': candidate['name'],
+                        'url': candidate['url']
                     })
-                    seen_urls.add(href)
-                    print(f"✅ Found: {clean_name}")
+                    seen_products.add(product_key(candidate['href']))
+                    print(f"✅ Found: {candidate['name']}")
+                
+                rejected = rejection_counts(candidates)
+                if rejected:
+                    print(f"🚫 Rejected candidates: {rejected}")
                 
                 if products_found:
                     break
@@ -1040,7 +1050,7 @@ class KrogerReviewAnalyzer:
             ]
             
             products_found = []
-            seen_urls = set()
+            seen_products = set()
             
             for selector in local_selectors:
                 if time.time() - start_time > max_time:
@@ -1058,28 +1068,26 @@ class KrogerReviewAnalyzer:
                     if not elements:
                         continue
                     
-                    for element in elements[:max_products * 3]:
+                    # Classify every link up front; names are only read for
+                    # elements whose URL passes
+                    elements = elements[:max_products * 3]
+                    hrefs = [self._element_href(element) for element in elements]
+                    candidates = classify_candidates([(href, None) for href in hrefs])
+                    
+                    for element, candidate in zip(elements, candidates):
                         try:
-                            href = element.get_attribute('href')
-                            if not href or href in seen_urls:
+                            if not candidate['accepted'] or product_key(candidate['href']) in seen_products:
                                 continue
                             
-                            # Validate URL like local testing
-                            if not self._is_valid_kroger_product_url(href):
-                                continue
-                            
-                            # Extract name carefully
                             product_name = self._extract_product_name_local(element)
                             if not product_name or len(product_name) < 5:
                                 continue
                             
-                            full_url = href if href.startswith('http') else f"https://www.kroger.com{href}"
-                            
                             products_found.append({
                                 'name': product_name,
-                                'url': full_url
+                                'url': candidate['url']
                             })
-                            seen_urls.add(href)
+                            seen_products.add(product_key(candidate['href']))
                             print(f"✅ Found: {product_name}")
                             
                             if len(products_found) >= max_products:
@@ -1126,32 +1134,14 @@ class KrogerReviewAnalyzer:
     
     def _is_valid_kroger_product_url(self, url):
         """Validate Kroger product URLs like local testing would"""
-        if not url:
-            return False
-        
-        url_lower = url.lower()
-        
-        # Must be Kroger and contain product indicators
-        if 'kroger.com' not in url_lower:
-            return False
-        
-        # Look for actual product URL patterns
-        valid_patterns = ['/p/', '/product/', '/item/']
-        if not any(pattern in url_lower for pattern in valid_patterns):
-            return False
-        
-        # Should not be navigation/utility pages
-        invalid_patterns = [
-            'search', 'category', 'department', 'help', 'account',
-            'login', 'register', 'cart', 'checkout', 'store-locator',
-            'recipe', 'coupon', 'deals', 'weekly-ad'
-        ]
-        
-        for pattern in invalid_patterns:
-            if pattern in url_lower:
-                return False
-        
-        return True
+        return url_rejection(url) is None
+    
+    def _element_href(self, element):
+        """Read a link element's href, or None if the element went stale"""
+        try:
+            return element.get_attribute('href')
+        except Exception:
+            return None
     
     def _extract_product_name_local(self, element):
         """Extract product name like local testing (more thorough)"""
@@ -1180,8 +1170,7 @@ class KrogerReviewAnalyzer:
                     name = strategy(element)
                     if name and len(name.strip()) > 5:
                         # Clean up
-                        clean_name = re.sub(r'\s+', ' ', name.strip())
-                        clean_name = re.sub(r'[^\w\s\-\.,&()%]', '', clean_name)
+                        clean_name = clean_candidate_name(name)
                         
                         # Validate it looks like a product name
                         if self._looks_like_product_name(clean_name):
@@ -1196,42 +1185,7 @@ class KrogerReviewAnalyzer:
     
     def _looks_like_product_name(self, name):
         """Check if name looks like an actual product"""
-        if not name or len(name) < 5:
-            return False
-        
-        name_lower = name.lower()
-        
-        # Skip obvious UI elements
-        ui_terms = [
-            'search', 'filter', 'sort', 'view all', 'see more',
-            'next', 'previous', 'page', 'results', 'loading',
-            'menu', 'navigation', 'add to cart', 'quick view'
-        ]
-        
-        for term in ui_terms:
-            if term in name_lower:
-                return False
-        
-        # Must look like product (has brand, size, or food words)
-        product_indicators = [
-            # Sizes and measurements
-            'oz', 'lb', 'lbs', 'kg', 'gram', 'ml', 'liter',
-            'pack', 'count', 'ct', 'piece', 'pc',
-            
-            # Food descriptors
-            'organic', 'natural', 'fresh', 'frozen', 'low',
-            'whole', 'skim', 'fat', 'free', 'gluten',
-            'sugar', 'sodium', 'calorie',
-            
-            # Common brands (Kroger carries)
-            'kroger', 'simple truth', 'private selection'
-        ]
-        
-        # Must be reasonable length OR have indicators
-        word_count = len(name.split())
-        has_indicators = any(indicator in name_lower for indicator in product_indicators)
-        
-        return word_count >= 2 and (word_count <= 12 or has_indicators)
+        return name_verdict(name)[0]
     
     def _search_with_local_requests(self, search_url, max_products, start_time, max_time):
         """Requests search mimicking local development"""
@@ -1255,54 +1209,33 @@ class KrogerReviewAnalyzer:
             # Parse response like local development
             content = response.text
             
-            # Look for JSON data structures (common in modern sites)
-            json_patterns = [
-                r'"href":"([^"]*\/p\/[^"]*)"[^}]*?"name":"([^"]*)"',
-                r'"url":"([^"]*\/p\/[^"]*)"[^}]*?"title":"([^"]*)"',
-                r'"link":"([^"]*\/p\/[^"]*)"[^}]*?"productName":"([^"]*)"'
-            ]
-            
-            # Look for HTML patterns
-            html_patterns = [
-                r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*aria-label="([^"]*)"',
-                r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*title="([^"]*)"',
-                r'href="([^"]*\/p\/[^"]*)"[^>]*>([^<]+)</a>'
-            ]
-            
             products_found = []
-            seen_urls = set()
-            
-            all_patterns = json_patterns + html_patterns
+            seen_products = set()
             
-            for pattern in all_patterns:
+            for pattern in LISTING_PATTERNS:
                 if time.time() - start_time > max_time:
                     break
                 
-                matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
+                matches = pattern.findall(content)
                 print(f"Pattern found {len(matches)} matches")
                 
-                for href, name in matches:
-                    if href in seen_urls or len(products_found) >= max_products:
+                candidates = classify_candidates(matches, base_url=search_url)
+                for candidate in candidates:
+                    if not candidate['accepted'] or len(products_found) >= max_products:
                         continue
-                    
-                    if not self._is_valid_kroger_product_url(href):
+                    if product_key(candidate['href']) in seen_products:
                         continue
                     
-                    # Clean up name
-                    clean_name = re.sub(r'<[^>]+>', '', name).strip()
-                    clean_name = re.sub(r'\s+', ' ', clean_name)
-                    clean_name = re.sub(r'[^\w\s\-\.,&()%]', '', clean_name)
-                    
-                    if not self._looks_like_product_name(clean_name):
-                        continue
-                    
-                    full_url = urljoin(search_url, href)
                     products_found.append({
-                        'name': clean_name,
-                        'url': full_url
+                        'name': candidate['name'],
+                        'url': candidate['url']
                     })
-                    seen_urls.add(href)
-                    print(f"✅ Found: {clean_name}")
+                    seen_products.add(product_key(candidate['href']))
+                    print(f"✅ Found: {candidate['name']}")
+                
+                rejected = rejection_counts(candidates)
+                if rejected:
+                    print(f"🚫 Rejected candidates: {rejected}")
                 
                 if products_found:
                     break
@@ -1315,16 +1248,31 @@ class KrogerReviewAnalyzer:
     
     def _clean_product_list(self, products):
         """Clean and deduplicate product list"""
+        product_index = ProductIndex()
+        name_matcher = ProductNameMatcher()
         seen_names = set()
         clean_products = []
         
         for product in products:
+            # Same product ID under a different slug, name or tracking URL
+            product, is_new = product_index.add(product)
+            if not is_new:
+                continue
+            
             # Create a normalized name for comparison
-            norm_name = re.sub(r'[^\w\s]', '', product['name'].lower()).strip()
+            norm_name = re.sub(r'[^\w\s]', '', product.name.lower()).strip()
+            
+            if norm_name in seen_names or len(norm_name) <= 5:
+                continue
+            seen_names.add(norm_name)
+            
+            # Same item listed with different punctuation or unit spellings
+            duplicate_of = name_matcher.add(product.name, product.name)
+            if duplicate_of is not None:
+                print(f"🔁 Skipping near-duplicate listing: {product.name} (same as {duplicate_of})")
+                continue
             
-            if norm_name not in seen_names and len(norm_name) > 5:
-                seen_names.add(norm_name)
-                clean_products.append(product)
+            clean_products.append(product)
         
         return clean_products
     
@@ -1333,15 +1281,16 @@ class KrogerReviewAnalyzer:
         print(f"📝 Generating sample reviews for: {product_url}")
         
         # Generate realistic mock reviews for demonstration
+        reviewed_at = self.date_normalizer.now.isoformat()
         mock_reviews = [
-            {"rating": 5, "text": "Great quality product! Very fresh and tasty.", "author": "LocalCustomer1", "datetime": datetime.now().isoformat()},
-            {"rating": 4, "text": "Good value for the price. Would buy again.", "author": "LocalCustomer2", "datetime": datetime.now().isoformat()},
-            {"rating": 5, "text": "Excellent! My family loves this product.", "author": "LocalCustomer3", "datetime": datetime.now().isoformat()},
-            {"rating": 3, "text": "It's okay. Average quality for the price.", "author": "LocalCustomer4", "datetime": datetime.now().isoformat()},
-            {"rating": 4, "text": "Pretty good. Fresh and well-packaged.", "author": "LocalCustomer5", "datetime": datetime.now().isoformat()},
-            {"rating": 5, "text": "Perfect for our needs. Highly recommend!", "author": "LocalCustomer6", "datetime": datetime.now().isoformat()},
-            {"rating": 2, "text": "Not what I expected. Could be better.", "author": "LocalCustomer7", "datetime": datetime.now().isoformat()},
-            {"rating": 4, "text": "Good product overall. Meets expectations.", "author": "LocalCustomer8", "datetime": datetime.now().isoformat()}
+            {"rating": 5, "text": "Great quality product! Very fresh and tasty.", "author": "LocalCustomer1", "datetime": reviewed_at},
+            {"rating": 4, "text": "Good value for the price. Would buy again.", "author": "LocalCustomer2", "datetime": reviewed_at},
+            {"rating": 5, "text": "Excellent! My family loves this product.", "author": "LocalCustomer3", "datetime": reviewed_at},
+            {"rating": 3, "text": "It's okay. Average quality for the price.", "author": "LocalCustomer4", "datetime": reviewed_at},
+            {"rating": 4, "text": "Pretty good. Fresh and well-packaged.", "author": "LocalCustomer5", "datetime": reviewed_at},
+            {"rating": 5, "text": "Perfect for our needs. Highly recommend!", "author": "LocalCustomer6", "datetime": reviewed_at},
+            {"rating": 2, "text": "Not what I expected. Could be better.", "author": "LocalCustomer7", "datetime": reviewed_at},
+            {"rating": 4, "text": "Good product overall. Meets expectations.", "author": "LocalCustomer8", "datetime": reviewed_at}
         ]
         
         # Return random selection
@@ -1350,43 +1299,87 @@ class KrogerReviewAnalyzer:
         return selected
     
     # Include all other methods from the previous analyzer
-    def analyze_category_by_products(self, category, max_products=10, max_reviews_per_product=20):
+    def analyze_category_by_products(self, category, max_products=10, max_reviews_per_product=20, pipeline_queue_size=2, review_index=None):
         """Main analysis method optimized for Cincinnati location"""
+        analysis = None
+        for event in self.iter_category_analysis(category, max_products, max_reviews_per_product, pipeline_queue_size, review_index):
+            if event['type'] == 'summary':
+                analysis = event['analysis']
+        return analysis
+    
+    def iter_category_analysis(self, category, max_products=10, max_reviews_per_product=20, pipeline_queue_size=2, review_index=None):
+        """Yield each product's analysis as soon as it is ready, then a summary event
+        
+        Product events look like {'type': 'product', 'index', 'product', 'analysis',
+        'reviews', 'summary', 'review_table'}, where 'reviews' are the product's
+        scored Review records, 'summary' is the category summary of products so
+        far and 'review_table' the job's growing ReviewTable.
+        The final event is {'type': 'summary', 'analysis'} where 'analysis' is the
+        dict analyze_category_by_products returns (None if nothing was analyzed).
+        
+        Pass a shared ReviewFingerprintIndex as `review_index` to also detect
+        reviews duplicated across jobs.
+        """
         print(f"🚀 Starting Cincinnati-based analysis for '{category}'")
         print(f"🏪 Using store: {self.cincinnati_store['name']} (ID: {self.cincinnati_store['store_id']})")
         
-        products = self.search_products(category, max_products)
-        
-        if not products:
-            print("❌ No products found")
-            return None
+        # One reference "now" per job keeps relative review dates consistent
+        self.date_normalizer = DateNormalizer()
+        if review_index is None:
+            review_index = ReviewFingerprintIndex()
+        pipeline = self._build_product_pipeline(category, max_products, max_reviews_per_product, pipeline_queue_size, review_index)
+        aggregator = self._new_summary_aggregator(category)
+        review_table = ReviewTable()
+        product_analyses = []
         
-        print(f"✅ Found {len(products)} products")
+        try:
+            for product_analysis, reviews in pipeline.run():
+                product_analyses.append(product_analysis)
+                aggregator.add(product_analysis)
+                review_table.add_product(product_analysis.product_name, product_analysis.product_url, reviews)
+                yield {
+                    'type': 'product',
+                    'index': len(product_analyses) - 1,
+                    'product': {
+                        'name': product_analysis.product_name,
+                        'url': product_analysis.product_url
+                    },
+                    'analysis': product_analysis,
+                    'reviews': reviews,
+                    'summary': aggregator.summary(),
+                    'review_table': review_table
+                }
+        finally:
+            self.pipeline_stats = pipeline.get_stats()
+            self.dedup_stats = dict(review_index.stats)
         
-        product_analyses = []
+        yield {
+            'type': 'summary',
+            'analysis': self._build_category_result(category, product_analyses, aggregator, review_table)
+        }
+    
+    async def aiter_category_analysis(self, category, max_products=10, max_reviews_per_product=20, pipeline_queue_size=2, review_index=None):
+        """Async iterator twin of iter_category_analysis
         
-        for i, product in enumerate(products):
-            print(f"📊 Processing product {i+1}/{len(products)}: {product['name']}")
-            
-            try:
-                reviews = self.scrape_product_reviews(product['url'], max_reviews_per_product)
-                
-                if reviews:
-                    product_analysis = self.analyze_sentiment(reviews)
-                    
-                    if product_analysis and "error" not in product_analysis:
-                        product_analysis['product_name'] = product['name']
-                        product_analysis['product_url'] = product['url']
-                        product_analysis['category'] = category
-                        product_analyses.append(product_analysis)
-                        print(f"✅ Added analysis for {product['name']}")
-            
-            except Exception as e:
-                print(f"❌ Error processing {product['name']}: {e}")
-                continue
-            
-            # Brief pause
-            time.sleep(random.uniform(0.5, 1.5))
+        The blocking pipeline is stepped from a worker thread so the event loop
+        stays free while products are searched, scraped and analyzed.
+        """
+        events = self.iter_category_analysis(category, max_products, max_reviews_per_product, pipeline_queue_size, review_index)
+        finished = object()
+        try:
+            while True:
+                event = await asyncio.to_thread(next, events, finished)
+                if event is finished:
+                    break
+                yield event
+        finally:
+            await asyncio.to_thread(events.close)
+    
+    def _build_category_result(self, category, product_analyses, aggregator, review_table):
+        """Assemble the final category analysis dict"""
+        if self.pipeline_stats['search']['items'] == 0:
+            print("❌ No products found")
+            return None
         
         if not product_analyses:
             print("❌ No valid product analyses generated")
@@ -1394,17 +1387,122 @@ class KrogerReviewAnalyzer:
         
         print(f"✅ Analysis complete: {len(product_analyses)} products processed")
         
-        # Create summary
-        summary_analysis = self._create_category_summary(product_analyses, category)
+        # Summary was accumulated as products completed
+        summary_analysis = aggregator.summary()
         
         return {
             'category': category,
             'summary': summary_analysis,
             'products': product_analyses,
             'total_products_analyzed': len(product_analyses),
-            'store_info': self.cincinnati_store
+            'store_info': self.cincinnati_store,
+            'statistics': review_table.statistics(),
+            'review_table': review_table
         }
     
+    def _build_product_pipeline(self, category, max_products, max_reviews_per_product, queue_size=2, review_index=None):
+        """Wire search, scrape and sentiment analysis into a staged pipeline"""
+        job_key = uuid.uuid4().hex
+        
+        def search():
+            products = self.search_products(category, max_products)
+            if products:
+                print(f"✅ Found {len(products)} products")
+            return [Product.coerce(product) for product in products or []]
+        
+        def scrape(product):
+            print(f"📊 Processing product: {product.name}")
+            return self._get_product_reviews(product, max_reviews_per_product)
+        
+        def analyze(product, reviews):
+            if review_index is not None:
+                reviews = self._dedupe_product_reviews(product, reviews, review_index, job_key)
+            product_analysis = self._get_product_sentiment(product, reviews)
+            
+            if not product_analysis or "error" in product_analysis:
+                return None
+            
+            product_analysis.product_name = product.name
+            product_analysis.product_url = product.url
+            product_analysis.product_id = product.product_id
+            product_analysis.category = sys.intern(category)
+            print(f"✅ Added analysis for {product.name}")
+            return product_analysis, reviews
+        
+        return ProductPipeline(
+            search, scrape, analyze,
+            queue_size=queue_size,
+            scrape_delay=lambda: random.uniform(0.5, 1.5)
+        )
+    
+    
+    def _get_product_reviews(self, product, max_reviews):
+        """Scrape a product's reviews unless they are already cached"""
+        cache_key = (product_key(product.url), max_reviews)
+        cached = self.review_cache.get(cache_key)
+        if cached is not None:
+            print(f"♻️ Using cached reviews for: {product.name}")
+            # Jobs flag and score their reviews, so each gets its own copies
+            return [review.copy() for review in cached]
+        
+        scraped = self.scrape_product_reviews(product.url, max_reviews) or []
+        # One vectorized pass over the product's date strings
+        parsed_dates = self.date_normalizer.parse_many(review.get('datetime') for review in scraped)
+        reviews = [Review.from_dict(review, parsed=parsed) for review, parsed in zip(scraped, parsed_dates)]
+        if reviews:
+            self.review_cache.put(cache_key, [review.copy() for review in reviews])
+        return reviews
+    
+    def _get_product_sentiment(self, product, reviews):
+        """Analyze a product's reviews unless the same reviews were analyzed before"""
+        cache_key = product_key(product.url)
+        review_signature = (
+            self.sample_reviews_per_bucket,
+            self.sample_review_order,
+            tuple((review.rating, review.text) for review in reviews)
+        )
+        
+        cached = self.sentiment_cache.get(cache_key)
+        if cached and cached[0] == review_signature:
+            # The incoming reviews need their own scores for the review table
+            for review, score in zip(reviews, cached[2]):
+                review.sentiment_score = score
+            return cached[1].copy()
+        
+        product_analysis = self.analyze_sentiment(reviews)
+        if product_analysis and "error" not in product_analysis:
+            scores = tuple(review.sentiment_score for review in reviews)
+            self.sentiment_cache.put(cache_key, (review_signature, product_analysis.copy(), scores))
+        return product_analysis
+    
+    def _dedupe_product_reviews(self, product, reviews, review_index, job_key):
+        """Drop reviews repeated within a product and flag ones seen elsewhere
+        
+        Reviews already seen on another product (or in another job) are kept
+        for that product's own analysis but marked with 'duplicate_of', which
+        keeps them out of the job-wide statistics.
+        """
+        unique_reviews = []
+        for review in reviews:
+            duplicate_of = review_index.add(review, {
+                'job': job_key,
+                'product_name': product.name,
+                'product_url': product.url
+            })
+            
+            if duplicate_of is None:
+                # Never carry a flag over from an earlier analysis
+                review.duplicate_of = None
+                unique_reviews.append(review)
+            elif duplicate_of['job'] != job_key or duplicate_of['product_url'] != product.url:
+                review.duplicate_of = duplicate_of
+                unique_reviews.append(review)
+        
+        removed = len(reviews) - len(unique_reviews)
+        if removed:
+            print(f"🧹 Removed {removed} duplicate reviews for {product.name}")
+        
+        return unique_reviews
     
     # Include sentiment analysis and other helper methods from previous version
     def analyze_sentiment(self, reviews):
@@ -1418,57 +1516,52 @@ class KrogerReviewAnalyzer:
             rating_count = 0
             
             for review in reviews:
-                if review.get('rating'):
-                    total_rating += review['rating']
+                if review.rating:
+                    total_rating += review.rating
                     rating_count += 1
                 
-                if review.get('text') and len(review['text']) > 5:
+                if review.text and len(review.text) > 5:
                     valid_reviews.append(review)
             
             avg_rating = total_rating / rating_count if rating_count > 0 else 0
             
             # Analyze sentiment for text reviews
             sentiments = []
-            positive_reviews = []
-            negative_reviews = []
-            neutral_reviews = []
+            sampler = ReviewSampler(self.sample_reviews_per_bucket, self.sample_review_order)
             
             for review in valid_reviews:
-                text = review.get('text', '')
+                text = review.text
                 if text:
                     blob = TextBlob(text)
                     sentiment_score = blob.sentiment.polarity
                     sentiments.append(sentiment_score)
+                    review.sentiment_score = sentiment_score
                     
                     if sentiment_score > 0.1:
-                        positive_reviews.append(review)
+                        sampler.add(review, 'positive')
                     elif sentiment_score < -0.1:
-                        negative_reviews.append(review)
+                        sampler.add(review, 'negative')
                     else:
-                        neutral_reviews.append(review)
+                        sampler.add(review, 'neutral')
             
             avg_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0
             
             # Extract themes
-            all_text = ' '.join([review.get('text', '') for review in valid_reviews])
+            all_text = ' '.join([review.text for review in valid_reviews])
             themes = self._extract_themes(all_text)
             
-            return {
-                'average_rating': avg_rating,
-                'total_reviews': len(reviews),
-                'text_reviews': len(valid_reviews),
-                'sentiment_score': avg_sentiment,
-                'sentiment_label': self._get_sentiment_description(avg_sentiment),
-                'positive_reviews': len(positive_reviews),
-                'negative_reviews': len(negative_reviews),
-                'neutral_reviews': len(neutral_reviews),
-                'themes': themes,
-                'sample_reviews': {
-                    'positive': positive_reviews[:3],
-                    'negative': negative_reviews[:3],
-                    'neutral': neutral_reviews[:3]
-                }
-            }
+            return ProductAnalysis(
+                average_rating=avg_rating,
+                total_reviews=len(reviews),
+                text_reviews=len(valid_reviews),
+                sentiment_score=avg_sentiment,
+                sentiment_label=self._get_sentiment_description(avg_sentiment),
+                positive_reviews=sampler.counts['positive'],
+                negative_reviews=sampler.counts['negative'],
+                neutral_reviews=sampler.counts['neutral'],
+                themes=themes,
+                sample_reviews=sampler.samples()
+            )
             
         except Exception as e:
             print(f"Error in sentiment analysis: {e}")
@@ -1491,21 +1584,9 @@ class KrogerReviewAnalyzer:
             return []
     
     def _extract_meaningful_words(self, text):
-        """Extract meaningful words from text"""
+        """Extract meaningful words from text (same tokenizer as review search)"""
         try:
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-            
-            stop_words = {
-                'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-                'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
-                'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this',
-                'that', 'these', 'those', 'they', 'them', 'their', 'there', 'here',
-                'when', 'where', 'why', 'how', 'what', 'who', 'which', 'very',
-                'really', 'quite', 'just', 'only', 'also', 'even', 'still', 'more',
-                'most', 'much', 'many', 'some', 'any', 'all', 'not', 'product'
-            }
-            
-            return [word for word in words if word not in stop_words and len(word) > 3]
+            return meaningful_words(text)
             
         except Exception as e:
             return []
@@ -1526,59 +1607,21 @@ class KrogerReviewAnalyzer:
     def _create_category_summary(self, product_analyses, category):
         """Create summary analysis for the entire category"""
         try:
-            if not product_analyses:
-                return None
-            
-            total_reviews = sum(p.get('total_reviews', 0) for p in product_analyses)
-            total_text_reviews = sum(p.get('text_reviews', 0) for p in product_analyses)
-            avg_rating = sum(p.get('average_rating', 0) for p in product_analyses) / len(product_analyses)
-            avg_sentiment = sum(p.get('sentiment_score', 0) for p in product_analyses) / len(product_analyses)
-            
-            total_positive = sum(p.get('positive_reviews', 0) for p in product_analyses)
-            total_negative = sum(p.get('negative_reviews', 0) for p in product_analyses)
-            total_neutral = sum(p.get('neutral_reviews', 0) for p in product_analyses)
-            
-            all_themes = []
-            for product in product_analyses:
-                themes = product.get('themes', [])
-                all_themes.extend(themes)
-            
-            theme_counts = Counter(all_themes)
-            top_themes = [theme for theme, count in theme_counts.most_common(8)]
-            
-            best_product = max(product_analyses, key=lambda p: p.get('average_rating', 0))
-            worst_product = min(product_analyses, key=lambda p: p.get('average_rating', 5))
-            
-            return {
-                'category': category,
-                'total_products': len(product_analyses),
-                'total_reviews': total_reviews,
-                'total_text_reviews': total_text_reviews,
-                'average_rating': round(avg_rating, 2),
-                'average_sentiment': round(avg_sentiment, 3),
-                'sentiment_label': self._get_sentiment_description(avg_sentiment),
-                'positive_reviews': total_positive,
-                'negative_reviews': total_negative,
-                'neutral_reviews': total_neutral,
-                'top_themes': top_themes,
-                'best_product': {
-                    'name': best_product.get('product_name', ''),
-                    'rating': best_product.get('average_rating', 0),
-                    'url': best_product.get('product_url', '')
-                },
-                'worst_product': {
-                    'name': worst_product.get('product_name', ''),
-                    'rating': worst_product.get('average_rating', 0),
-                    'url': worst_product.get('product_url', '')
-                }
-            }
+            aggregator = self._new_summary_aggregator(category)
+            for product_analysis in product_analyses:
+                aggregator.add(product_analysis)
+            return aggregator.summary()
             
         except Exception as e:
             print(f"Error creating category summary: {e}")
             return None
     
+    def _new_summary_aggregator(self, category):
+        """Create an incremental category summary aggregator"""
+        return CategorySummaryAggregator(category, self._get_sentiment_description)
+    
     def export_products_to_spreadsheet(self, analysis_data, filename=None):
-        """Export analysis results to Excel spreadsheet"""
+        """Export analysis results to an Excel workbook (streamed, one sheet per product)"""
         try:
             if not analysis_data:
                 print("No analysis data to export")
@@ -1588,10 +1631,7 @@ class KrogerReviewAnalyzer:
                 category = analysis_data.get('category', 'analysis')
                 filename = f"{category.replace(' ', '_')}_analysis.xlsx"
             
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                self._write_category_summary_sheet(writer, analysis_data)
-                self._write_products_overview_sheet(writer, analysis_data)
-                self._write_all_reviews_sheet(writer, analysis_data)
+            write_analysis_workbook(analysis_data, filename)
             
             print(f"Analysis exported to: {filename}")
             return filename
@@ -1600,116 +1640,6 @@ class KrogerReviewAnalyzer:
             print(f"Error exporting to spreadsheet: {e}")
             return None
     
-    def _write_category_summary_sheet(self, writer, analysis_data):
-        """Write category summary to Excel sheet"""
-        try:
-            summary = analysis_data.get('summary', {})
-            
-            summary_data = [
-                ['Category', analysis_data.get('category', '')],
-                ['Total Products Analyzed', summary.get('total_products', 0)],
-                ['Total Reviews', summary.get('total_reviews', 0)],
-                ['Total Text Reviews', summary.get('total_text_reviews', 0)],
-                ['Average Rating', summary.get('average_rating', 0)],
-                ['Average Sentiment Score', summary.get('average_sentiment', 0)],
-                ['Overall Sentiment', summary.get('sentiment_label', '')],
-                ['Positive Reviews', summary.get('positive_reviews', 0)],
-                ['Neutral Reviews', summary.get('neutral_reviews', 0)],
-                ['Negative Reviews', summary.get('negative_reviews', 0)],
-                ['Top Themes', ', '.join(summary.get('top_themes', []))],
-                ['Best Product', summary.get('best_product', {}).get('name', '')],
-                ['Best Product Rating', summary.get('best_product', {}).get('rating', 0)],
-                ['Worst Product', summary.get('worst_product', {}).get('name', '')],
-                ['Worst Product Rating', summary.get('worst_product', {}).get('rating', 0)]
-            ]
-            
-            df_summary = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
-            df_summary.to_excel(writer, sheet_name='Category Summary', index=False)
-            
-        except Exception as e:
-            print(f"Error writing category summary: {e}")
-    
-    def _write_products_overview_sheet(self, writer, analysis_data):
-        """Write products overview to Excel sheet"""
-        try:
-            products = analysis_data.get('products', [])
-            
-            products_data = []
-            for product in products:
-                products_data.append([
-                    product.get('product_name', ''),
-                    product.get('average_rating', 0),
-                    product.get('total_reviews', 0),
-                    product.get('text_reviews', 0),
-                    product.get('sentiment_score', 0),
-                    product.get('sentiment_label', ''),
-                    product.get('positive_reviews', 0),
-                    product.get('negative_reviews', 0),
-                    product.get('neutral_reviews', 0),
-                    ', '.join(product.get('themes', [])),
-                    product.get('product_url', '')
-                ])
-            
-            df_products = pd.DataFrame(products_data, columns=[
-                'Product Name', 'Average Rating', 'Total Reviews', 'Text Reviews',
-                'Sentiment Score', 'Sentiment Label', 'Positive Reviews',
-                'Negative Reviews', 'Neutral Reviews', 'Top Themes', 'Product URL'
-            ])
-            
-            df_products.to_excel(writer, sheet_name='Products Overview', index=False)
-            
-        except Exception as e:
-            print(f"Error writing products overview: {e}")
-    
-    def _write_all_reviews_sheet(self, writer, analysis_data):
-        """Write all reviews to Excel sheet"""
-        try:
-            all_reviews_data = []
-            products = analysis_data.get('products', [])
-            
-            for product in products:
-                product_name = product.get('product_name', '')
-                sample_reviews = product.get('sample_reviews', {})
-                
-                # Add positive reviews
-                for review in sample_reviews.get('positive', []):
-                    all_reviews_data.append([
-                        product_name,
-                        'Positive',
-                        review.get('rating', ''),
-                        review.get('text', ''),
-                        review.get('author', '')
-                    ])
-                
-                # Add negative reviews
-                for review in sample_reviews.get('negative', []):
-                    all_reviews_data.append([
-                        product_name,
-                        'Negative',
-                        review.get('rating', ''),
-                        review.get('text', ''),
-                        review.get('author', '')
-                    ])
-                
-                # Add neutral reviews
-                for review in sample_reviews.get('neutral', []):
-                    all_reviews_data.append([
-                        product_name,
-                        'Neutral',
-                        review.get('rating', ''),
-                        review.get('text', ''),
-                        review.get('author', '')
-                    ])
-            
-            if all_reviews_data:
-                df_reviews = pd.DataFrame(all_reviews_data, columns=[
-                    'Product Name', 'Sentiment Category', 'Rating', 'Review Text', 'Author'
-                ])
-                df_reviews.to_excel(writer, sheet_name='All Reviews', index=False)
-            
-        except Exception as e:
-            print(f"Error writing all reviews: {e}")
-
     # Add these methods to your kroger_analyzer.py file
 
     def _extract_review_data_selenium(self, element):
@@ -1746,8 +1676,6 @@ class KrogerReviewAnalyzer:
     def _extract_datetime(self, element):
         """Extract datetime from review element"""
         try:
-            from datetime import datetime
-            
             # Enhanced datetime selectors
             datetime_selectors = [
                 '[data-testid*="date"]',
@@ -1791,75 +1719,25 @@ class KrogerReviewAnalyzer:
             if parsed_date:
                 return parsed_date
             
-            # Return current datetime as fallback
-            return datetime.now()
+            # Fall back to the job's reference time
+            return self.date_normalizer.now
             
         except Exception as e:
             print(f"Error extracting datetime: {e}")
-            from datetime import datetime
-            return datetime.now()
+            return self.date_normalizer.now
 
     def _parse_datetime_string(self, date_string):
+        """Parse an absolute or relative review date string"""
         try:
-            if not date_string:
-                return None
-            
-            # Common date patterns
-            date_patterns = [
-                # ISO format
-                (r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})', '%Y-%m-%dT%H:%M:%S'),
-                (r'(\d{4}-\d{2}-\d{2})', '%Y-%m-%d'),
-                # US format
-                (r'(\d{1,2}/\d{1,2}/\d{4})', '%m/%d/%Y'),
-                (r'(\d{1,2}-\d{1,2}-\d{4})', '%m-%d-%Y'),
-                # Month day, year
-                (r'([A-Za-z]+ \d{1,2}, \d{4})', '%B %d, %Y'),
-                (r'([A-Za-z]{3} \d{1,2}, \d{4})', '%b %d, %Y'),
-            ]
-            
-            # Handle relative dates first
-            if 'ago' in date_string.lower():
-                return self._parse_relative_date(date_string)
-            elif 'yesterday' in date_string.lower():
-                return datetime.now() - timedelta(days=1)
-            elif 'today' in date_string.lower():
-                return datetime.now()
-            
-            # Try absolute date patterns
-            for pattern, date_format in date_patterns:
-                matches = re.findall(pattern, date_string, re.IGNORECASE)
-                if matches:
-                    date_match = matches[0]
-                    try:
-                        return datetime.strptime(date_match, date_format)
-                    except ValueError:
-                        continue
+            return self.date_normalizer.parse(date_string)
         except Exception:
             return None
 
     def _parse_relative_date(self, date_string):
         """Parse relative date strings like '5 days ago'"""
         try:
-            from datetime import datetime, timedelta
-            import re
-            
-            # Extract number and unit
-            match = re.search(r'(\d+)\s+(day|week|month)s?\s+ago', date_string.lower())
-            if not match:
-                return None
-            
-            number = int(match.group(1))
-            unit = match.group(2)
-            
-            if unit == 'day':
-                return datetime.now() - timedelta(days=number)
-            elif unit == 'week':
-                return datetime.now() - timedelta(weeks=number)
-            elif unit == 'month':
-                return datetime.now() - timedelta(days=number * 30)  # Approximate
-            
-            return None
+            return self.date_normalizer.parse_relative(date_string)
             
         except Exception as e:
             print(f"Error parsing relative date: {e}")
-            return None
\ No newline at end of file
+            return None
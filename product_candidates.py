@@ -0,0 +1,176 @@
+import re
+from urllib.parse import urljoin
+
+from product_identity import KROGER_BASE_URL
+
+
+# Search results embed product links either in JSON state or in anchors; each
+# pattern captures (href, name)
+LISTING_PATTERNS = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in [
+        # JSON data structures (common in modern sites)
+        r'"href":"([^"]*\/p\/[^"]*)"[^}]*?"name":"([^"]*)"',
+        r'"url":"([^"]*\/p\/[^"]*)"[^}]*?"title":"([^"]*)"',
+        r'"link":"([^"]*\/p\/[^"]*)"[^}]*?"productName":"([^"]*)"',
+        # HTML anchors
+        r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*aria-label="([^"]*)"',
+        r'<a[^>]+href="([^"]*\/p\/[^"]*)"[^>]*title="([^"]*)"',
+        r'href="([^"]*\/p\/[^"]*)"[^>]*>([^<]+)</a>'
+    ]
+]
+
+PRODUCT_PATH_TERMS = ['/p/', '/product/', '/item/']
+
+# Navigation/utility pages that share the product path prefixes
+NAVIGATION_TERMS = [
+    'search', 'category', 'department', 'help', 'account',
+    'login', 'register', 'cart', 'checkout', 'store-locator',
+    'recipe', 'coupon', 'deals', 'weekly-ad'
+]
+
+# Link text that belongs to the page chrome rather than a product
+UI_TERMS = [
+    'search', 'filter', 'sort', 'view all', 'see more',
+    'next', 'previous', 'page', 'results', 'loading',
+    'menu', 'navigation', 'add to cart', 'quick view'
+]
+
+PRODUCT_INDICATORS = [
+    # Sizes and measurements
+    'oz', 'lb', 'lbs', 'kg', 'gram', 'ml', 'liter',
+    'pack', 'count', 'ct', 'piece', 'pc',
+
+    # Food descriptors
+    'organic', 'natural', 'fresh', 'frozen', 'low',
+    'whole', 'skim', 'fat', 'free', 'gluten',
+    'sugar', 'sodium', 'calorie',
+
+    # Common brands (Kroger carries)
+    'kroger', 'simple truth', 'private selection'
+]
+
+
+def _term_pattern(terms):
+    """Compile terms into one trie-shaped alternation over lowercased text
+
+    Shared prefixes are factored out ('lb', 'lbs' -> 'lb(?:s)?'), so the regex
+    engine tries each position once per branch instead of once per term.
+    Case-insensitive matching is deliberately avoided: it disables the
+    engine's literal fast paths, so callers lowercase the text once instead.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term.lower():
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return re.compile(build(trie))
+
+
+_KROGER_DOMAIN = _term_pattern(['kroger.com'])
+_PRODUCT_PATH = _term_pattern(PRODUCT_PATH_TERMS)
+_NAVIGATION = _term_pattern(NAVIGATION_TERMS)
+_UI_TEXT = _term_pattern(UI_TERMS)
+_INDICATOR = _term_pattern(PRODUCT_INDICATORS)
+
+_ABSOLUTE_URL = re.compile(r'https?://', re.IGNORECASE)
+_HTML_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+_NAME_SYMBOLS = re.compile(r'[^\w\s\-\.,&()%]')
+
+
+def clean_candidate_name(name):
+    """Strip markup, collapse whitespace and drop symbols from a link text"""
+    clean_name = _HTML_TAG.sub('', name or '').strip()
+    clean_name = _WHITESPACE.sub(' ', clean_name)
+    return _NAME_SYMBOLS.sub('', clean_name)
+
+
+def url_rejection(url):
+    """Why `url` is not a Kroger product page, or None if it is one"""
+    if not url:
+        return 'missing-url'
+
+    url_lower = url.lower()
+    if not _KROGER_DOMAIN.search(url_lower):
+        return 'not-kroger'
+    if not _PRODUCT_PATH.search(url_lower):
+        return 'not-product-path'
+    match = _NAVIGATION.search(url_lower)
+    if match:
+        return f'navigation:{match.group(0)}'
+    return None
+
+
+def name_verdict(name):
+    """Return (accepted, reason) for a cleaned candidate product name"""
+    if not name or len(name) < 5:
+        return False, 'too-short'
+
+    name_lower = name.lower()
+    match = _UI_TEXT.search(name_lower)
+    if match:
+        return False, f'ui-text:{match.group(0)}'
+
+    word_count = len(name.split())
+    if word_count < 2:
+        return False, 'single-word'
+
+    # Long names only pass when they look like a product (brand, size, food words)
+    indicator = _INDICATOR.search(name_lower)
+    if indicator:
+        return True, f'indicator:{indicator.group(0)}'
+    if word_count <= 12:
+        return True, 'plain-name'
+    return False, 'too-long'
+
+
+def classify_candidates(candidates, base_url=KROGER_BASE_URL, clean_names=True):
+    """Classify (href, name) search-result candidates in one pass
+
+    Returns one dict per candidate, in input order, with the resolved 'url',
+    the cleaned 'name', 'accepted' and a short 'reason' ('indicator:oz',
+    'navigation:recipe', 'ui-text:see more', ...). A name of None skips the
+    name checks, for callers that only read names after the URL passes.
+    """
+    results = []
+    for href, name in candidates:
+        reason = url_rejection(href)
+        accepted = reason is None
+        if accepted:
+            reason = 'url-only'
+            if name is not None:
+                if clean_names:
+                    name = clean_candidate_name(name)
+                accepted, reason = name_verdict(name)
+
+        url = href
+        if accepted and not _ABSOLUTE_URL.match(href):
+            url = urljoin(base_url, href)
+
+        results.append({
+            'href': href,
+            'url': url,
+            'name': name,
+            'accepted': accepted,
+            'reason': reason
+        })
+    return results
+
+
+def rejection_counts(results):
+    """Tally rejected candidates by reason, for diagnostics"""
+    counts = {}
+    for result in results:
+        if not result['accepted']:
+            reason = result['reason'].split(':')[0]
+            counts[reason] = counts.get(reason, 0) + 1
+    return counts
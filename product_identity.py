@@ -0,0 +1,180 @@
+import math
+import re
+from urllib.parse import urljoin, urlsplit
+
+from records import Product
+
+
+KROGER_BASE_URL = 'https://www.kroger.com'
+
+# Kroger product pages look like /p/<slug>/<upc>, where the UPC is the
+# 13-digit zero-padded product ID; older links use /product/ or /item/
+_PRODUCT_PATH_PATTERN = re.compile(r'/(?:p|product|item)/(?:([^/?#]+)/)?(\d{6,14})(?:[/?#]|$)', re.IGNORECASE)
+
+
+def canonical_product_id(url):
+    """Extract the product ID (UPC) from a Kroger product URL, or None"""
+    if not url:
+        return None
+    match = _PRODUCT_PATH_PATTERN.search(urlsplit(url).path + '/')
+    return match.group(2) if match else None
+
+
+def canonical_product_url(url):
+    """Normalize a product URL to https://www.kroger.com/p/<slug>/<id>
+
+    URLs without a recognizable product ID keep their path but lose the query
+    string, fragment and trailing slash.
+    """
+    if not url:
+        return url
+
+    path = urlsplit(urljoin(KROGER_BASE_URL, url)).path
+    match = _PRODUCT_PATH_PATTERN.search(path + '/')
+    if match:
+        slug = (match.group(1) or 'item').lower()
+        return f"{KROGER_BASE_URL}/p/{slug}/{match.group(2)}"
+    return KROGER_BASE_URL + path.rstrip('/')
+
+
+def product_key(url):
+    """Stable identity key for a product URL: its ID when known, else its canonical URL"""
+    product_id = canonical_product_id(url)
+    if product_id:
+        return f'upc:{product_id}'
+    return f'url:{canonical_product_url(url).lower()}'
+
+
+class ProductIndex:
+    """In-memory product index keyed by canonical product ID
+
+    Listings that resolve to the same ID (different slugs, tracking
+    parameters, relative vs absolute links, renamed titles) merge into the
+    entry of the first one seen.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, product):
+        """Add a {'name', 'url'} product; return (canonical Product, is_new)"""
+        key = product_key(product['url'])
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry, False
+
+        entry = self._entries[key] = Product(
+            product['name'],
+            canonical_product_url(product['url']),
+            canonical_product_id(product['url'])
+        )
+        return entry, True
+
+
+# Unit spellings folded to one canonical form before names are compared
+_UNIT_ALIASES = [
+    (re.compile(r'\bfl(?:uid)?\.?\s*(?:oz|ounces?)\b'), 'floz'),
+    (re.compile(r'\b(?:oz|ounces?)\b'), 'oz'),
+    (re.compile(r'\b(?:lbs?|pounds?)\b'), 'lb'),
+    (re.compile(r'\b(?:ct|count|pk|pack)\b'), 'ct'),
+    (re.compile(r'\b(?:g|grams?)\b'), 'g'),
+    (re.compile(r'\b(?:ml|milliliters?)\b'), 'ml'),
+    (re.compile(r'\b(?:l|liters?|litres?)\b'), 'l'),
+]
+_SIZE_PATTERN = re.compile(r'\b(\d+(?:\.\d+)?) ?(floz|oz|lb|ct|g|ml|l)\b')
+_SIZE_TOKEN = re.compile(r'\b\d+(?:\.\d+)?(?:floz|oz|lb|ct|g|ml|l)\b')
+_NAME_NOISE = re.compile(r'[^a-z0-9.\s]')
+_STRAY_PERIOD = re.compile(r'(?<!\d)\.|\.(?!\d)')
+
+
+def normalize_product_name(name):
+    """Lowercase a product name, drop symbols and fold unit spellings
+
+    "Kroger® Chocolate Chip Cookies, 13 Ounce" -> "kroger chocolate chip cookies 13oz"
+    """
+    text = _NAME_NOISE.sub(' ', (name or '').lower())
+    text = _STRAY_PERIOD.sub(' ', text)
+    for pattern, unit in _UNIT_ALIASES:
+        text = pattern.sub(unit, text)
+    text = _SIZE_PATTERN.sub(lambda m: f'{m.group(1)}{m.group(2)}', text)
+    return ' '.join(text.split())
+
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _sizes(text):
+    return set(_SIZE_TOKEN.findall(text))
+
+
+class ProductNameMatcher:
+    """Near-duplicate product name matcher over a character-trigram inverted index
+
+    Names are normalized (symbols dropped, unit spellings folded) and compared
+    by trigram Jaccard similarity. A name with similarity >= threshold to the
+    query shares all but |q| - ceil(threshold * |q|) of its trigrams, so
+    lookups only probe that many + 1 of the query's rarest trigrams (by
+    posting list length). Common trigrams like "coo" in every cookie listing
+    are never probed, which keeps batches of listings close to linear time.
+
+    Names that both state a size must state the same one: "13 oz" and "26 oz"
+    packs are different products no matter how similar the rest of the name is.
+    """
+
+    def __init__(self, threshold=0.8):
+        self.threshold = threshold
+        self._postings = {}
+        self._names = []
+
+    def __len__(self):
+        return len(self._names)
+
+    def _probe_grams(self, grams):
+        probes = len(grams) - math.ceil(self.threshold * len(grams)) + 1
+        return sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))[:probes]
+
+    def find(self, name):
+        """Return (ref, similarity) of the best match above the threshold, or (None, 0.0)"""
+        normalized = normalize_product_name(name)
+        grams = _trigrams(normalized)
+        sizes = _sizes(normalized)
+
+        candidates = set()
+        for gram in self._probe_grams(grams):
+            candidates.update(self._postings.get(gram, ()))
+
+        # Cheap rejections first: similarity can't exceed the ratio of the
+        # trigram counts, and conflicting sizes never match
+        shortest = self.threshold * len(grams)
+        longest = len(grams) / self.threshold
+        best_ref, best_similarity = None, 0.0
+        for entry in sorted(candidates):
+            entry_grams, entry_sizes, ref = self._names[entry]
+            if not shortest <= len(entry_grams) <= longest:
+                continue
+            if sizes and entry_sizes and sizes != entry_sizes:
+                continue
+            shared = len(grams & entry_grams)
+            similarity = shared / (len(grams) + len(entry_grams) - shared)
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_ref, best_similarity = ref, similarity
+        return best_ref, best_similarity
+
+    def add(self, name, ref):
+        """Index a name under `ref`; return the ref of an earlier near-duplicate, if any"""
+        match, _ = self.find(name)
+        if match is not None:
+            return match
+
+        normalized = normalize_product_name(name)
+        entry = len(self._names)
+        grams = _trigrams(normalized)
+        self._names.append((grams, _sizes(normalized), ref))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+        return None
@@ -0,0 +1,132 @@
+import bisect
+import threading
+
+from product_identity import product_key
+
+
+LEADERBOARD_METRICS = ('rating', 'sentiment')
+
+
+def _sort_key(entry, metric):
+    """Ascending sort key that puts the best product first; None if unranked"""
+    rating = entry['adjusted_rating']
+    sentiment = entry['average_sentiment']
+    if metric == 'rating':
+        if rating is None:
+            return None
+        return (-rating, -(sentiment or 0), -entry['rated_reviews'], entry['key'])
+    if sentiment is None:
+        return None
+    return (-sentiment, -(rating or 0), -entry['rated_reviews'], entry['key'])
+
+
+class ProductLeaderboard:
+    """Products from every completed job, ranked per category and overall
+
+    Each product (identified by product_key, so the same UPC seen by two jobs
+    is one entry) keeps the figures from the most recent job that analyzed it.
+    Rankings are sorted lists of (sort key, product key) per scope and
+    metric, maintained with bisect: an update locates its old and new slot by
+    binary search, and top-k reads are a k-element slice from either end.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._job_products = {}
+        self._rankings = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_job(self, job_id, category, statistics, product_analyses):
+        """Record the products of a completed job
+
+        `statistics` is the job's review statistics (see
+        compute_review_statistics); its per-product rows line up with
+        `product_analyses`.
+        """
+        product_stats = (statistics or {}).get('products') or []
+        with self._lock:
+            for analysis, stats in zip(product_analyses, product_stats):
+                url = analysis.get('product_url', '')
+                if not url:
+                    continue
+                entry = {
+                    'key': product_key(url),
+                    'product_name': analysis.get('product_name', ''),
+                    'product_url': url,
+                    'category': category,
+                    'job_id': job_id,
+                    'adjusted_rating': stats.get('adjusted_rating'),
+                    'average_rating': stats.get('average_rating'),
+                    'rated_reviews': stats.get('rated_reviews', 0),
+                    'average_sentiment': analysis.get('sentiment_score')
+                }
+                self._discard(entry['key'])
+                self._insert(entry)
+
+    def remove_job(self, job_id):
+        """Drop products whose latest figures came from `job_id`"""
+        with self._lock:
+            keys = list(self._job_products.get(job_id, ()))
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def top(self, k=10, category=None, by='rating', worst=False):
+        """The k best (or worst) products overall or within one category"""
+        if by not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown leaderboard metric '{by}', expected one of {LEADERBOARD_METRICS}")
+
+        with self._lock:
+            scope = self._scope(category) if category else None
+            ranking = self._rankings.get((scope, by), [])
+            picked = ranking[-k:][::-1] if worst else ranking[:k]
+            if worst:
+                first_rank = len(ranking)
+                ranks = range(first_rank, first_rank - len(picked), -1)
+            else:
+                ranks = range(1, len(picked) + 1)
+            return [{'rank': rank, **self._entries[key]} for rank, (_, key) in zip(ranks, picked)]
+
+    def categories(self):
+        """Category -> number of ranked products"""
+        with self._lock:
+            counts = {}
+            for entry in self._entries.values():
+                counts[entry['category']] = counts.get(entry['category'], 0) + 1
+            return counts
+
+    @staticmethod
+    def _scope(category):
+        return (category or '').strip().lower()
+
+    def _insert(self, entry):
+        key = entry['key']
+        self._entries[key] = entry
+        self._job_products.setdefault(entry['job_id'], set()).add(key)
+        for metric in LEADERBOARD_METRICS:
+            sort_key = _sort_key(entry, metric)
+            if sort_key is None:
+                continue
+            for scope in (None, self._scope(entry['category'])):
+                bisect.insort(self._rankings.setdefault((scope, metric), []), (sort_key, key))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        job_keys = self._job_products.get(entry['job_id'])
+        if job_keys is not None:
+            job_keys.discard(key)
+            if not job_keys:
+                del self._job_products[entry['job_id']]
+        for metric in LEADERBOARD_METRICS:
+            sort_key = _sort_key(entry, metric)
+            if sort_key is None:
+                continue
+            for scope in (None, self._scope(entry['category'])):
+                ranking = self._rankings[(scope, metric)]
+                position = bisect.bisect_left(ranking, (sort_key, key))
+                del ranking[position]
@@ -0,0 +1,193 @@
+import sys
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value):
+    """Naive datetime -> int seconds since 1970-01-01 (no timezone shift), or None"""
+    if value is None:
+        return None
+    return int((value - _EPOCH).total_seconds())
+
+
+def from_epoch(timestamp):
+    """Inverse of to_epoch"""
+    if timestamp is None:
+        return None
+    return _EPOCH + timedelta(seconds=timestamp)
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+class _Record:
+    """Read-only mapping access for slotted records
+
+    Existing consumers (Excel export, dashboard endpoints, summaries) read
+    records with record['key'] / record.get('key', default); a None value
+    falls back to the default just like a missing dict key.
+    """
+
+    __slots__ = ()
+    _EXTRA_KEYS = frozenset()
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._keys()
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def copy(self):
+        return replace(self)
+
+    @classmethod
+    def _keys(cls):
+        keys = _RECORD_KEYS.get(cls)
+        if keys is None:
+            keys = _RECORD_KEYS[cls] = frozenset(f.name for f in fields(cls)) | cls._EXTRA_KEYS
+        return keys
+
+
+_RECORD_KEYS = {}
+
+
+@dataclass(slots=True)
+class Product(_Record):
+    name: str
+    url: str
+    product_id: str = None
+
+    @classmethod
+    def coerce(cls, product):
+        """Accept a Product or a {'name', 'url', 'product_id'} dict"""
+        if isinstance(product, cls):
+            return product
+        return cls(product['name'], product['url'], product.get('product_id'))
+
+    def to_dict(self):
+        return {'name': self.name, 'url': self.url, 'product_id': self.product_id}
+
+
+@dataclass(slots=True)
+class Review(_Record):
+    """One customer review; `timestamp` is epoch seconds (see to_epoch)"""
+
+    _EXTRA_KEYS = frozenset(['datetime'])
+
+    rating: float = None
+    text: str = None
+    author: str = None
+    timestamp: int = None
+    sentiment_score: float = None
+    duplicate_of: dict = None
+
+    @classmethod
+    def from_dict(cls, review, parse_date=None, parsed=None):
+        """Build a Review from a scraped review dict
+
+        `parsed` is the review's already parsed 'datetime'; without it the
+        string is parsed with `parse_date`, if given.
+        """
+        if parsed is None and parse_date:
+            date_string = review.get('datetime')
+            parsed = parse_date(date_string) if date_string else None
+        return cls(
+            rating=review.get('rating'),
+            text=review.get('text'),
+            author=_intern(review.get('author')),
+            timestamp=to_epoch(parsed),
+            sentiment_score=review.get('sentiment_score'),
+            duplicate_of=review.get('duplicate_of')
+        )
+
+    @property
+    def datetime(self):
+        """ISO timestamp string, as scraped reviews used to carry"""
+        moment = from_epoch(self.timestamp)
+        return moment.isoformat() if moment else None
+
+    def to_dict(self):
+        review = {
+            'rating': self.rating,
+            'text': self.text,
+            'author': self.author,
+            'datetime': self.datetime
+        }
+        if self.sentiment_score is not None:
+            review['sentiment_score'] = self.sentiment_score
+        if self.duplicate_of:
+            review['duplicate_of'] = self.duplicate_of
+        return review
+
+
+@dataclass(slots=True)
+class ProductAnalysis(_Record):
+    """Sentiment analysis of one product's reviews"""
+
+    average_rating: float = 0
+    total_reviews: int = 0
+    text_reviews: int = 0
+    sentiment_score: float = 0
+    sentiment_label: str = ''
+    positive_reviews: int = 0
+    negative_reviews: int = 0
+    neutral_reviews: int = 0
+    themes: list = field(default_factory=list)
+    sample_reviews: dict = field(default_factory=dict)
+    product_name: str = ''
+    product_url: str = ''
+    product_id: str = None
+    category: str = ''
+
+    def __post_init__(self):
+        self.category = _intern(self.category)
+
+    def to_dict(self):
+        analysis = {f.name: getattr(self, f.name) for f in fields(self)}
+        analysis['themes'] = list(self.themes)
+        analysis['sample_reviews'] = {
+            bucket: [review.to_dict() for review in reviews]
+            for bucket, reviews in self.sample_reviews.items()
+        }
+        return analysis
+
+
+@dataclass(slots=True)
+class CategorySummary(_Record):
+    """Category-wide roll-up of product analyses"""
+
+    category: str
+    total_products: int
+    total_reviews: int
+    total_text_reviews: int
+    average_rating: float
+    average_sentiment: float
+    sentiment_label: str
+    positive_reviews: int
+    negative_reviews: int
+    neutral_reviews: int
+    top_themes: list
+    best_product: dict
+    worst_product: dict
+
+    def __post_init__(self):
+        self.category = _intern(self.category)
+
+    def to_dict(self):
+        summary = {f.name: getattr(self, f.name) for f in fields(self)}
+        summary['top_themes'] = list(self.top_themes)
+        summary['best_product'] = dict(self.best_product)
+        summary['worst_product'] = dict(self.worst_product)
+        return summary
@@ -0,0 +1,130 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import pandas as pd
+
+
+# Absolute date patterns, tried in order; the first one that both matches and
+# converts wins
+_ABSOLUTE_PATTERNS = [
+    # ISO format
+    (re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})', re.IGNORECASE), '%Y-%m-%dT%H:%M:%S'),
+    (re.compile(r'(\d{4}-\d{2}-\d{2})', re.IGNORECASE), '%Y-%m-%d'),
+    # US format
+    (re.compile(r'(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE), '%m/%d/%Y'),
+    (re.compile(r'(\d{1,2}-\d{1,2}-\d{4})', re.IGNORECASE), '%m-%d-%Y'),
+    # Month day, year
+    (re.compile(r'([A-Za-z]+ \d{1,2}, \d{4})', re.IGNORECASE), '%B %d, %Y'),
+    (re.compile(r'([A-Za-z]{3} \d{1,2}, \d{4})', re.IGNORECASE), '%b %d, %Y'),
+]
+
+_RELATIVE_PATTERN = re.compile(r'(\d+)\s+(day|week|month)s?\s+ago')
+
+# Months are approximated as 30 days
+_RELATIVE_UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+# Below this many strings pandas' fixed cost (~5 ms) outweighs the cached
+# single-string parser (see benchmarks/bench_review_dates.py)
+_BULK_MIN_STRINGS = 1024
+
+
+class DateNormalizer:
+    """Parses review date strings against a single reference "now"
+
+    One normalizer is meant to live for one analysis job, so every relative
+    date ("3 days ago", "yesterday") in the job resolves against the same
+    moment. Review pages repeat the same few date strings a lot, so single
+    lookups go through an LRU cache; parse_many() handles large batches with
+    vectorized pandas parsing.
+    """
+
+    def __init__(self, now=None, cache_size=4096):
+        self.now = now or datetime.now()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def parse(self, date_string):
+        """Parse one date string, returning a datetime or None"""
+        if not date_string or not isinstance(date_string, str):
+            return None
+        return self._parse_cached(date_string)
+
+    def parse_relative(self, date_string):
+        """Parse relative date strings like '5 days ago'"""
+        match = _RELATIVE_PATTERN.search(date_string.lower())
+        if not match:
+            return None
+        return self.now - timedelta(days=int(match.group(1)) * _RELATIVE_UNIT_DAYS[match.group(2)])
+
+    def parse_many(self, date_strings):
+        """Parse a batch of date strings, returning datetimes/None in input order
+
+        Small batches (a product page's worth) go through parse(); large ones
+        are parsed with vectorized pandas, with the same results.
+        """
+        date_strings = list(date_strings)
+        if len(date_strings) < _BULK_MIN_STRINGS:
+            return [self.parse(value) for value in date_strings]
+
+        values = pd.Series(date_strings, dtype=object)
+
+        usable = values.map(lambda v: isinstance(v, str) and v != '')
+        unique = pd.Series(values[usable].unique(), dtype=object)
+        parsed = pd.Series(pd.NaT, index=unique.index, dtype='datetime64[us]')
+        resolved = pd.Series(False, index=unique.index)
+
+        # Relative dates take precedence and never fall through to absolute
+        # patterns, even when the relative form itself is unparseable
+        lowered = unique.str.lower()
+        is_ago = lowered.str.contains('ago', regex=False)
+        is_yesterday = ~is_ago & lowered.str.contains('yesterday', regex=False)
+        is_today = ~is_ago & ~is_yesterday & lowered.str.contains('today', regex=False)
+
+        relative = lowered[is_ago].str.extract(_RELATIVE_PATTERN)
+        if not relative.empty:
+            days = pd.to_numeric(relative[0], errors='coerce') * relative[1].map(_RELATIVE_UNIT_DAYS)
+            parsed[is_ago] = pd.Timestamp(self.now) - pd.to_timedelta(days, unit='D')
+        parsed[is_yesterday] = pd.Timestamp(self.now - timedelta(days=1))
+        parsed[is_today] = pd.Timestamp(self.now)
+        resolved |= is_ago | is_yesterday | is_today
+
+        for pattern, date_format in _ABSOLUTE_PATTERNS:
+            pending = unique[~resolved]
+            if pending.empty:
+                break
+            extracted = pending.str.extract(pattern)[0].dropna()
+            if extracted.empty:
+                continue
+            converted = pd.to_datetime(extracted, format=date_format, errors='coerce').dropna()
+            parsed[converted.index] = converted
+            resolved[converted.index] = True
+
+        lookup = {
+            value: (None if pd.isna(stamp) else stamp.to_pydatetime())
+            for value, stamp in zip(unique, parsed)
+        }
+        return [lookup.get(value) if ok else None for value, ok in zip(values, usable)]
+
+    def cache_info(self):
+        return self._parse_cached.cache_info()
+
+    def _parse(self, date_string):
+        lowered = date_string.lower()
+
+        # Handle relative dates first
+        if 'ago' in lowered:
+            return self.parse_relative(date_string)
+        if 'yesterday' in lowered:
+            return self.now - timedelta(days=1)
+        if 'today' in lowered:
+            return self.now
+
+        # Try absolute date patterns
+        for pattern, date_format in _ABSOLUTE_PATTERNS:
+            match = pattern.search(date_string)
+            if match:
+                try:
+                    return datetime.strptime(match.group(1), date_format)
+                except ValueError:
+                    continue
+        return None
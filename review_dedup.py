@@ -0,0 +1,150 @@
+import hashlib
+import re
+from functools import lru_cache
+
+import numpy as np
+
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Mersenne prime modulus for the MinHash universal hash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATION_SEED = 20240601
+
+
+@lru_cache(maxsize=1 << 16)
+def _shingle_hash(shingle):
+    """Stable 32-bit hash of one shingle"""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def normalize_review_text(text):
+    """Lowercase word tokens of a review, ignoring punctuation and spacing"""
+    return _TOKEN_PATTERN.findall((text or '').lower())
+
+
+def review_shingles(tokens):
+    """Word unigram and bigram shingles of a token list"""
+    return set(tokens) | {f'{a} {b}' for a, b in zip(tokens, tokens[1:])}
+
+
+class ReviewFingerprintIndex:
+    """Exact and near-duplicate review detection with MinHash + banded LSH
+
+    Each review is reduced to a `num_perm` value MinHash signature over its word
+    unigrams and bigrams, and filed under `bands` hashes of consecutive
+    signature slices. A lookup only compares against reviews sharing at least
+    one band, so inserts stay sub-linear in the size of the index. With the
+    defaults (16 bands of 4 rows) pairs at Jaccard similarity 0.7 become
+    candidates ~99% of the time and unrelated pairs almost never do.
+    Candidates are confirmed when their estimated Jaccard similarity reaches
+    `threshold`.
+
+    Short texts ("Great product!") collide legitimately across customers, so
+    reviews with fewer than `min_tokens` words are only treated as duplicates
+    when the authors match too.
+    """
+
+    def __init__(self, threshold=0.7, num_perm=64, bands=16, min_tokens=5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.min_tokens = min_tokens
+        self._rows = num_perm // bands
+
+        # a and b span the whole field so the permutations are independent;
+        # the uint64 products wrap, which keeps them well mixed
+        rng = np.random.default_rng(_PERMUTATION_SEED)
+        self._perm_a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._perm_b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self._exact = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = []
+        self._entries = []
+
+        self.stats = {
+            'reviews_indexed': 0,
+            'exact_duplicates': 0,
+            'near_duplicates': 0,
+            'candidates_compared': 0
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def signature(self, tokens):
+        """MinHash signature of a token list"""
+        shingles = review_shingles(tokens)
+        hashes = np.fromiter((_shingle_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (hashes[:, None] * self._perm_a + self._perm_b) % np.uint64(_MERSENNE_PRIME)
+        return (permuted & np.uint64(0xFFFFFFFF)).min(axis=0).astype(np.uint32)
+
+    def add(self, review, ref):
+        """Index a review under `ref`; return the duplicate's ref if it has one
+
+        Duplicates are not indexed themselves, so every duplicate points at the
+        first occurrence of its text.
+        """
+        fingerprint = self._fingerprint(review)
+        duplicate_ref, kind = self._find(*fingerprint)
+        if duplicate_ref is not None:
+            self.stats[f'{kind}_duplicates'] += 1
+            return duplicate_ref
+
+        key, signature, band_keys, tokens, author = fingerprint
+        if not tokens:
+            return None
+
+        entry = len(self._entries)
+        self._entries.append((author, len(tokens), ref))
+        self._signatures.append(signature)
+        self._exact.setdefault(key, []).append(entry)
+        for bucket, band_key in zip(self._buckets, band_keys):
+            bucket.setdefault(band_key, []).append(entry)
+
+        self.stats['reviews_indexed'] += 1
+        return None
+
+    def _fingerprint(self, review):
+        tokens = normalize_review_text(review.get('text'))
+        author = (review.get('author') or '').strip().lower()
+        if not tokens:
+            return '', None, [], tokens, author
+
+        signature = self.signature(tokens)
+        band_keys = [
+            signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            for band in range(self.bands)
+        ]
+        return ' '.join(tokens), signature, band_keys, tokens, author
+
+    def _find(self, key, signature, band_keys, tokens, author):
+        if not tokens:
+            return None, None
+
+        for entry in self._exact.get(key, []):
+            if self._same_source(entry, len(tokens), author):
+                return self._entries[entry][2], 'exact'
+
+        seen = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            for entry in bucket.get(band_key, []):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                self.stats['candidates_compared'] += 1
+
+                similarity = np.count_nonzero(self._signatures[entry] == signature) / self.num_perm
+                if similarity >= self.threshold and self._same_source(entry, len(tokens), author):
+                    return self._entries[entry][2], 'near'
+        return None, None
+
+    def _same_source(self, entry, token_count, author):
+        entry_author, entry_tokens, _ = self._entries[entry]
+        if min(token_count, entry_tokens) >= self.min_tokens:
+            return True
+        return bool(author) and author == entry_author
@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+
+import numpy as np
+
+from review_table import EXPORT_FIELDS
+
+# Parquet export is optional; CSV and NDJSON only need the standard library
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def stream_export(review_table, export_format):
+    """Generator of response chunks for one of EXPORT_FORMATS
+
+    Rows are read from the table a chunk at a time, so server memory is
+    bounded by the chunk (or Parquet row group) size, and the first bytes
+    are ready before the rest of the table has been encoded.
+    """
+    if export_format == 'csv':
+        return iter_csv(review_table)
+    if export_format == 'ndjson':
+        return iter_ndjson(review_table)
+    if export_format == 'parquet':
+        return iter_parquet(review_table)
+    raise ValueError(f"Unknown export format '{export_format}', expected one of {list(EXPORT_FORMATS)}")
+
+
+def iter_csv(review_table, chunk_size=4096):
+    """CSV with a header row; missing values are empty fields"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    for chunk in review_table.iter_chunks(chunk_size=chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_chunk_rows(chunk))
+        yield buffer.getvalue()
+
+
+def iter_ndjson(review_table, chunk_size=4096):
+    """One JSON object per review per line; missing values are null"""
+    for chunk in review_table.iter_chunks(chunk_size=chunk_size):
+        yield ''.join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
+            for row in _chunk_rows(chunk)
+        )
+
+
+def iter_parquet(review_table, row_group_size=65536):
+    """Parquet file written one row group per table chunk
+
+    The writer targets an in-memory sink that is emptied after every row
+    group, so only one encoded row group is held at a time.
+    """
+    if pq is None:
+        raise RuntimeError('Parquet export requires pyarrow')
+
+    schema = pa.schema([
+        ('product_name', pa.string()),
+        ('product_url', pa.string()),
+        ('sentiment_category', pa.string()),
+        ('rating', pa.float64()),
+        ('text', pa.string()),
+        ('author', pa.string()),
+        ('sentiment_score', pa.float64()),
+        ('review_date', pa.timestamp('s')),
+        ('duplicate', pa.bool_())
+    ])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in review_table.iter_chunks(chunk_size=row_group_size):
+            writer.write_table(pa.Table.from_arrays([
+                pa.array(chunk[field], type=schema.field(field).type, from_pandas=True)
+                for field in EXPORT_FIELDS
+            ], schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _chunk_rows(chunk):
+    """Rows of plain Python values, with NaN/NaT mapped to None"""
+    ratings = chunk['rating']
+    scores = chunk['sentiment_score']
+    dates = np.datetime_as_string(chunk['review_date'], unit='s').tolist()
+    return zip(
+        chunk['product_name'],
+        chunk['product_url'],
+        chunk['sentiment_category'],
+        np.where(np.isnan(ratings), None, ratings).tolist(),
+        chunk['text'],
+        chunk['author'],
+        np.where(np.isnan(scores), None, scores).tolist(),
+        [None if date == 'NaT' else date for date in dates],
+        chunk['duplicate'].tolist()
+    )
+
+
+class _DrainableSink:
+    """Write-only file object whose buffered bytes are handed out on drain()"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
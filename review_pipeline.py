@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+
+
+# Marks the end of a stage's output stream
+_STAGE_DONE = object()
+
+
+class StageStats:
+    """Timing and queue occupancy counters for one pipeline stage"""
+
+    def __init__(self, name, queue_capacity=None):
+        self.name = name
+        self.queue_capacity = queue_capacity
+        self.items = 0
+        self.errors = 0
+        self.busy_time = 0.0      # doing work
+        self.idle_time = 0.0      # waiting on an empty input queue
+        self.blocked_time = 0.0   # waiting on a full output queue (backpressure)
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def record_depth(self, depth):
+        """Sample the depth of this stage's input queue"""
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def to_dict(self):
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+
+        return {
+            'items': self.items,
+            'errors': self.errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'busy_seconds': round(self.busy_time, 3),
+            'idle_seconds': round(self.idle_time, 3),
+            'blocked_seconds': round(self.blocked_time, 3),
+            'occupancy': round(self.busy_time / elapsed, 3) if elapsed > 0 else 0.0,
+            'queue_capacity': self.queue_capacity,
+            'max_queue_depth': self.max_queue_depth,
+            'mean_queue_depth': round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0
+        }
+
+
+class ProductPipeline:
+    """Search -> scrape -> analyze stages connected by bounded queues
+
+    Search and scrape run in worker threads. The analysis stage runs in the
+    thread iterating run(), so sentiment analysis of one product overlaps the
+    fetch of the next one. A full queue blocks the upstream stage, which keeps
+    at most `queue_size` products buffered between any two stages.
+    """
+
+    def __init__(self, search_fn, scrape_fn, analyze_fn, queue_size=2, scrape_delay=None):
+        self.search_fn = search_fn
+        self.scrape_fn = scrape_fn
+        self.analyze_fn = analyze_fn
+        self.queue_size = max(1, queue_size)
+        self.scrape_delay = scrape_delay
+
+        self._products = queue.Queue(maxsize=self.queue_size)
+        self._reviews = queue.Queue(maxsize=self.queue_size)
+        self._stop = threading.Event()
+
+        self.stats = {
+            'search': StageStats('search'),
+            'scrape': StageStats('scrape', self.queue_size),
+            'analyze': StageStats('analyze', self.queue_size)
+        }
+
+    def run(self):
+        """Start the worker stages and yield analysis results as they complete"""
+        workers = [
+            threading.Thread(target=self._search_stage, name='pipeline-search', daemon=True),
+            threading.Thread(target=self._scrape_stage, name='pipeline-scrape', daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            yield from self._analysis_stage()
+        finally:
+            # Also reached when the consumer stops iterating early
+            self._stop.set()
+            for worker in workers:
+                worker.join(timeout=5)
+
+    def get_stats(self):
+        """Per-stage occupancy and backpressure statistics"""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    def _put(self, target, item, stats):
+        """Blocking put that gives up once the pipeline is stopped"""
+        waiting_since = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stats.blocked_time += time.perf_counter() - waiting_since
+
+    def _get(self, source, stats):
+        """Blocking get that returns _STAGE_DONE once the pipeline is stopped"""
+        stats.record_depth(source.qsize())
+        waiting_since = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _STAGE_DONE
+        finally:
+            stats.idle_time += time.perf_counter() - waiting_since
+
+    def _search_stage(self):
+        stats = self.stats['search']
+        stats.start()
+        try:
+            working_since = time.perf_counter()
+            for product in self.search_fn():
+                stats.busy_time += time.perf_counter() - working_since
+                stats.items += 1
+                if not self._put(self._products, product, stats):
+                    return
+                working_since = time.perf_counter()
+            stats.busy_time += time.perf_counter() - working_since
+        except Exception as e:
+            stats.errors += 1
+            print(f"❌ Search stage failed: {e}")
+        finally:
+            self._put(self._products, _STAGE_DONE, stats)
+            stats.finish()
+
+    def _scrape_stage(self):
+        stats = self.stats['scrape']
+        stats.start()
+        try:
+            while True:
+                product = self._get(self._products, stats)
+                if product is _STAGE_DONE:
+                    break
+
+                working_since = time.perf_counter()
+                try:
+                    reviews = self.scrape_fn(product)
+                except Exception as e:
+                    stats.errors += 1
+                    print(f"❌ Error processing {product['name']}: {e}")
+                    reviews = None
+                stats.busy_time += time.perf_counter() - working_since
+                stats.items += 1
+
+                if reviews and not self._put(self._reviews, (product, reviews), stats):
+                    return
+
+                # Brief pause between product page fetches
+                if self.scrape_delay:
+                    self._stop.wait(self.scrape_delay())
+        finally:
+            self._put(self._reviews, _STAGE_DONE, stats)
+            stats.finish()
+
+    def _analysis_stage(self):
+        stats = self.stats['analyze']
+        stats.start()
+        try:
+            while True:
+                item = self._get(self._reviews, stats)
+                if item is _STAGE_DONE:
+                    break
+
+                product, reviews = item
+                working_since = time.perf_counter()
+                try:
+                    result = self.analyze_fn(product, reviews)
+                except Exception as e:
+                    stats.errors += 1
+                    print(f"❌ Error processing {product['name']}: {e}")
+                    result = None
+                stats.busy_time += time.perf_counter() - working_since
+                stats.items += 1
+
+                if result is not None:
+                    yield result
+        finally:
+            stats.finish()
@@ -0,0 +1,213 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from product_identity import product_key
+
+
+RESOLUTIONS = ('day', 'week', 'month')
+
+# How long each resolution is kept; months are kept forever. Every run is
+# written at all three resolutions, so dropping old day/week rows only loses
+# detail, never totals.
+DEFAULT_RETENTION = {'day': timedelta(days=90), 'week': timedelta(days=730), 'month': None}
+
+_SUM_COLUMNS = (
+    'runs', 'products', 'reviews', 'rating_count', 'rating_sum',
+    'sentiment_count', 'sentiment_sum', 'positive_reviews',
+    'negative_reviews', 'neutral_reviews'
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS rollups (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    category TEXT NOT NULL,
+    label TEXT NOT NULL,
+    {', '.join(f'{column} REAL NOT NULL DEFAULT 0' for column in _SUM_COLUMNS)},
+    PRIMARY KEY (scope, key, resolution, bucket)
+);
+CREATE INDEX IF NOT EXISTS rollups_by_age ON rollups (resolution, bucket);
+"""
+
+_UPSERT = f"""
+INSERT INTO rollups (scope, key, resolution, bucket, category, label, {', '.join(_SUM_COLUMNS)})
+VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' for _ in _SUM_COLUMNS)})
+ON CONFLICT (scope, key, resolution, bucket) DO UPDATE SET
+    label = excluded.label,
+    {', '.join(f'{column} = {column} + excluded.{column}' for column in _SUM_COLUMNS)}
+"""
+
+
+def bucket_start(moment, resolution):
+    """First day of the day/week/month bucket containing `moment`
+
+    Weeks start on Sunday, matching the dashboard's weekly grouping.
+    """
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if resolution == 'day':
+        return day
+    if resolution == 'week':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    if resolution == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown resolution '{resolution}', expected one of {RESOLUTIONS}")
+
+
+def _category_key(category):
+    return (category or '').strip().lower()
+
+
+class RollupStore:
+    """SQLite store of per-category and per-product aggregates over time
+
+    Each completed job adds its totals (review counts, rating and sentiment
+    sums, sentiment buckets) to the day, week and month buckets of its
+    completion time. Only sums are stored, so buckets merge exactly and trend
+    reads are a range scan over precomputed rows, never a pass over reviews.
+    Old day and week rows are pruned per `retention`.
+    """
+
+    def __init__(self, path, retention=None):
+        self.path = path
+        self.retention = dict(DEFAULT_RETENTION if retention is None else retention)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record_analysis(self, analysis, completed_at=None):
+        """Add one completed category analysis to every resolution's bucket"""
+        completed_at = completed_at or datetime.now()
+        category = analysis.get('category', '')
+        product_stats = (analysis.get('statistics') or {}).get('products') or []
+
+        rows = []
+        category_totals = dict.fromkeys(_SUM_COLUMNS, 0)
+        category_totals['runs'] = 1
+
+        for index, product in enumerate(analysis.get('products', [])):
+            stats = product_stats[index] if index < len(product_stats) else {}
+            totals = self._product_totals(product, stats)
+            for column in _SUM_COLUMNS[1:]:
+                category_totals[column] += totals[column]
+
+            url = product.get('product_url', '')
+            if url:
+                rows.append(('product', product_key(url), product.get('product_name', ''), totals))
+
+        rows.append(('category', _category_key(category), category, category_totals))
+
+        with self._lock, closing(self._connect()) as connection, connection:
+            for resolution in RESOLUTIONS:
+                bucket = bucket_start(completed_at, resolution).isoformat()
+                connection.executemany(_UPSERT, [
+                    (scope, key, resolution, bucket, _category_key(category), label,
+                     *(totals[column] for column in _SUM_COLUMNS))
+                    for scope, key, label, totals in rows
+                ])
+            self._prune(connection, completed_at)
+
+    @staticmethod
+    def _product_totals(product, stats):
+        """Additive totals for one product analysis
+
+        Rating and sentiment pairs both come from the product's review
+        statistics, so they cover the same reviews.
+        """
+        rated = stats.get('rated_reviews') or 0
+        scored = stats.get('scored_reviews') or 0
+        return {
+            'runs': 1,
+            'products': 1,
+            'reviews': product.get('total_reviews', 0),
+            'rating_count': rated,
+            'rating_sum': (stats.get('average_rating') or 0) * rated,
+            'sentiment_count': scored,
+            'sentiment_sum': (stats.get('average_sentiment') or 0) * scored,
+            'positive_reviews': product.get('positive_reviews', 0),
+            'negative_reviews': product.get('negative_reviews', 0),
+            'neutral_reviews': product.get('neutral_reviews', 0)
+        }
+
+    def _prune(self, connection, now):
+        """Downsample by dropping day/week rows older than their retention"""
+        for resolution, keep in self.retention.items():
+            if keep is None:
+                continue
+            cutoff = bucket_start(now - keep, resolution).isoformat()
+            connection.execute('DELETE FROM rollups WHERE resolution = ? AND bucket < ?', (resolution, cutoff))
+
+    def trend(self, category=None, product_url=None, resolution='week', months=6, now=None):
+        """Time series for a category (or one product), oldest bucket first
+
+        Each point carries review-weighted average rating and sentiment plus
+        the counts they came from. Buckets with no runs are omitted.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}', expected one of {RESOLUTIONS}")
+
+        if product_url:
+            scope, key = 'product', product_key(product_url)
+        else:
+            scope, key = 'category', _category_key(category)
+
+        now = now or datetime.now()
+        since = bucket_start(now - timedelta(days=round(months * 30.44)), resolution).isoformat()
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT bucket, label, {', '.join(_SUM_COLUMNS)} FROM rollups "
+                "WHERE scope = ? AND key = ? AND resolution = ? AND bucket >= ? ORDER BY bucket",
+                (scope, key, resolution, since)
+            ).fetchall()
+
+        return [self._point(row) for row in rows]
+
+    @staticmethod
+    def _point(row):
+        bucket, label = row[:2]
+        sums = dict(zip(_SUM_COLUMNS, row[2:]))
+        scored = sums['positive_reviews'] + sums['negative_reviews'] + sums['neutral_reviews']
+        return {
+            'bucket': bucket,
+            'label': label,
+            'runs': int(sums['runs']),
+            'products': int(sums['products']),
+            'reviews': int(sums['reviews']),
+            'average_rating': round(sums['rating_sum'] / sums['rating_count'], 3) if sums['rating_count'] else None,
+            'average_sentiment': round(sums['sentiment_sum'] / sums['sentiment_count'], 3) if sums['sentiment_count'] else None,
+            'positive_share': round(sums['positive_reviews'] / scored, 3) if scored else None,
+            'negative_share': round(sums['negative_reviews'] / scored, 3) if scored else None
+        }
+
+    def categories(self):
+        """Categories with recorded runs, with their first and last bucket"""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT label, MIN(bucket), MAX(bucket), SUM(runs) FROM rollups "
+                "WHERE scope = 'category' AND resolution = 'month' GROUP BY key ORDER BY key"
+            ).fetchall()
+        return [
+            {'category': label, 'first_bucket': first, 'last_bucket': last, 'runs': int(runs)}
+            for label, first, last, runs in rows
+        ]
+
+    def stats(self):
+        """Row counts per resolution and database size"""
+        with closing(self._connect()) as connection:
+            counts = dict(connection.execute('SELECT resolution, COUNT(*) FROM rollups GROUP BY resolution').fetchall())
+        return {
+            'rows': {resolution: counts.get(resolution, 0) for resolution in RESOLUTIONS},
+            'bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
@@ -0,0 +1,66 @@
+import heapq
+
+from review_table import BUCKETS
+
+
+SAMPLE_ORDERS = ('polarity', 'recent')
+
+
+def _polarity_rank(score, bucket):
+    """Higher is more representative: strongest praise, harshest criticism, most neutral"""
+    if bucket == 'positive':
+        return score
+    if bucket == 'negative':
+        return -score
+    return -abs(score)
+
+
+class ReviewSampler:
+    """Streams reviews into bounded per-bucket heaps of the k best samples
+
+    `order` picks what "best" means:
+      - 'polarity': most extreme polarity for the bucket (default)
+      - 'recent': newest timestamp, then polarity
+    Memory stays O(k) per bucket however many reviews a product has. Ties keep
+    the review that arrived first.
+    """
+
+    def __init__(self, k=3, order='polarity'):
+        if order not in SAMPLE_ORDERS:
+            raise ValueError(f"Unknown sample order '{order}', expected one of {SAMPLE_ORDERS}")
+
+        self.k = k
+        self.order = order
+        self.counts = dict.fromkeys(BUCKETS, 0)
+        self._heaps = {bucket: [] for bucket in BUCKETS}
+        self._seen = 0
+
+    def add(self, review, bucket):
+        """Count a scored review in `bucket` and keep it if it ranks in the top k"""
+        self.counts[bucket] += 1
+        if self.k <= 0:
+            return
+
+        # Negated arrival order makes earlier reviews win ties
+        entry = (self._rank(review, bucket), -self._seen, review)
+        self._seen += 1
+
+        heap = self._heaps[bucket]
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def samples(self):
+        """Dict of bucket -> sampled reviews, best first"""
+        return {
+            bucket: [entry[2] for entry in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+            for bucket, heap in self._heaps.items()
+        }
+
+    def _rank(self, review, bucket):
+        polarity = _polarity_rank(review.sentiment_score, bucket)
+        if self.order == 'recent':
+            timestamp = review.timestamp
+            return (float('-inf') if timestamp is None else timestamp, polarity)
+        return (polarity,)
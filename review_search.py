@@ -0,0 +1,256 @@
+import re
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from records import from_epoch
+from review_table import StringPool
+
+
+_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+STOP_WORDS = frozenset([
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this',
+    'that', 'these', 'those', 'they', 'them', 'their', 'there', 'here',
+    'when', 'where', 'why', 'how', 'what', 'who', 'which', 'very',
+    'really', 'quite', 'just', 'only', 'also', 'even', 'still', 'more',
+    'most', 'much', 'many', 'some', 'any', 'all', 'not', 'product'
+])
+
+
+def meaningful_words(text):
+    """Lowercase words of 4+ letters that are not stop words
+
+    Shared by theme extraction and the search index, so a theme shown on a
+    product is always a term its reviews can be searched by.
+    """
+    words = _WORD_PATTERN.findall((text or '').lower())
+    return [word for word in words if word not in STOP_WORDS and len(word) > 3]
+
+
+class ReviewSearchIndex:
+    """Incremental inverted index over review text with BM25 ranking
+
+    Reviews are added a product at a time as jobs analyze them. Each term's
+    postings are two growable int32 arrays (review ids and term frequencies),
+    viewed as NumPy arrays at query time so scoring is vectorized. Removing a
+    job tombstones its reviews; postings are rebuilt once more than half of
+    the indexed reviews are dead.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}
+        self._lengths = array('i')
+        self._live = array('b')
+        self._jobs = array('i')
+        self._categories = array('i')
+        self._products = array('i')
+        self._authors = array('i')
+        self._ratings = array('d')
+        self._sentiments = array('d')
+        self._timestamps = array('q')
+        self._texts = []
+        self._product_urls = {}
+        self._labels = StringPool()
+        self._product_names = StringPool()
+        self._author_names = StringPool()
+        self._live_count = 0
+        self._live_length = 0
+
+    def __len__(self):
+        return self._live_count
+
+    def add_reviews(self, job_id, category, product_name, product_url, reviews):
+        """Index the text reviews of one analyzed product"""
+        with self._lock:
+            job = self._labels.encode(job_id)
+            category_code = self._labels.encode((category or '').lower())
+            product = self._product_names.encode(product_name)
+            self._product_urls[product] = product_url
+
+            for review in reviews:
+                terms = Counter(meaningful_words(review.text))
+                if not terms:
+                    continue
+
+                doc = len(self._lengths)
+                for term, frequency in terms.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = (array('i'), array('i'))
+                    postings[0].append(doc)
+                    postings[1].append(frequency)
+
+                length = sum(terms.values())
+                self._lengths.append(length)
+                self._live.append(1)
+                self._jobs.append(job)
+                self._categories.append(category_code)
+                self._products.append(product)
+                self._authors.append(self._author_names.encode(review.author))
+                self._ratings.append(review.rating or np.nan)
+                self._sentiments.append(np.nan if review.sentiment_score is None else review.sentiment_score)
+                self._timestamps.append(_NO_TIMESTAMP if review.timestamp is None else review.timestamp)
+                self._texts.append(review.text)
+                self._live_count += 1
+                self._live_length += length
+
+    def remove_job(self, job_id):
+        """Drop every review indexed for a job"""
+        with self._lock:
+            job = self._labels.lookup(job_id)
+            if job is None:
+                return 0
+
+            jobs = np.frombuffer(self._jobs, dtype=np.int32)
+            live = np.frombuffer(self._live, dtype=np.int8)
+            removed = np.flatnonzero((jobs == job) & (live == 1))
+            if removed.size:
+                live[removed] = 0
+                self._live_count -= int(removed.size)
+                self._live_length -= int(np.frombuffer(self._lengths, dtype=np.int32)[removed].sum())
+
+            if len(self._lengths) > 2 * self._live_count:
+                self._compact()
+            return int(removed.size)
+
+    def search(self, query, product=None, category=None, job_id=None, offset=0, limit=20):
+        """Rank reviews matching `query`; returns (total_matches, results)
+
+        `product` matches product names case-insensitively as a substring,
+        `category` and `job_id` match exactly.
+        """
+        terms = list(dict.fromkeys(meaningful_words(query)))
+        with self._lock:
+            if not terms or not self._live_count:
+                return 0, []
+
+            doc_count = len(self._lengths)
+            lengths = np.frombuffer(self._lengths, dtype=np.int32)
+            average_length = self._live_length / self._live_count
+            scores = np.zeros(doc_count)
+            matched = np.zeros(doc_count, dtype=bool)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs = np.frombuffer(postings[0], dtype=np.int32)
+                frequencies = np.frombuffer(postings[1], dtype=np.int32).astype(float)
+
+                # Document frequencies still count tombstoned reviews until compaction
+                document_frequency = min(len(docs), self._live_count)
+                idf = np.log(1 + (self._live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+                scores[docs] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+                matched[docs] = True
+
+            matched &= np.frombuffer(self._live, dtype=np.int8) == 1
+            if category:
+                matched &= self._code_mask(self._categories, self._labels.lookup(category.lower()))
+            if job_id:
+                matched &= self._code_mask(self._jobs, self._labels.lookup(job_id))
+            if product:
+                needle = product.lower()
+                codes = [code for code, name in enumerate(self._product_names.values) if needle in name.lower()]
+                matched &= np.isin(np.frombuffer(self._products, dtype=np.int32), codes)
+
+            candidates = np.flatnonzero(matched)
+            total = int(candidates.size)
+            if offset >= total or limit <= 0:
+                return total, []
+
+            # Only reviews scoring at least the last one on the page are sorted;
+            # ties rank by insertion order so pages never overlap
+            end = min(offset + limit, total)
+            candidate_scores = scores[candidates]
+            if end < total:
+                cutoff = -np.partition(-candidate_scores, end - 1)[end - 1]
+                top = np.flatnonzero(candidate_scores >= cutoff)
+            else:
+                top = np.arange(total)
+            top = top[np.lexsort((candidates[top], -candidate_scores[top]))][offset:end]
+
+            return total, [self._result(int(candidates[i]), float(candidate_scores[i])) for i in top]
+
+    def stats(self):
+        """Index size figures for monitoring"""
+        with self._lock:
+            posting_count = sum(len(docs) for docs, _ in self._postings.values())
+            column_bytes = sum(
+                column.itemsize * len(column) for column in (
+                    self._lengths, self._live, self._jobs, self._categories, self._products,
+                    self._authors, self._ratings, self._sentiments, self._timestamps
+                )
+            )
+            return {
+                'reviews': self._live_count,
+                'indexed_reviews': len(self._lengths),
+                'terms': len(self._postings),
+                'postings': posting_count,
+                'posting_bytes': posting_count * 8,
+                'column_bytes': column_bytes
+            }
+
+    def _code_mask(self, column, code):
+        if code is None:
+            return np.zeros(len(column), dtype=bool)
+        return np.frombuffer(column, dtype=np.int32) == code
+
+    def _result(self, doc, score):
+        product = self._products[doc]
+        timestamp = self._timestamps[doc]
+        rating = self._ratings[doc]
+        sentiment = self._sentiments[doc]
+        return {
+            'score': round(score, 4),
+            'job_id': self._labels.values[self._jobs[doc]],
+            'category': self._labels.values[self._categories[doc]],
+            'product_name': self._product_names.values[product],
+            'product_url': self._product_urls.get(product, ''),
+            'rating': None if rating != rating else rating,
+            'text': self._texts[doc],
+            'author': self._author_names.values[self._authors[doc]],
+            'datetime': None if timestamp == _NO_TIMESTAMP else from_epoch(timestamp).isoformat(),
+            'sentiment_score': None if sentiment != sentiment else round(sentiment, 3)
+        }
+
+    def _compact(self):
+        """Rebuild postings and columns without tombstoned reviews (lock held)"""
+        live = np.flatnonzero(np.frombuffer(self._live, dtype=np.int8) == 1)
+        remap = np.full(len(self._lengths), -1, dtype=np.int32)
+        remap[live] = np.arange(live.size, dtype=np.int32)
+
+        postings = {}
+        for term, (docs, frequencies) in self._postings.items():
+            doc_ids = remap[np.frombuffer(docs, dtype=np.int32)]
+            keep = doc_ids >= 0
+            if keep.any():
+                postings[term] = (
+                    array('i', doc_ids[keep].tobytes()),
+                    array('i', np.frombuffer(frequencies, dtype=np.int32)[keep].tobytes())
+                )
+        self._postings = postings
+
+        for name in ('_lengths', '_live', '_jobs', '_categories', '_products',
+                     '_authors', '_ratings', '_sentiments', '_timestamps'):
+            column = getattr(self, name)
+            values = np.frombuffer(column, dtype=_ARRAY_DTYPES[column.typecode])[live]
+            setattr(self, name, array(column.typecode, values.tobytes()))
+        self._texts = [self._texts[doc] for doc in live]
+
+
+# Review timestamps are epoch seconds; this marks "no date"
+_NO_TIMESTAMP = np.iinfo(np.int64).min
+
+_ARRAY_DTYPES = {'i': np.int32, 'b': np.int8, 'd': np.float64, 'q': np.int64}
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+_T_CRITICAL_95 = np.array([
+    np.nan,
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+])
+_Z_CRITICAL_95 = 1.96
+
+SENTIMENT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def compute_review_statistics(product_index, ratings, sentiments, products, prior_weight=None, job_wide=None):
+    """Rating/sentiment distributions and per-product rating statistics
+
+    `product_index`, `ratings` and `sentiments` are parallel arrays with one
+    entry per review; missing ratings or sentiment scores are NaN. Per-product
+    figures cover every review of the product, while the histogram,
+    percentiles, correlation and the prior only count the reviews selected by
+    the boolean `job_wide` mask (default: all of them). Products are
+    ranked by a Bayesian average that shrinks each product's mean rating toward
+    the job-wide mean by `prior_weight` pseudo-reviews (default: the mean number
+    of rated reviews per product), so a single 5-star review does not outrank
+    forty 4.8-star ones.
+    """
+    product_count = len(products)
+    if job_wide is None:
+        job_wide = np.ones(product_index.size, dtype=bool)
+    has_rating = ~np.isnan(ratings)
+    has_sentiment = ~np.isnan(sentiments)
+
+    rated_products = product_index[has_rating]
+    rated_values = ratings[has_rating]
+
+    # Rating histogram (1-5 stars)
+    job_ratings = ratings[has_rating & job_wide]
+    stars = np.clip(np.floor(job_ratings).astype(np.intp), 0, 5)
+    histogram = np.bincount(stars, minlength=6)[1:6]
+
+    # Per-product rating moments
+    counts = np.bincount(rated_products, minlength=product_count).astype(float)
+    sums = np.bincount(rated_products, weights=rated_values, minlength=product_count)
+    squares = np.bincount(rated_products, weights=rated_values ** 2, minlength=product_count)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        variances = (squares - counts * means ** 2) / (counts - 1)
+        std = np.sqrt(np.clip(variances, 0, None))
+
+        dof = counts.astype(np.intp) - 1
+        critical = np.where(
+            dof <= 30,
+            _T_CRITICAL_95[np.clip(dof, 0, 30)],
+            _Z_CRITICAL_95
+        )
+        margin = critical * std / np.sqrt(counts)
+
+    # Bayesian-adjusted ratings
+    rated_total = job_ratings.size
+    prior_mean = float(job_ratings.sum() / rated_total) if rated_total else 0.0
+    if prior_weight is None:
+        prior_weight = float(rated_total / product_count) if product_count else 0.0
+    adjusted = (prior_weight * prior_mean + sums) / np.maximum(prior_weight + counts, 1e-12)
+
+    # Per-product sentiment
+    scored_products = product_index[has_sentiment]
+    scored_values = sentiments[has_sentiment]
+    sentiment_counts = np.bincount(scored_products, minlength=product_count)
+    sentiment_sums = np.bincount(scored_products, weights=scored_values, minlength=product_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sentiment_means = sentiment_sums / sentiment_counts
+
+    # Sentiment percentiles and rating/sentiment correlation
+    job_sentiments = sentiments[has_sentiment & job_wide]
+    if job_sentiments.size:
+        percentile_values = np.percentile(job_sentiments, SENTIMENT_PERCENTILES)
+        sentiment_percentiles = {f'p{p}': _round(v) for p, v in zip(SENTIMENT_PERCENTILES, percentile_values)}
+    else:
+        sentiment_percentiles = {f'p{p}': None for p in SENTIMENT_PERCENTILES}
+
+    both = has_rating & has_sentiment & job_wide
+    correlation = None
+    if both.sum() >= 2 and np.ptp(ratings[both]) > 0 and np.ptp(sentiments[both]) > 0:
+        correlation = _round(np.corrcoef(ratings[both], sentiments[both])[0, 1])
+
+    product_stats = []
+    for i, product in enumerate(products):
+        product_stats.append({
+            'product_name': product['product_name'],
+            'product_url': product['product_url'],
+            'rated_reviews': int(counts[i]),
+            'average_rating': _round(means[i]),
+            'rating_std': _round(std[i]),
+            'rating_ci_low': _round(means[i] - margin[i]),
+            'rating_ci_high': _round(means[i] + margin[i]),
+            'adjusted_rating': _round(adjusted[i]) if counts[i] else None,
+            'scored_reviews': int(sentiment_counts[i]),
+            'average_sentiment': _round(sentiment_means[i])
+        })
+
+    best_product = worst_product = None
+    ranked = np.flatnonzero(counts > 0)
+    if ranked.size:
+        best_product = _ranked_product(product_stats[ranked[np.argmax(adjusted[ranked])]])
+        worst_product = _ranked_product(product_stats[ranked[np.argmin(adjusted[ranked])]])
+
+    return {
+        'review_count': int(np.count_nonzero(job_wide)),
+        'rated_reviews': int(rated_total),
+        'scored_reviews': int(job_sentiments.size),
+        'rating_histogram': {str(star): int(count) for star, count in zip(range(1, 6), histogram)},
+        'sentiment_percentiles': sentiment_percentiles,
+        'rating_sentiment_correlation': correlation,
+        'prior_rating': _round(prior_mean),
+        'prior_weight': _round(prior_weight),
+        'products': product_stats,
+        'best_product': best_product,
+        'worst_product': worst_product
+    }
+
+
+def _ranked_product(stats):
+    return {
+        'name': stats['product_name'],
+        'url': stats['product_url'],
+        'adjusted_rating': stats['adjusted_rating'],
+        'average_rating': stats['average_rating'],
+        'rated_reviews': stats['rated_reviews']
+    }
+
+
+def _round(value, digits=3):
+    """Round to a plain float, mapping NaN/inf to None for JSON output"""
+    value = float(value)
+    if not np.isfinite(value):
+        return None
+    return round(value, digits)
@@ -0,0 +1,273 @@
+import threading
+
+import numpy as np
+
+from review_stats import compute_review_statistics
+
+
+# Sentiment buckets, using the same +/-0.1 polarity cut-offs as analyze_sentiment;
+# reviews without scored text get NO_BUCKET
+BUCKETS = ('positive', 'negative', 'neutral')
+NO_BUCKET = -1
+
+# datetime64 NaT shares its bit pattern with the smallest int64
+_NAT = np.iinfo(np.int64).min
+
+_COLUMNS = ('product', 'rating', 'sentiment', 'timestamp', 'bucket', 'duplicate', 'text', 'author')
+
+# Column order of machine-readable exports (see iter_chunks)
+EXPORT_FIELDS = (
+    'product_name', 'product_url', 'sentiment_category', 'rating', 'text',
+    'author', 'sentiment_score', 'review_date', 'duplicate'
+)
+
+
+class StringPool:
+    """Interns strings to int32 codes; code 0 is always the empty string"""
+
+    def __init__(self):
+        self._codes = {'': 0}
+        self.values = ['']
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        value = value or ''
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """Code of an already interned value, or None"""
+        return self._codes.get(value or '')
+
+    def decode(self, codes):
+        values = self.values
+        return [values[code] for code in codes]
+
+
+class ReviewTable:
+    """Every review of one job, stored column by column
+
+    Reviews are appended a product at a time while the job runs. Numeric
+    columns live in NumPy arrays (product index, rating, sentiment score,
+    timestamp, sentiment bucket, duplicate flag), and review text and authors
+    are interned in a shared string pool, so repeated texts cost one int32 per
+    row. Statistics, dashboard rows and the Excel export all read from here
+    rather than from nested review dicts.
+
+    Reviews flagged with 'duplicate_of' are stored and count toward their
+    own product's statistics, but are left out of the job-wide figures.
+    """
+
+    def __init__(self):
+        self.products = []
+        self.strings = StringPool()
+        # Row where each product's reviews start; the last entry is the row count
+        self._offsets = [0]
+        self._chunks = {name: [] for name in _COLUMNS}
+        self._columns = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.columns()['product'])
+
+    def add_product(self, product_name, product_url, reviews):
+        """Append the Review records of one analyzed product"""
+        index = len(self.products)
+        self.products.append({'product_name': product_name, 'product_url': product_url})
+
+        count = len(reviews)
+        ratings = np.array([review.rating or np.nan for review in reviews], dtype=float)
+        sentiments = np.array([
+            np.nan if review.sentiment_score is None else review.sentiment_score
+            for review in reviews
+        ], dtype=float)
+        timestamps = np.array([
+            _NAT if review.timestamp is None else review.timestamp
+            for review in reviews
+        ], dtype=np.int64).astype('datetime64[s]')
+
+        buckets = np.full(count, NO_BUCKET, dtype=np.int8)
+        scored = ~np.isnan(sentiments)
+        buckets[scored] = np.where(sentiments[scored] > 0.1, 0, np.where(sentiments[scored] < -0.1, 1, 2))
+
+        chunk = {
+            'product': np.full(count, index, dtype=np.int32),
+            'rating': ratings,
+            'sentiment': sentiments,
+            'timestamp': timestamps,
+            'bucket': buckets,
+            'duplicate': np.array([bool(review.duplicate_of) for review in reviews], dtype=bool),
+            'text': np.array([self.strings.encode(review.text) for review in reviews], dtype=np.int32),
+            'author': np.array([self.strings.encode(review.author) for review in reviews], dtype=np.int32)
+        }
+
+        with self._lock:
+            for name in _COLUMNS:
+                self._chunks[name].append(chunk[name])
+            self._offsets.append(self._offsets[-1] + count)
+            self._columns = None
+
+    def columns(self):
+        """Dict of column name -> array, concatenated on first read after an append"""
+        with self._lock:
+            if self._columns is None:
+                self._columns = {
+                    name: np.concatenate(chunks) if chunks else np.empty(0, dtype=_EMPTY_DTYPES[name])
+                    for name, chunks in self._chunks.items()
+                }
+                # Keep one chunk per column so later appends concatenate less
+                self._chunks = {name: [column] for name, column in self._columns.items()}
+            return self._columns
+
+    def statistics(self, prior_weight=None):
+        """Review statistics of the job; duplicates only count for their own product"""
+        columns = self.columns()
+        statistics = compute_review_statistics(
+            columns['product'].astype(np.intp),
+            columns['rating'],
+            columns['sentiment'],
+            self.products,
+            prior_weight=prior_weight,
+            job_wide=~columns['duplicate']
+        )
+        statistics['duplicate_reviews'] = int(np.count_nonzero(columns['duplicate']))
+        return statistics
+
+    def records(self, scored_only=True):
+        """Reviews as flat dicts for the dashboard, in insertion order
+
+        Sentiment scores are the review's own polarity; 'datetime' is an ISO
+        string or None.
+        """
+        columns = self.columns()
+        rows = np.flatnonzero(columns['bucket'] != NO_BUCKET) if scored_only else np.arange(len(columns['product']))
+
+        names = [product['product_name'] for product in self.products]
+        urls = [product['product_url'] for product in self.products]
+        # NO_BUCKET (-1) indexes the trailing label
+        bucket_names = BUCKETS + ('unscored',)
+
+        product_codes = columns['product'][rows].tolist()
+        timestamps = columns['timestamp'][rows]
+        datetimes = np.datetime_as_string(timestamps, unit='s').tolist()
+
+        return [
+            {
+                'product_name': names[product],
+                'product_url': urls[product],
+                'rating': _optional(rating),
+                'text': text,
+                'author': author,
+                'datetime': None if stamp == 'NaT' else stamp,
+                'sentiment_score': _optional(sentiment),
+                'sentiment_category': bucket_names[bucket]
+            }
+            for product, rating, text, author, stamp, sentiment, bucket in zip(
+                product_codes,
+                columns['rating'][rows].tolist(),
+                self.strings.decode(columns['text'][rows].tolist()),
+                self.strings.decode(columns['author'][rows].tolist()),
+                datetimes,
+                columns['sentiment'][rows].tolist(),
+                columns['bucket'][rows].tolist()
+            )
+        ]
+
+    def product_rows(self, index):
+        """(start, stop) row range of one product's reviews"""
+        return self._offsets[index], self._offsets[index + 1]
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=4096):
+        """Yield export-ready column chunks of rows [start, stop)
+
+        Each chunk is a dict keyed like EXPORT_FIELDS: product names, URLs,
+        texts, authors and sentiment categories (None when unscored) are
+        lists; rating and sentiment_score (rounded, NaN when missing),
+        review_date (datetime64[s], NaT when missing) and duplicate stay
+        NumPy arrays. Only one chunk is decoded at a time.
+        """
+        columns = self.columns()
+        stop = len(columns['product']) if stop is None else stop
+        names = [product['product_name'] for product in self.products]
+        urls = [product['product_url'] for product in self.products]
+        # NO_BUCKET (-1) indexes the trailing None
+        bucket_labels = list(BUCKETS) + [None]
+
+        for chunk_start in range(start, stop, chunk_size):
+            rows = slice(chunk_start, min(chunk_start + chunk_size, stop))
+            products = columns['product'][rows].tolist()
+            yield {
+                'product_name': [names[product] for product in products],
+                'product_url': [urls[product] for product in products],
+                'sentiment_category': [bucket_labels[bucket] for bucket in columns['bucket'][rows].tolist()],
+                'rating': columns['rating'][rows],
+                'text': self.strings.decode(columns['text'][rows].tolist()),
+                'author': self.strings.decode(columns['author'][rows].tolist()),
+                'sentiment_score': np.round(columns['sentiment'][rows], 3),
+                'review_date': columns['timestamp'][rows],
+                'duplicate': columns['duplicate'][rows]
+            }
+
+    def iter_export_rows(self, start=0, stop=None, chunk_size=4096):
+        """Yield export rows as plain lists, a chunk at a time
+
+        Columns are in workbook order: product name, sentiment category,
+        rating, text, author, sentiment score, review date, duplicate flag.
+        Missing ratings, scores and dates are None and unscored reviews have
+        no sentiment category, so writers can stream rows as they come.
+        """
+        for chunk in self.iter_chunks(start, stop, chunk_size):
+            yield from (
+                [name, category and category.title(), _missing(rating), text, author,
+                 _missing(sentiment), moment, duplicate]
+                for name, category, rating, text, author, sentiment, moment, duplicate in zip(
+                    chunk['product_name'],
+                    chunk['sentiment_category'],
+                    chunk['rating'].tolist(),
+                    chunk['text'],
+                    chunk['author'],
+                    chunk['sentiment_score'].tolist(),
+                    chunk['review_date'].astype(object).tolist(),
+                    chunk['duplicate'].tolist()
+                )
+            )
+
+    def update_digest(self, digest):
+        """Feed the table's contents into a hashlib object (for export cache keys)"""
+        columns = self.columns()
+        for product in self.products:
+            digest.update(f"{product['product_name']}\0{product['product_url']}\0".encode('utf-8', 'surrogatepass'))
+        for name in _COLUMNS:
+            column = np.ascontiguousarray(columns[name])
+            digest.update(f'{name}:{column.dtype.str}:{column.size}'.encode('ascii'))
+            digest.update(column.tobytes())
+        digest.update('\0'.join(self.strings.values).encode('utf-8', 'surrogatepass'))
+
+
+_EMPTY_DTYPES = {
+    'product': np.int32,
+    'rating': float,
+    'sentiment': float,
+    'timestamp': 'datetime64[s]',
+    'bucket': np.int8,
+    'duplicate': bool,
+    'text': np.int32,
+    'author': np.int32
+}
+
+
+def _missing(value):
+    """Map a NaN float column value to None"""
+    return None if value != value else value
+
+
+def _optional(value, digits=3):
+    """Round a float column value for JSON, mapping NaN to None"""
+    if value != value:
+        return None
+    return round(value, digits)
@@ -0,0 +1,36 @@
+import os
+
+from artifact_store import ArtifactStore
+
+
+def _write(content):
+    def write(path):
+        with open(path, 'wb') as handle:
+            handle.write(content)
+    return write
+
+
+def test_restart_drops_reports_of_the_previous_process(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=1 << 20)
+    path = store.store(_write(b'report'), '.xlsx')
+    (tmp_path / '.partial-interrupted.xlsx').write_bytes(b'half')
+
+    restarted = ArtifactStore(tmp_path, max_bytes=1 << 20)
+
+    assert os.listdir(tmp_path) == []
+    assert restarted.get(path) is None
+    assert restarted.stats()['files'] == 0
+    assert restarted.stats()['orphans_reclaimed'] == 2
+
+
+def test_restart_leaves_foreign_files_alone(tmp_path):
+    (tmp_path / 'notes.txt').write_text('not ours')
+    (tmp_path / 'ABCDEF0123456789abcdef0123456789.xlsx').write_bytes(b'upper case hex')
+    (tmp_path / 'cache').mkdir()
+    (tmp_path / 'cache' / '0123456789abcdef0123456789abcdef.xlsx').write_bytes(b'nested')
+
+    store = ArtifactStore(tmp_path, max_bytes=1 << 20)
+
+    assert sorted(os.listdir(tmp_path)) == ['ABCDEF0123456789abcdef0123456789.xlsx', 'cache', 'notes.txt']
+    assert os.listdir(tmp_path / 'cache') == ['0123456789abcdef0123456789abcdef.xlsx']
+    assert store.stats()['orphans_reclaimed'] == 0
@@ -0,0 +1,78 @@
+import importlib
+import os
+import time
+
+import pytest
+
+
+PRODUCTS = [
+    {'name': 'Kroger Chocolate Chip Cookies 13 oz', 'url': 'https://www.kroger.com/p/kroger-chocolate-chip-cookies/0001111012345'},
+    {'name': 'Oreo Chocolate Sandwich Cookies 14.3 oz', 'url': 'https://www.kroger.com/p/oreo-cookies/0004400003113'},
+]
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    root = tmp_path_factory.mktemp('app')
+    os.environ['ARTIFACT_ROOT'] = str(root / 'artifacts')
+    os.environ['ROLLUP_DB_PATH'] = str(root / 'rollups.db')
+    app = importlib.import_module('app')
+    kroger_analyzer = importlib.import_module('kroger_analyzer')
+
+    class OfflineAnalyzer(kroger_analyzer.KrogerReviewAnalyzer):
+        """Sample reviews for fixed products, without a browser or search requests"""
+
+        def __init__(self, use_selenium=True, headless=True):
+            super().__init__(use_selenium=False, headless=headless)
+
+        def search_products(self, category, max_products=10):
+            return [dict(product) for product in PRODUCTS[:max_products]]
+
+    patch = pytest.MonkeyPatch()
+    patch.setattr(app, 'KrogerReviewAnalyzer', OfflineAnalyzer)
+    patch.setattr(kroger_analyzer.random, 'uniform', lambda low, high: 0)
+    yield app
+    patch.undo()
+
+
+@pytest.fixture(scope='module')
+def completed_job(app_module):
+    client = app_module.app.test_client()
+    client.post('/analyze', data={'category': 'cookies', 'max_products': 2, 'max_reviews': 8})
+    job = list(app_module.analysis_jobs.values())[-1]
+    job.thread.join(timeout=120)
+    job.artifacts.wait('xlsx', timeout=60)
+    assert job.status == 'completed' and job.result_file
+    return job
+
+
+def test_report_etag_names_its_bytes(app_module, completed_job):
+    client = app_module.app.test_client()
+    response = client.get(f'/download/{completed_job.job_id}')
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control']
+    assert client.get(f'/download/{completed_job.job_id}', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_resuming_after_eviction_never_mixes_two_renders(app_module, completed_job):
+    client = app_module.app.test_client()
+    url = f'/download/{completed_job.job_id}'
+    first = client.get(url)
+    etag = first.headers['ETag']
+
+    # Evict the report; the next download renders it again, a save
+    # timestamp (whole seconds) later
+    app_module.artifact_store.remove(completed_job.result_file)
+    time.sleep(1.1)
+    resumed = client.get(url, headers={'Range': 'bytes=100-', 'If-Range': etag})
+
+    if resumed.headers['ETag'] == etag:
+        # Same name only ever means the same bytes
+        assert resumed.status_code == 206
+        assert resumed.data == first.data[100:]
+    else:
+        assert resumed.status_code == 200
+        assert resumed.data[:2] == b'PK'
+        assert client.get(url).data == resumed.data
@@ -0,0 +1,43 @@
+import os
+
+from artifact_store import ArtifactStore, file_digest
+from export_cache import ExportCache
+
+
+ANALYSIS = {'category': 'cookies', 'summary': {'total_reviews': 2}, 'products': []}
+
+
+def _renderer(renders):
+    """Writer that produces different bytes on every render, like openpyxl's save timestamp"""
+    def write(path):
+        renders.append(path)
+        with open(path, 'w') as handle:
+            handle.write(f'report rendered {len(renders)} time(s)')
+    return write
+
+
+def test_identical_analyses_reuse_the_stored_file(tmp_path):
+    cache = ExportCache(ArtifactStore(tmp_path, max_bytes=1 << 20))
+    renders = []
+
+    first = cache.get_or_build(ANALYSIS, '.xlsx', _renderer(renders))
+    second = cache.get_or_build(dict(ANALYSIS), '.xlsx', _renderer(renders))
+
+    assert first == second
+    assert len(renders) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_stored_names_always_match_their_bytes(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=1 << 20)
+    cache = ExportCache(store)
+    renders = []
+
+    first = cache.get_or_build(ANALYSIS, '.xlsx', _renderer(renders))
+    store.remove(first)
+    rebuilt = cache.get_or_build(ANALYSIS, '.xlsx', _renderer(renders))
+
+    assert len(renders) == 2
+    # The re-render differs, so it gets a new name (and ETag)
+    assert rebuilt != first
+    assert os.path.basename(rebuilt) == file_digest(rebuilt)[:32] + '.xlsx'
@@ -0,0 +1,28 @@
+import product_cache
+from product_cache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(product_cache.time, 'monotonic', lambda: now[0])
+    cache = LRUCache(ttl=60)
+    cache.put('a', 1)
+
+    now[0] += 59
+    assert cache.get('a') == 1
+    now[0] += 2
+    assert cache.get('a', 'missing') == 'missing'
+    assert len(cache) == 0
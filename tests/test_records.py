@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from records import CategorySummary, Product, ProductAnalysis, Review, from_epoch, to_epoch
+
+
+def test_mapping_access_falls_back_like_a_dict():
+    review = Review(rating=4, text='Fresh', author=None)
+
+    assert review['rating'] == 4
+    assert review.get('text') == 'Fresh'
+    # None values behave like missing keys for get()
+    assert review['author'] is None
+    assert review.get('author', 'Anonymous') == 'Anonymous'
+    assert review.get('not_a_field', 'default') == 'default'
+    assert 'rating' in review
+    assert 'not_a_field' not in review
+    with pytest.raises(KeyError):
+        review['not_a_field']
+
+
+def test_extra_keys_expose_derived_properties():
+    review = Review(timestamp=to_epoch(datetime(2024, 1, 5, 10, 11, 12)))
+
+    assert 'datetime' in review
+    assert review['datetime'] == '2024-01-05T10:11:12'
+    assert Review().get('datetime', 'unknown') == 'unknown'
+
+
+def test_copy_is_independent():
+    analysis = ProductAnalysis(product_name='Cookies', sentiment_score=0.4)
+    copy = analysis.copy()
+    copy.product_name = 'Crackers'
+
+    assert analysis['product_name'] == 'Cookies'
+    assert copy['sentiment_score'] == 0.4
+
+
+def test_review_round_trips_through_dicts():
+    scraped = {
+        'rating': 5, 'text': 'Great', 'author': 'ann', 'datetime': '2024-01-05T10:11:12',
+        'duplicate_of': {'product_name': 'Other'}
+    }
+    review = Review.from_dict(scraped, datetime.fromisoformat)
+
+    assert review.to_dict() == scraped
+    assert Review.from_dict(scraped).timestamp is None
+    # An already parsed date wins over parse_date
+    parsed = datetime(2020, 2, 2)
+    assert Review.from_dict(scraped, datetime.fromisoformat, parsed=parsed).timestamp == to_epoch(parsed)
+
+
+def test_epoch_conversion_is_naive():
+    moment = datetime(1999, 12, 31, 23, 59, 59)
+
+    assert from_epoch(to_epoch(moment)) == moment
+    assert to_epoch(None) is None
+    assert from_epoch(None) is None
+
+
+def test_product_coerce_accepts_dicts_and_products():
+    product = Product.coerce({'name': 'Cookies', 'url': 'https://example.com/p/c/1'})
+
+    assert Product.coerce(product) is product
+    assert product['product_id'] is None
+    assert product.to_dict() == {'name': 'Cookies', 'url': 'https://example.com/p/c/1', 'product_id': None}
+
+
+def test_category_summary_to_dict_copies_containers():
+    summary = CategorySummary(
+        'cookies', 1, 2, 2, 4.5, 0.3, 'Positive', 2, 0, 0,
+        [('fresh', 2)], {'name': 'Cookies'}, {'name': 'Cookies'}
+    )
+    data = summary.to_dict()
+    data['best_product']['name'] = 'changed'
+
+    assert summary['best_product']['name'] == 'Cookies'
+    assert data['top_themes'] == [('fresh', 2)]
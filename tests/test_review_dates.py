@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+import review_dates
+from review_dates import DateNormalizer
+
+
+NOW = datetime(2024, 3, 15, 12, 30, 45, 123456)
+
+
+@pytest.fixture
+def date_strings():
+    """Date strings in every format the scraper and the sample reviews produce"""
+    return [
+        NOW.isoformat(),
+        '2024-01-05T10:11:12Z',
+        '2024-01-05',
+        'Reviewed 1/5/2024',
+        '01-05-2023',
+        'January 5, 2024',
+        'Jan 5, 2024',
+        'on March 12, 2021 by bob',
+        'Posted 3 days ago',
+        '2 weeks ago',
+        '1 month ago',
+        '5 Days Ago',
+        'a while ago',
+        'Yesterday',
+        'today!',
+        'Reviewed 12/31/2023 3 weeks ago',
+        # Match a pattern but fail to convert
+        '13/45/2024',
+        'Feb 30, 2024',
+        '2024-13-01',
+        'nothing here',
+        '',
+        None
+    ]
+
+
+def test_parse_many_matches_parse(date_strings):
+    expected = [DateNormalizer(now=NOW).parse(value) for value in date_strings]
+
+    assert DateNormalizer(now=NOW).parse_many(date_strings) == expected
+    # Enough repeats to take the vectorized path
+    copies = review_dates._BULK_MIN_STRINGS // len(date_strings) + 1
+    assert DateNormalizer(now=NOW).parse_many(date_strings * copies) == expected * copies
+
+
+def test_bulk_parse_without_usable_strings():
+    count = review_dates._BULK_MIN_STRINGS
+    assert DateNormalizer(now=NOW).parse_many([None, ''] * count) == [None] * (2 * count)
+
+
+def test_parse_many_accepts_iterables():
+    normalizer = DateNormalizer(now=NOW)
+
+    assert normalizer.parse_many(iter(['2024-01-05', None])) == [datetime(2024, 1, 5), None]
+    assert normalizer.parse_many([]) == []
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-01-05T10:11:12Z', datetime(2024, 1, 5, 10, 11, 12)),
+    ('2024-01-05', datetime(2024, 1, 5)),
+    ('Reviewed 1/5/2024', datetime(2024, 1, 5)),
+    ('01-05-2023', datetime(2023, 1, 5)),
+    ('January 5, 2024', datetime(2024, 1, 5)),
+    ('Jan 5, 2024', datetime(2024, 1, 5)),
+    ('Posted 3 days ago', datetime(2024, 3, 12, 12, 30, 45, 123456)),
+    ('2 weeks ago', datetime(2024, 3, 1, 12, 30, 45, 123456)),
+    ('1 month ago', datetime(2024, 2, 14, 12, 30, 45, 123456)),
+    ('Yesterday', datetime(2024, 3, 14, 12, 30, 45, 123456)),
+    ('today!', NOW),
+    # Relative forms win, and never fall through to absolute patterns
+    ('Reviewed 12/31/2023 3 weeks ago', datetime(2024, 2, 23, 12, 30, 45, 123456)),
+    ('a while ago', None),
+    ('13/45/2024', None),
+    ('nothing here', None),
+    ('', None),
+    (None, None),
+    (20240105, None)
+])
+def test_parse(value, expected):
+    assert DateNormalizer(now=NOW).parse(value) == expected
+
+
+def test_relative_dates_share_one_reference_time():
+    normalizer = DateNormalizer(now=NOW)
+
+    assert normalizer.parse('today') == normalizer.parse('0 days ago') == NOW
+    assert normalizer.parse_relative('5 Days Ago') == datetime(2024, 3, 10, 12, 30, 45, 123456)
+    assert normalizer.parse_relative('last week') is None
+
+
+def test_repeated_strings_hit_the_cache():
+    normalizer = DateNormalizer(now=NOW, cache_size=2)
+    for _ in range(3):
+        normalizer.parse('2024-01-05')
+
+    info = normalizer.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (2, 1, 2)
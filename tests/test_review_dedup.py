@@ -0,0 +1,69 @@
+import pytest
+
+from records import Review
+from review_dedup import ReviewFingerprintIndex
+
+
+LONG_REVIEW = (
+    'We buy these cookies every week for the kids lunches because they stay '
+    'soft for days after opening the package and the chocolate chips are '
+    'generous without being too sweet for our taste'
+)
+# One word changed out of thirty-seven
+EDITED_REVIEW = LONG_REVIEW.replace('every week', 'every month')
+UNRELATED_REVIEW = (
+    'The bag arrived crushed and half of the chips inside were stale so I '
+    'contacted the store and they refunded the order right away'
+)
+
+
+def _review(text, author='shopper'):
+    return Review(text=text, author=author)
+
+
+def test_exact_duplicates_ignore_case_and_punctuation():
+    index = ReviewFingerprintIndex()
+    assert index.add(_review(LONG_REVIEW), 'first') is None
+
+    assert index.add(_review(LONG_REVIEW.upper() + '!!!', author='someone else'), 'second') == 'first'
+    assert index.stats['exact_duplicates'] == 1
+    # Duplicates point at the first occurrence and are not indexed themselves
+    assert len(index) == 1
+
+
+def test_near_duplicates_are_caught_above_the_threshold():
+    index = ReviewFingerprintIndex()
+    index.add(_review(LONG_REVIEW), 'first')
+
+    assert index.add(_review(EDITED_REVIEW), 'edited') == 'first'
+    assert index.add(_review(UNRELATED_REVIEW), 'unrelated') is None
+    assert index.stats['near_duplicates'] == 1
+
+
+def test_near_duplicates_below_a_strict_threshold_are_kept():
+    index = ReviewFingerprintIndex(threshold=1.0)
+    index.add(_review(LONG_REVIEW), 'first')
+
+    assert index.add(_review(EDITED_REVIEW), 'edited') is None
+    assert index.add(_review(LONG_REVIEW), 'exact') == 'first'
+
+
+def test_short_reviews_only_match_the_same_author():
+    index = ReviewFingerprintIndex(min_tokens=5)
+    index.add(_review('Great product!', author='Ann'), 'ann')
+
+    assert index.add(_review('great product', author='bob'), 'bob') is None
+    assert index.add(_review('Great product.', author=' ann '), 'ann again') == 'ann'
+
+
+def test_reviews_without_text_are_never_duplicates():
+    index = ReviewFingerprintIndex()
+
+    assert index.add(_review(''), 'first') is None
+    assert index.add(_review(None), 'second') is None
+    assert len(index) == 0
+
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        ReviewFingerprintIndex(num_perm=64, bands=10)
@@ -0,0 +1,36 @@
+import pytest
+
+from records import Review
+from review_samples import ReviewSampler
+
+
+def _reviews():
+    return [
+        Review(text='fine', sentiment_score=0.3, timestamp=300),
+        Review(text='love it', sentiment_score=0.9, timestamp=100),
+        Review(text='nice', sentiment_score=0.5, timestamp=200),
+        Review(text='also love it', sentiment_score=0.9, timestamp=None)
+    ]
+
+
+def test_polarity_order_keeps_the_strongest_and_breaks_ties_by_arrival():
+    sampler = ReviewSampler(k=2)
+    for review in _reviews():
+        sampler.add(review, 'positive')
+
+    assert [review.text for review in sampler.samples()['positive']] == ['love it', 'also love it']
+    assert sampler.counts['positive'] == 4
+
+
+def test_recent_order_puts_undated_reviews_last():
+    sampler = ReviewSampler(k=3, order='recent')
+    for review in _reviews():
+        sampler.add(review, 'positive')
+
+    assert [review.text for review in sampler.samples()['positive']] == ['fine', 'nice', 'love it']
+
+
+def test_unknown_orders_are_rejected():
+    # Scraped reviews carry no helpful-vote counts to rank by
+    with pytest.raises(ValueError):
+        ReviewSampler(order='helpful')
@@ -0,0 +1,66 @@
+import numpy as np
+
+from records import Review
+from review_stats import compute_review_statistics
+from review_table import ReviewTable
+
+
+SHARED_TEXT = 'Same syndicated review text posted on every flavor of this brand'
+
+
+def _table():
+    table = ReviewTable()
+    table.add_product('Original', 'https://example.com/p/original/1', [
+        Review(rating=5, text=SHARED_TEXT, author='ann', sentiment_score=0.6),
+        Review(rating=4, text='Crunchy and fresh', author='bob', sentiment_score=0.3)
+    ])
+    # The same review shows up on a second listing of the brand
+    table.add_product('Flavor', 'https://example.com/p/flavor/2', [
+        Review(rating=5, text=SHARED_TEXT, author='ann', sentiment_score=0.6,
+               duplicate_of={'product_name': 'Original'}),
+        Review(rating=3, text='Too salty for me', author='cat', sentiment_score=-0.2)
+    ])
+    return table
+
+
+def test_products_sharing_review_text_keep_their_ratings():
+    statistics = _table().statistics()
+    original, flavor = statistics['products']
+
+    assert original['rated_reviews'] == 2
+    assert original['average_rating'] == 4.5
+    assert flavor['rated_reviews'] == 2
+    assert flavor['average_rating'] == 4.0
+    assert flavor['scored_reviews'] == 2
+    assert flavor['average_sentiment'] == 0.2
+    assert flavor['adjusted_rating'] is not None
+    assert flavor['rating_ci_low'] is not None
+
+    assert statistics['best_product']['name'] == 'Original'
+    assert statistics['worst_product']['name'] == 'Flavor'
+
+
+def test_duplicates_are_left_out_of_job_wide_figures():
+    statistics = _table().statistics()
+
+    assert statistics['duplicate_reviews'] == 1
+    assert statistics['review_count'] == 3
+    assert statistics['rated_reviews'] == 3
+    assert statistics['scored_reviews'] == 3
+    assert statistics['rating_histogram'] == {'1': 0, '2': 0, '3': 1, '4': 1, '5': 1}
+    assert statistics['prior_rating'] == 4.0
+    assert statistics['prior_weight'] == 1.5
+
+
+def test_bayesian_adjustment_shrinks_small_samples():
+    products = [{'product_name': name, 'product_url': name} for name in ('one', 'many', 'poor')]
+    product_index = np.array([0] + [1] * 40 + [2] * 40)
+    ratings = np.array([5.0] + [4.8] * 40 + [3.0] * 40)
+    sentiments = np.full(81, np.nan)
+
+    statistics = compute_review_statistics(product_index, ratings, sentiments, products)
+
+    assert statistics['best_product']['name'] == 'many'
+    assert statistics['worst_product']['name'] == 'poor'
+    assert statistics['sentiment_percentiles']['p50'] is None
+    assert statistics['rating_sentiment_correlation'] is None
@@ -0,0 +1,33 @@
+from workbook_export import sheet_title
+
+
+def test_titles_drop_invalid_characters_and_quotes():
+    used = set()
+
+    assert sheet_title("'Mac & Cheese: 7.25 oz [Box]/Pack?'", used) == 'Mac & Cheese 7.25 oz Box Pack'
+    assert sheet_title('  ', used) == 'Product'
+
+
+def test_titles_are_truncated_to_the_excel_limit():
+    title = sheet_title('Simple Truth Organic Chocolate Chip Cookies Family Size 26 oz', set())
+
+    assert len(title) <= 31
+    # Trailing spaces left by the cut are trimmed
+    assert title == 'Simple Truth Organic Chocolate'
+
+
+def test_titles_are_unique_case_insensitively():
+    used = {'category summary'}
+    name = 'Simple Truth Organic Chocolate Chip Cookies Family Size 26 oz'
+
+    titles = [sheet_title(name, used) for _ in range(3)] + [sheet_title('CATEGORY SUMMARY', used)]
+
+    assert titles == [
+        'Simple Truth Organic Chocolate',
+        'Simple Truth Organic Chocol (2)',
+        'Simple Truth Organic Chocol (3)',
+        'CATEGORY SUMMARY (2)'
+    ]
+    assert all(len(title) <= 31 for title in titles)
+    assert len({title.lower() for title in titles}) == len(titles)
+    assert 'category summary (2)' in used
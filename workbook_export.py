@@ -0,0 +1,216 @@
+import re
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+
+REVIEW_HEADERS = [
+    'Product Name', 'Sentiment Category', 'Rating', 'Review Text', 'Author',
+    'Sentiment Score', 'Review Date', 'Duplicate'
+]
+# Analyses without a review table only carry sample reviews
+SAMPLE_REVIEW_HEADERS = ['Product Name', 'Sentiment Category', 'Rating', 'Review Text', 'Author']
+
+PRODUCT_OVERVIEW_HEADERS = [
+    'Product Name', 'Average Rating', 'Total Reviews', 'Text Reviews',
+    'Sentiment Score', 'Sentiment Label', 'Positive Reviews',
+    'Negative Reviews', 'Neutral Reviews', 'Top Themes',
+    'Adjusted Rating', 'Rating 95% CI Low', 'Rating 95% CI High', 'Product URL'
+]
+
+# Part of export cache keys; bump whenever the workbook layout changes
+WORKBOOK_LAYOUT_VERSION = 1
+
+_FIXED_SHEETS = ('Category Summary', 'Products Overview', 'All Reviews')
+_SHEET_TITLE_CHARS = re.compile(r'[\[\]:*?/\\]')
+_MAX_SHEET_TITLE = 31
+_HEADER_FONT = Font(bold=True)
+
+
+def write_analysis_workbook(analysis_data, filename):
+    """Stream a category analysis into an .xlsx file
+
+    Uses openpyxl's write-only mode: each row is serialized to the sheet's
+    temporary XML as soon as it is appended, so memory stays flat however
+    many reviews the job has. Sheets: Category Summary, Products Overview,
+    All Reviews and one sheet per product (its figures, then its reviews).
+    """
+    workbook = Workbook(write_only=True)
+    products = analysis_data.get('products', [])
+    product_stats = (analysis_data.get('statistics') or {}).get('products') or []
+
+    _write_sheet(workbook, 'Category Summary', ['Metric', 'Value'], summary_rows(analysis_data))
+    _write_sheet(workbook, 'Products Overview', PRODUCT_OVERVIEW_HEADERS, product_overview_rows(products, product_stats))
+
+    review_table = analysis_data.get('review_table')
+    if review_table is not None:
+        if len(review_table):
+            _write_sheet(workbook, 'All Reviews', REVIEW_HEADERS, review_table.iter_export_rows())
+    elif any(_sample_review_rows(product) for product in products):
+        _write_sheet(workbook, 'All Reviews', SAMPLE_REVIEW_HEADERS, (
+            row for product in products for row in _sample_review_rows(product)
+        ))
+
+    used_titles = {title.lower() for title in _FIXED_SHEETS}
+    for index, product in enumerate(products):
+        stats = product_stats[index] if index < len(product_stats) else {}
+        title = sheet_title(product.get('product_name', '') or f'Product {index + 1}', used_titles)
+        try:
+            _write_product_sheet(workbook, title, index, product, stats, review_table)
+        except Exception as e:
+            print(f"Error writing product sheet '{title}': {e}")
+
+    workbook.save(filename)
+    return filename
+
+
+def sheet_title(name, used_titles):
+    """Excel-safe, unique (case-insensitively) sheet title for `name`"""
+    base = ' '.join(_SHEET_TITLE_CHARS.sub(' ', name).split()).strip("'") or 'Product'
+    title = base[:_MAX_SHEET_TITLE].rstrip()
+    suffix = 2
+    while title.lower() in used_titles:
+        tag = f' ({suffix})'
+        title = base[:_MAX_SHEET_TITLE - len(tag)].rstrip() + tag
+        suffix += 1
+    used_titles.add(title.lower())
+    return title
+
+
+def summary_rows(analysis_data):
+    """Metric/value rows of the Category Summary sheet"""
+    summary = analysis_data.get('summary') or {}
+    best = summary.get('best_product') or {}
+    worst = summary.get('worst_product') or {}
+
+    rows = [
+        ['Category', analysis_data.get('category', '')],
+        ['Total Products Analyzed', summary.get('total_products', 0)],
+        ['Total Reviews', summary.get('total_reviews', 0)],
+        ['Total Text Reviews', summary.get('total_text_reviews', 0)],
+        ['Average Rating', summary.get('average_rating', 0)],
+        ['Average Sentiment Score', summary.get('average_sentiment', 0)],
+        ['Overall Sentiment', summary.get('sentiment_label', '')],
+        ['Positive Reviews', summary.get('positive_reviews', 0)],
+        ['Neutral Reviews', summary.get('neutral_reviews', 0)],
+        ['Negative Reviews', summary.get('negative_reviews', 0)],
+        ['Top Themes', ', '.join(summary.get('top_themes', []))],
+        ['Best Product', best.get('name', '')],
+        ['Best Product Rating', best.get('rating', 0)],
+        ['Worst Product', worst.get('name', '')],
+        ['Worst Product Rating', worst.get('rating', 0)]
+    ]
+    rows.extend(statistics_summary_rows(analysis_data.get('statistics')))
+    return rows
+
+
+def statistics_summary_rows(statistics):
+    """Metric/value rows for the review statistics of a job"""
+    if not statistics:
+        return []
+
+    rows = []
+    for star, count in statistics.get('rating_histogram', {}).items():
+        rows.append([f'{star} Star Reviews', count])
+    for name, value in statistics.get('sentiment_percentiles', {}).items():
+        rows.append([f'Sentiment {name.upper()}', value])
+    rows.append(['Rating/Sentiment Correlation', statistics.get('rating_sentiment_correlation')])
+    rows.append(['Duplicate Reviews Excluded', statistics.get('duplicate_reviews', 0)])
+
+    best = statistics.get('best_product') or {}
+    worst = statistics.get('worst_product') or {}
+    rows.extend([
+        ['Best Product (Adjusted)', best.get('name', '')],
+        ['Best Product Adjusted Rating', best.get('adjusted_rating')],
+        ['Worst Product (Adjusted)', worst.get('name', '')],
+        ['Worst Product Adjusted Rating', worst.get('adjusted_rating')]
+    ])
+    return rows
+
+
+def product_overview_rows(products, product_stats):
+    """One Products Overview row per product analysis"""
+    for index, product in enumerate(products):
+        stats = product_stats[index] if index < len(product_stats) else {}
+        yield [
+            product.get('product_name', ''),
+            product.get('average_rating', 0),
+            product.get('total_reviews', 0),
+            product.get('text_reviews', 0),
+            product.get('sentiment_score', 0),
+            product.get('sentiment_label', ''),
+            product.get('positive_reviews', 0),
+            product.get('negative_reviews', 0),
+            product.get('neutral_reviews', 0),
+            ', '.join(product.get('themes', [])),
+            stats.get('adjusted_rating'),
+            stats.get('rating_ci_low'),
+            stats.get('rating_ci_high'),
+            product.get('product_url', '')
+        ]
+
+
+def _sample_review_rows(product):
+    product_name = product.get('product_name', '')
+    sample_reviews = product.get('sample_reviews', {})
+    return [
+        [product_name, bucket.title(), review.get('rating', ''), review.get('text', ''), review.get('author', '')]
+        for bucket in ('positive', 'negative', 'neutral')
+        for review in sample_reviews.get(bucket, [])
+    ]
+
+
+def _write_product_sheet(workbook, title, index, product, stats, review_table):
+    """Product figures as metric/value rows, then the product's reviews"""
+    worksheet = workbook.create_sheet(title)
+    for metric, value in [
+        ['Product', product.get('product_name', '')],
+        ['Product URL', product.get('product_url', '')],
+        ['Average Rating', product.get('average_rating', 0)],
+        ['Adjusted Rating', stats.get('adjusted_rating')],
+        ['Rating 95% CI', _interval(stats.get('rating_ci_low'), stats.get('rating_ci_high'))],
+        ['Total Reviews', product.get('total_reviews', 0)],
+        ['Text Reviews', product.get('text_reviews', 0)],
+        ['Sentiment Score', product.get('sentiment_score', 0)],
+        ['Sentiment Label', product.get('sentiment_label', '')],
+        ['Positive / Negative / Neutral', '{} / {} / {}'.format(
+            product.get('positive_reviews', 0), product.get('negative_reviews', 0), product.get('neutral_reviews', 0)
+        )],
+        ['Top Themes', ', '.join(product.get('themes', []))]
+    ]:
+        worksheet.append([_header_cell(worksheet, metric), value])
+    worksheet.append([])
+
+    # The product name is the sheet itself, so review rows drop that column
+    if review_table is not None:
+        start, stop = review_table.product_rows(index)
+        worksheet.append([_header_cell(worksheet, header) for header in REVIEW_HEADERS[1:]])
+        for row in review_table.iter_export_rows(start, stop):
+            worksheet.append(row[1:])
+    else:
+        worksheet.append([_header_cell(worksheet, header) for header in SAMPLE_REVIEW_HEADERS[1:]])
+        for row in _sample_review_rows(product):
+            worksheet.append(row[1:])
+
+
+def _write_sheet(workbook, title, headers, rows):
+    try:
+        worksheet = workbook.create_sheet(title)
+        worksheet.append([_header_cell(worksheet, header) for header in headers])
+        for row in rows:
+            worksheet.append(row)
+    except Exception as e:
+        print(f"Error writing {title.lower()}: {e}")
+
+
+def _header_cell(worksheet, value):
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.font = _HEADER_FONT
+    return cell
+
+
+def _interval(low, high):
+    if low is None or high is None:
+        return None
+    return f'{low} - {high}'